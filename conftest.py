@@ -5,3 +5,8 @@ from pathlib import Path
 # This allows tests to import modules from 'scripts' package
 root_dir = Path(__file__).parent
 sys.path.insert(0, str(root_dir))
+
+# The pipeline scripts import their sibling modules by bare name (they are run
+# as `python scripts/fetch_plans.py`), so the scripts directory must be
+# importable as well
+sys.path.insert(0, str(root_dir / "scripts"))
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for historical plan snapshots.
+
+The dated files in `data/json-archive/` repeat every plan every day, although
+most plans do not change between days. This store keeps each distinct plan
+record once, under the SHA-256 of its compact JSON, and each day only as a
+manifest of record hashes:
+
+    data/archive-store/
+        objects/<first 2 hex digits>.jsonl   one "<sha256>\\t<compact json>" per line
+        days/plans_YYYY-MM-DD.json           snapshot metadata + ordered record hashes
+
+Object files are append-only, so daily additions produce small diffs.
+Records keep their original key order, and every day manifest stores the
+SHA-256 of the snapshot file it came from (and whether it was indented or
+compact, see PLANS_JSON_PRETTY in fetch_plans.py), so `rebuild` reproduces
+the original `plans_YYYY-MM-DD.json` byte-for-byte (and refuses to return
+anything else).
+
+The update workflow adds each day's snapshot here with `add` (which verifies
+the rebuild) instead of writing new dated files; `migrate` ingests the dated
+files already in `data/json-archive/`.
+
+Usage:
+    python scripts/archive_store.py migrate            # ingest data/json-archive
+    python scripts/archive_store.py add data/plans.json [--day YYYY-MM-DD]   # daily snapshot
+    python scripts/archive_store.py rebuild 2026-01-10 [-o plans_2026-01-10.json]
+    python scripts/archive_store.py verify
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from artifacts import write_artifact
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+DAY_FILE_PATTERN = re.compile(r"^plans_(\d{4}-\d{2}-\d{2})\.json$")
+
+
+def serialize_snapshot(data: dict[str, Any], pretty: bool = True) -> bytes:
+    """Serialize a snapshot exactly as `fetch_plans.save_plans` writes plans.json."""
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def record_payload(plan: dict[str, Any]) -> str:
+    """Return the canonical (compact, key-order preserving) JSON of a plan record."""
+    return json.dumps(plan, ensure_ascii=False, separators=(",", ":"))
+
+
+def record_hash(payload: str) -> str:
+    """Return the content address of a serialized record."""
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ArchiveStore:
+    """
+    Content-addressed plan record store with per-day manifests.
+
+    Object files are loaded lazily, per hash prefix, on first access. New
+    records are buffered until `flush()`.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.objects_dir = root / "objects"
+        self.days_dir = root / "days"
+        self._objects: dict[str, dict[str, str]] = {}
+        self._pending: dict[str, list[str]] = {}
+
+    def _object_file(self, prefix: str) -> Path:
+        return self.objects_dir / f"{prefix}.jsonl"
+
+    def _load_objects(self, prefix: str) -> dict[str, str]:
+        objects = self._objects.get(prefix)
+        if objects is None:
+            objects = {}
+            path = self._object_file(prefix)
+            if path.exists():
+                with path.open(encoding="utf-8") as f:
+                    for line in f:
+                        digest, _, payload = line.rstrip("\n").partition("\t")
+                        objects[digest] = payload
+            self._objects[prefix] = objects
+        return objects
+
+    def get_record(self, digest: str) -> dict[str, Any]:
+        """
+        Load a plan record by hash.
+
+        Raises:
+            KeyError: If the record is not in the store
+        """
+        payload = self._load_objects(digest[:2])[digest]
+        record: dict[str, Any] = json.loads(payload)
+        return record
+
+    def put_record(self, plan: dict[str, Any]) -> str:
+        """Store a plan record (if new) and return its hash."""
+        payload = record_payload(plan)
+        digest = record_hash(payload)
+        objects = self._load_objects(digest[:2])
+        if digest not in objects:
+            objects[digest] = payload
+            self._pending.setdefault(digest[:2], []).append(f"{digest}\t{payload}\n")
+        return digest
+
+    def flush(self) -> int:
+        """
+        Append buffered new records to their object files.
+
+        Returns:
+            Number of records written
+        """
+        written = 0
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        for prefix, lines in sorted(self._pending.items()):
+            with self._object_file(prefix).open("a", encoding="utf-8") as f:
+                f.writelines(lines)
+            written += len(lines)
+        self._pending.clear()
+        return written
+
+    def days(self) -> list[str]:
+        """Return the stored days in date order."""
+        if not self.days_dir.exists():
+            return []
+        return sorted(
+            match.group(1)
+            for path in self.days_dir.iterdir()
+            if (match := DAY_FILE_PATTERN.match(path.name))
+        )
+
+    def day_path(self, day: str) -> Path:
+        return self.days_dir / f"plans_{day}.json"
+
+    def add_snapshot(self, day: str, data: dict[str, Any], original: bytes | None = None) -> int:
+        """
+        Store one day's snapshot.
+
+        Args:
+            day: Snapshot date (YYYY-MM-DD)
+            data: Parsed snapshot document
+            original: Snapshot file bytes; when given, the snapshot is only
+                stored if it can be rebuilt from `data` byte-for-byte (in
+                indented or compact form)
+
+        Returns:
+            Number of plans in the snapshot
+
+        Raises:
+            ValueError: If `original` differs from the canonical serialization
+        """
+        # save_plans writes indented ("{\n  ...") or compact plans.json
+        pretty = original is None or original[1:2] == b"\n"
+        rebuilt = serialize_snapshot(data, pretty)
+        if original is not None and rebuilt != original:
+            raise ValueError(f"Snapshot for {day} is not in canonical plans.json form")
+
+        plans = data.get("plans", [])
+        manifest = {
+            "version": STORE_VERSION,
+            "day": day,
+            "bytes": len(rebuilt),
+            "sha256": hashlib.sha256(rebuilt).hexdigest(),
+            "pretty": pretty,
+            # Snapshot metadata in original key order; "plans" is filled back in on rebuild
+            "document": {key: (None if key == "plans" else value) for key, value in data.items()},
+            "plans": [self.put_record(plan) for plan in plans],
+        }
+
+        self.flush()
+        self.days_dir.mkdir(parents=True, exist_ok=True)
+        write_artifact(
+            self.day_path(day),
+            (json.dumps(manifest, indent=2, ensure_ascii=False) + "\n").encode("utf-8"),
+        )
+        return len(plans)
+
+    def load_snapshot(self, day: str) -> dict[str, Any]:
+        """
+        Reassemble a day's snapshot document.
+
+        Raises:
+            FileNotFoundError: If the day is not in the store
+            KeyError: If a referenced record is missing
+        """
+        with self.day_path(day).open(encoding="utf-8") as f:
+            manifest: dict[str, Any] = json.load(f)
+
+        data = dict(manifest["document"])
+        data["plans"] = [self.get_record(digest) for digest in manifest["plans"]]
+        return data
+
+    def rebuild(self, day: str) -> bytes:
+        """
+        Rebuild a day's original plans.json bytes.
+
+        Raises:
+            ValueError: If the rebuilt file does not match the stored hash
+        """
+        with self.day_path(day).open(encoding="utf-8") as f:
+            manifest = json.load(f)
+        rebuilt = serialize_snapshot(self.load_snapshot(day), manifest.get("pretty", True))
+        if hashlib.sha256(rebuilt).hexdigest() != manifest["sha256"]:
+            raise ValueError(f"Rebuilt snapshot for {day} does not match its recorded hash")
+        return rebuilt
+
+    def size_bytes(self) -> int:
+        """Return the total on-disk size of the store."""
+        return sum(path.stat().st_size for path in self.root.rglob("*") if path.is_file())
+
+
+def add_verified(store: ArchiveStore, day: str, original: bytes) -> int:
+    """
+    Store a snapshot file's bytes and check that the day rebuilds to them.
+
+    Args:
+        store: Target store
+        day: Snapshot date (YYYY-MM-DD)
+        original: Snapshot file bytes (a plans.json as written by fetch_plans.py)
+
+    Returns:
+        Number of plans in the snapshot
+
+    Raises:
+        json.JSONDecodeError: If `original` is not valid JSON
+        ValueError: If the snapshot is not canonical or does not rebuild byte-for-byte
+    """
+    count = store.add_snapshot(day, json.loads(original), original)
+    # Verify against a fresh reader so nothing comes from in-memory state
+    if ArchiveStore(store.root).rebuild(day) != original:
+        raise ValueError(f"Verification failed for {day}")
+    return count
+
+
+def migrate_archive(source_dir: Path, store: ArchiveStore) -> int:
+    """
+    Ingest dated `plans_YYYY-MM-DD.json` snapshots and verify each rebuild.
+
+    Days already in the store are skipped. Source files are left in place.
+
+    Args:
+        source_dir: Directory of dated snapshot files (data/json-archive)
+        store: Target store
+
+    Returns:
+        Number of snapshots that failed to ingest or verify
+    """
+    existing = set(store.days())
+    failures = 0
+    source_bytes = 0
+
+    for path in sorted(source_dir.glob("plans_*.json")):
+        match = DAY_FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        day = match.group(1)
+        original = path.read_bytes()
+        source_bytes += len(original)
+        if day in existing:
+            continue
+
+        try:
+            count = add_verified(store, day, original)
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            logger.error("Skipping %s: %s", path.name, e)
+            failures += 1
+            continue
+        logger.info("Ingested %s (%d plans)", path.name, count)
+
+    logger.info(
+        "Source snapshots: %s bytes, store: %s bytes",
+        f"{source_bytes:,}",
+        f"{store.size_bytes():,}",
+    )
+    return failures
+
+
+def main() -> int:
+    """
+    Main entry point.
+
+    Returns:
+        Exit code (0 for success, 1 for error)
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=Path(os.environ.get("ARCHIVE_STORE_DIR", "data/archive-store")),
+        help="Store directory",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate", help="Ingest dated snapshot files")
+    migrate.add_argument("--source", type=Path, default=Path("data/json-archive"))
+
+    add = commands.add_parser("add", help="Add one snapshot")
+    add.add_argument("path", type=Path)
+    add.add_argument(
+        "--day",
+        default=os.environ.get("TIMESTAMP") or datetime.now(tz=UTC).strftime("%Y-%m-%d"),
+    )
+
+    rebuild = commands.add_parser("rebuild", help="Rebuild one day's plans.json")
+    rebuild.add_argument("day")
+    rebuild.add_argument("-o", "--output", type=Path, help="Output file (default: stdout)")
+
+    commands.add_parser("verify", help="Rebuild and check every stored day")
+
+    args = parser.parse_args()
+    store = ArchiveStore(args.store)
+
+    try:
+        if args.command == "migrate":
+            return 1 if migrate_archive(args.source, store) else 0
+
+        if args.command == "add":
+            count = add_verified(store, args.day, args.path.read_bytes())
+            logger.info("Stored and verified %d plans for %s", count, args.day)
+            return 0
+
+        if args.command == "rebuild":
+            rebuilt = store.rebuild(args.day)
+            if args.output:
+                args.output.write_bytes(rebuilt)
+            else:
+                sys.stdout.buffer.write(rebuilt)
+            return 0
+
+        failures = 0
+        for day in store.days():
+            try:
+                store.rebuild(day)
+            except (KeyError, ValueError) as e:
+                logger.error("%s: %s", day, e)
+                failures += 1
+        logger.info("Verified %d day(s), %d failure(s)", len(store.days()), failures)
+        return 1 if failures else 0
+    except (OSError, json.JSONDecodeError, KeyError, ValueError) as e:
+        logger.error("%s failed: %s", args.command, e)
+        return 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    sys.exit(main())
@@ -10,7 +10,6 @@ VULNERABILITY FIXED: Structured logging replaces print statements
 from __future__ import annotations
 
 import csv
-import json
 import logging
 import os
 import sys
@@ -18,6 +17,9 @@ from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+import json_codec
+from artifacts import AtomicArtifact
+
 # Configure structured logging
 logging.basicConfig(
     level=logging.INFO,
@@ -70,10 +72,9 @@ def load_plans_json(json_path: Path) -> dict[str, Any] | None:
         return None
 
     try:
-        with json_path.open(encoding="utf-8") as f:
-            data: dict[str, Any] = json.load(f)
-            return data
-    except json.JSONDecodeError as e:
+        data: dict[str, Any] = json_codec.load(json_path)
+        return data
+    except json_codec.JSONDecodeError as e:
         logger.error("JSON parse error: %s", e)
         return None
     except OSError as e:
@@ -113,9 +114,8 @@ def write_csv_archive(
         True on success, False on error
     """
     try:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with output_path.open("w", newline="", encoding="utf-8") as csvfile:
+        # Published atomically, and left untouched when the content is unchanged
+        with AtomicArtifact(output_path, encoding="utf-8", newline="") as csvfile:
             writer = csv.DictWriter(csvfile, fieldnames=list(CSV_COLUMNS), extrasaction="ignore")
             writer.writeheader()
             for plan in plans:
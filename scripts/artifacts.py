@@ -0,0 +1,224 @@
+"""
+Atomic, write-once publishing of data artifacts.
+
+Every generated file under data/ (plans.json, the CSV archive, tdu-rates.json,
+shards, rankings, caches) is written here, so a crash or timeout in the middle
+of a run can never leave a truncated file for the site to serve or the update
+workflow to commit:
+
+- content goes to a temporary file in the target's directory, which is
+  flushed, fsynced and then renamed over the target with `os.replace`
+  (readers see the previous complete file or the new one, never a mix)
+- the SHA-256 of the content is computed while it is written; if the target
+  already holds exactly that content, the temporary file is discarded and
+  the target is left untouched (same bytes, same mtime, nothing to commit
+  or redeploy)
+
+Each write is counted in the run metrics (`artifacts.written`,
+`artifacts.unchanged`, `artifacts.bytes_written`).
+
+Usage:
+    write_artifact(path, payload)                # bytes, or an iterable of chunks
+
+    artifact = AtomicArtifact(path, encoding="utf-8", newline="")
+    with artifact as f:                          # streamed text (e.g. csv.writer)
+        ...
+    artifact.result.changed
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import tempfile
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any
+
+import run_metrics
+
+# Permissions of published files (mkstemp creates them owner-only)
+ARTIFACT_MODE = 0o644
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ArtifactWrite:
+    """Outcome of publishing one artifact."""
+
+    path: Path
+    size: int
+    sha256: str
+    changed: bool  # False when the target already held this content
+
+
+def file_sha256(path: Path) -> str | None:
+    """Return the SHA-256 of a file's content, or None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist a rename in `directory` (a no-op where directories cannot be opened)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class _HashingWriter(io.RawIOBase):
+    """Binary file wrapper that hashes and counts everything written through it."""
+
+    def __init__(self, file: IO[bytes]) -> None:
+        super().__init__()
+        self.file = file
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        view = memoryview(data)
+        self.sha256.update(view)
+        self.size += view.nbytes
+        self.file.write(view)
+        return view.nbytes
+
+
+class AtomicArtifact:
+    """
+    Context manager that publishes one file atomically, unless unchanged.
+
+    Entering returns a binary file, or a text file when `encoding` is given.
+    On a clean exit the content replaces `path` (or is discarded if `path`
+    already holds it) and `result` is set; on an exception the temporary
+    file is removed and `path` is left as it was.
+    """
+
+    def __init__(self, path: Path, encoding: str | None = None, newline: str | None = None) -> None:
+        self.path = path
+        self.encoding = encoding
+        self.newline = newline
+        self.result: ArtifactWrite | None = None
+        self._tmp_path: Path | None = None
+        self._raw: IO[bytes] | None = None
+        self._writer: _HashingWriter | None = None
+        self._stream: IO[Any] | None = None
+
+    def __enter__(self) -> IO[Any]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        self._tmp_path = Path(tmp_name)
+        self._raw = os.fdopen(fd, "wb")
+        self._writer = _HashingWriter(self._raw)
+        buffered = io.BufferedWriter(self._writer)
+        if self.encoding is None:
+            self._stream = buffered
+        else:
+            self._stream = io.TextIOWrapper(buffered, encoding=self.encoding, newline=self.newline)
+        return self._stream
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        assert self._tmp_path and self._raw and self._stream
+        try:
+            try:
+                if exc_type is None:
+                    self._stream.flush()
+                    self._raw.flush()
+                    os.fsync(self._raw.fileno())
+            finally:
+                # Closing the stream closes its wrappers, not the temporary file under them
+                try:
+                    self._stream.close()
+                finally:
+                    self._raw.close()
+            if exc_type is None:
+                self.result = self._publish(self._tmp_path)
+        finally:
+            # Already gone once published (renamed) or found unchanged (deleted)
+            self._tmp_path.unlink(missing_ok=True)
+
+    def _publish(self, tmp_path: Path) -> ArtifactWrite:
+        assert self._writer is not None
+        size, digest = self._writer.size, self._writer.sha256.hexdigest()
+        try:
+            unchanged = self.path.stat().st_size == size and file_sha256(self.path) == digest
+        except OSError:
+            unchanged = False
+
+        if unchanged:
+            tmp_path.unlink()
+            run_metrics.count("artifacts.unchanged")
+        else:
+            os.chmod(tmp_path, ARTIFACT_MODE)
+            os.replace(tmp_path, self.path)
+            _fsync_directory(self.path.parent)
+            run_metrics.count("artifacts.written")
+            run_metrics.count("artifacts.bytes_written", size)
+        return ArtifactWrite(self.path, size, digest, changed=not unchanged)
+
+
+def keep_artifact(path: Path) -> ArtifactWrite:
+    """
+    Count an existing artifact as published unchanged, without rewriting it.
+
+    For writers that decide for themselves that the content is unchanged
+    (e.g. `json_codec.dump` with `ignore_keys`).
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    size = path.stat().st_size
+    digest = file_sha256(path)
+    if digest is None:
+        raise FileNotFoundError(path)
+    run_metrics.count("artifacts.unchanged")
+    return ArtifactWrite(path, size, digest, changed=False)
+
+
+def write_artifact(path: Path, content: bytes | Iterable[bytes]) -> ArtifactWrite:
+    """
+    Publish bytes to `path` atomically, skipping the write if unchanged.
+
+    Args:
+        path: Target file (its directory is created if needed)
+        content: The whole payload, or chunks of it to stream out
+
+    Returns:
+        Size, SHA-256 and whether the target was replaced
+
+    Raises:
+        OSError: If the file cannot be written (the target is then untouched)
+    """
+    artifact = AtomicArtifact(path)
+    with artifact as f:
+        if isinstance(content, bytes | bytearray | memoryview):
+            f.write(content)
+        else:
+            for chunk in content:
+                f.write(chunk)
+    assert artifact.result is not None
+    return artifact.result
@@ -0,0 +1,846 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the plan data pipeline.
+
+Each benchmark times the current implementation against the approach it
+replaced on the archived snapshots in `data/`, and verifies that both
+produce identical results. A non-zero exit code means the results differed.
+
+Usage:
+    python scripts/benchmark.py --list
+    python scripts/benchmark.py csv-columns [--repeat 5]
+    python scripts/benchmark.py columnar
+    python scripts/benchmark.py cost-engine [--profiles 200]
+    python scripts/benchmark.py dedup
+    python scripts/benchmark.py validation
+    python scripts/benchmark.py tdu
+    python scripts/benchmark.py numeric
+    python scripts/benchmark.py plan-record
+    python scripts/benchmark.py json
+    python scripts/benchmark.py startup
+    python scripts/benchmark.py etf-text   # EFL_TEXT_CORPUS_DIR=... adds *.txt EFL texts
+    python scripts/benchmark.py pdf-text   # EFL_PDF_CORPUS_DIR=... adds *.pdf EFLs
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import functools
+import gzip
+import io
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, TypeVar
+
+import json_codec
+import numpy as np
+from columnar import brotli_compress, decode_columnar, encode_columnar
+from cost_engine import PlanArrays, annual_cost, annual_costs
+from csv_schema import FIELD_ALIASES, CsvRow, get_schema_adapter
+from efl_etf import _load_pdfplumber, extract_etf_from_text, extract_pdf_text
+from fetch_plans import (
+    TDU_NAME_MAPPING,
+    calculate_plan_preference,
+    deduplicate_plans,
+    normalize_fingerprint_fee,
+    normalize_fingerprint_price,
+    normalize_tdu_name,
+    parse_csv_to_plans,
+    plan_fingerprint_key,
+)
+from models import ElectricityPlan
+from numeric_fields import parse_column, parse_float, parse_int, parse_price
+from numeric_reference import (
+    NUMERIC_EDGE_CASES,
+    exact_bits,
+    parse_float_cleanup_first,
+    parse_int_cleanup_first,
+    parse_price_cleanup_first,
+)
+from plan_record import Plan, PlanRecord, plans_as_dicts
+from plan_validation import plans_adapter, plans_file_adapter
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCRIPTS_DIR = Path(__file__).parent
+CSV_ARCHIVE_DIR = PROJECT_ROOT / "data" / "csv-archive"
+PLANS_JSON = PROJECT_ROOT / "data" / "plans.json"
+JSON_ARCHIVE_DIR = PROJECT_ROOT / "data" / "json-archive"
+
+T = TypeVar("T")
+Benchmark = Callable[[argparse.Namespace], bool]
+BENCHMARKS: dict[str, tuple[Benchmark, str]] = {}
+
+
+def benchmark(name: str, description: str) -> Callable[[Benchmark], Benchmark]:
+    """Register a benchmark under a command-line name."""
+
+    def register(func: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = (func, description)
+        return func
+
+    return register
+
+
+def best_of(func: Callable[[], T], repeat: int) -> tuple[float, T]:
+    """
+    Run a function several times and keep the fastest wall-clock time.
+
+    Args:
+        func: Zero-argument callable to time
+        repeat: Number of runs
+
+    Returns:
+        Tuple of (best time in seconds, result of the last run)
+    """
+    best = float("inf")
+    result: Any = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def print_row(label: str, baseline: float, current: float, ok: bool) -> None:
+    """Print one timing comparison line."""
+    speedup = baseline / current if current else float("inf")
+    status = "ok" if ok else "MISMATCH"
+    print(
+        f"  {label:<28} {baseline * 1000:>10.2f} ms {current * 1000:>10.2f} ms"
+        f" {speedup:>7.2f}x  {status}"
+    )
+
+
+def print_header(baseline: str, current: str) -> None:
+    """Print the column header for timing comparisons."""
+    print(f"  {'':<28} {baseline:>13} {current:>13} {'speedup':>8}")
+
+
+def archived_csv_files() -> list[Path]:
+    """Return the archived CSV snapshots in date order."""
+    return sorted(CSV_ARCHIVE_DIR.glob("plans_*.csv"))
+
+
+# --------------------------------------------------------------------------
+# csv-columns: header resolution vs per-row alias probing
+# --------------------------------------------------------------------------
+
+
+def _probe_aliases(row: dict[str, str | None], *keys: str) -> str:
+    """Per-row alias probing as done by the original DictReader parser."""
+    for key in keys:
+        val = row.get(key)
+        if val:
+            return val
+        val = row.get(f"[{key}]")
+        if val:
+            return val
+    return ""
+
+
+def _resolve_by_probing(lines: list[str]) -> list[CsvRow]:
+    rows = []
+    for row in csv.DictReader(lines):
+        rows.append(CsvRow._make(_probe_aliases(row, *FIELD_ALIASES[f]) for f in CsvRow._fields))
+    return rows
+
+
+def _resolve_by_schema(lines: list[str]) -> list[CsvRow]:
+    reader = csv.reader(lines)
+    schema = get_schema_adapter(tuple(next(reader)))
+    return [schema.extract(row) for row in reader if row]
+
+
+@benchmark("csv-columns", "CSV column resolution: schema adapter vs per-row alias probing")
+def bench_csv_columns(args: argparse.Namespace) -> bool:
+    print_header("probing", "schema")
+    all_ok = True
+    total_baseline = total_current = 0.0
+    for path in archived_csv_files():
+        lines = path.read_text(encoding="utf-8").splitlines()
+        baseline, expected = best_of(functools.partial(_resolve_by_probing, lines), args.repeat)
+        current, actual = best_of(functools.partial(_resolve_by_schema, lines), args.repeat)
+        ok = expected == actual
+        all_ok = all_ok and ok
+        total_baseline += baseline
+        total_current += current
+        print_row(path.name, baseline, current, ok)
+    print_row("TOTAL", total_baseline, total_current, all_ok)
+    return all_ok
+
+
+# --------------------------------------------------------------------------
+# columnar: plans.columnar.json vs pretty-printed plans.json
+# --------------------------------------------------------------------------
+
+
+def _compressed_sizes(payload: bytes) -> str:
+    sizes = [f"raw {len(payload):>10,}", f"gzip {len(gzip.compress(payload, 9, mtime=0)):>9,}"]
+    compressed = brotli_compress(payload)
+    if compressed is not None:
+        sizes.append(f"brotli {len(compressed):>9,}")
+    return "  ".join(sizes)
+
+
+@benchmark("columnar", "Columnar plans artifact: size and parse time vs plans.json")
+def bench_columnar(args: argparse.Namespace) -> bool:
+    plans_json = PLANS_JSON.read_bytes()
+    data = json.loads(plans_json)
+    columnar, text = encode_columnar(data)
+    columnar_json = json.dumps(columnar, ensure_ascii=False, separators=(",", ":")).encode()
+    text_json = json.dumps(text, ensure_ascii=False, separators=(",", ":")).encode()
+
+    print(f"  {'plans.json':<28} {_compressed_sizes(plans_json)}")
+    print(f"  {'plans.columnar.json':<28} {_compressed_sizes(columnar_json)}")
+    print(f"  {'plans.text.json':<28} {_compressed_sizes(text_json)}")
+    print()
+
+    print_header("plans.json", "columnar")
+    baseline, expected = best_of(lambda: json.loads(plans_json), args.repeat)
+    current, _ = best_of(lambda: json.loads(columnar_json), args.repeat)
+    print_row("parse (table columns only)", baseline, current, True)
+    current, actual = best_of(
+        lambda: decode_columnar(json.loads(columnar_json), json.loads(text_json)), args.repeat
+    )
+    ok: bool = expected == actual
+    print_row("parse + decode to rows", baseline, current, ok)
+    return ok
+
+
+# --------------------------------------------------------------------------
+# cost-engine: vectorized annual cost vs per-plan scalar loop
+# --------------------------------------------------------------------------
+
+
+@benchmark("cost-engine", "Annual cost of every plan: NumPy engine vs scalar loop")
+def bench_cost_engine(args: argparse.Namespace) -> bool:
+    plans = json.loads(PLANS_JSON.read_text(encoding="utf-8"))["plans"]
+    rng = np.random.default_rng(0)
+    profiles = rng.uniform(200, 3000, size=(args.profiles, 12)).round()
+
+    def scalar() -> list[list[float]]:
+        return [[annual_cost(profile, plan) for plan in plans] for profile in profiles.tolist()]
+
+    def vectorized() -> np.ndarray:
+        return annual_costs(profiles, PlanArrays.from_plans(plans))
+
+    print(f"  {len(plans)} plans x {len(profiles)} profiles")
+    print_header("scalar", "numpy")
+    baseline, expected = best_of(scalar, args.repeat)
+    current, actual = best_of(vectorized, args.repeat)
+    ok = np.array_equal(np.array(expected), actual)
+    print_row("annual costs", baseline, current, ok)
+    return ok
+
+
+# --------------------------------------------------------------------------
+# dedup: tuple fingerprints with cached scores vs JSON-string fingerprints
+# --------------------------------------------------------------------------
+
+
+def _json_fingerprint(plan: Plan) -> str:
+    """The original dict + sorted json.dumps fingerprint."""
+    fingerprint_data = {
+        "rep": (plan.get("rep_name") or "").upper().strip(),
+        "tdu": (plan.get("tdu_area") or "").upper().strip(),
+        "rate_type": (plan.get("rate_type") or "FIXED").upper().strip(),
+        "p500": normalize_fingerprint_price(plan.get("price_kwh_500")),
+        "p1000": normalize_fingerprint_price(plan.get("price_kwh_1000")),
+        "p2000": normalize_fingerprint_price(plan.get("price_kwh_2000")),
+        "term": plan.get("term_months") or 0,
+        "etf": normalize_fingerprint_fee(plan.get("early_termination_fee")),
+        "base": normalize_fingerprint_fee(plan.get("base_charge_monthly")),
+        "renewable": plan.get("renewable_pct") or 0,
+        "prepaid": bool(plan.get("is_prepaid")),
+        "tou": bool(plan.get("is_tou")),
+    }
+    return json.dumps(fingerprint_data, sort_keys=True)
+
+
+def _deduplicate_by_json(plans: Sequence[Plan]) -> list[Plan]:
+    """Deduplication as originally written: JSON fingerprints, scores recomputed."""
+    fingerprint_map: dict[str, Plan] = {}
+    for plan in plans:
+        fingerprint = _json_fingerprint(plan)
+        if fingerprint not in fingerprint_map:
+            fingerprint_map[fingerprint] = plan
+        elif calculate_plan_preference(plan) > calculate_plan_preference(
+            fingerprint_map[fingerprint]
+        ):
+            fingerprint_map[fingerprint] = plan
+    return list(fingerprint_map.values())
+
+
+def _grouping(plans: Sequence[Plan], key: Callable[[Plan], Any]) -> list[list[str]]:
+    """Plan IDs grouped by fingerprint, in first-seen order."""
+    groups: dict[Any, list[str]] = {}
+    for plan in plans:
+        groups.setdefault(key(plan), []).append(plan["plan_id"])
+    return list(groups.values())
+
+
+@benchmark("dedup", "Plan deduplication: tuple fingerprints vs JSON-string fingerprints")
+def bench_dedup(args: argparse.Namespace) -> bool:
+    print_header("json", "tuple")
+    all_ok = True
+    total_baseline = total_current = 0.0
+    for path in archived_csv_files():
+        with contextlib.redirect_stdout(io.StringIO()):
+            plans = parse_csv_to_plans(path.read_text(encoding="utf-8"))
+        baseline, expected = best_of(functools.partial(_deduplicate_by_json, plans), args.repeat)
+        current, actual = best_of(functools.partial(deduplicate_plans, plans), args.repeat)
+        ok = [p["plan_id"] for p in expected] == [p["plan_id"] for p in actual] and _grouping(
+            plans, _json_fingerprint
+        ) == _grouping(plans, plan_fingerprint_key)
+        all_ok = all_ok and ok
+        total_baseline += baseline
+        total_current += current
+        print_row(path.name, baseline, current, ok)
+    print_row("TOTAL", total_baseline, total_current, all_ok)
+    return all_ok
+
+
+# --------------------------------------------------------------------------
+# validation: one TypeAdapter call vs one model per plan
+# --------------------------------------------------------------------------
+
+
+@benchmark("validation", "ElectricityPlan validation: bulk TypeAdapter vs one model per plan")
+def bench_validation(args: argparse.Namespace) -> bool:
+    payload = PLANS_JSON.read_bytes()
+    plans = json.loads(payload)["plans"]
+    plans_adapter(), plans_file_adapter()  # build the core schemas outside the timings
+
+    def per_model() -> list[ElectricityPlan]:
+        return [ElectricityPlan(**plan) for plan in plans]
+
+    print(f"  {len(plans)} plans")
+    print_header("per model", "bulk")
+    baseline, expected = best_of(per_model, args.repeat)
+    current, actual = best_of(lambda: plans_adapter().validate_python(plans), args.repeat)
+    ok = expected == actual
+    print_row("validate_python", baseline, current, ok)
+
+    def parse_then_per_model() -> list[ElectricityPlan]:
+        return [ElectricityPlan(**plan) for plan in json.loads(payload)["plans"]]
+
+    baseline, _ = best_of(parse_then_per_model, args.repeat)
+    current, document = best_of(lambda: plans_file_adapter().validate_json(payload), args.repeat)
+    ok = ok and expected == document.plans
+    print_row("validate_json (from bytes)", baseline, current, expected == document.plans)
+    print(f"  {len(plans) / current:,.0f} plans/s validated from JSON")
+    return ok
+
+
+# --------------------------------------------------------------------------
+# tdu: memoized TDU normalization vs the mapping rebuilt on every call
+# --------------------------------------------------------------------------
+
+
+def _normalize_tdu_name_per_call(tdu_raw: str) -> str:
+    """TDU normalization as originally written: mapping rebuilt on every call, no memo."""
+    if not tdu_raw:
+        return "UNKNOWN"
+    tdu_upper = tdu_raw.upper().strip()
+    tdu_mapping = dict(TDU_NAME_MAPPING)
+    if tdu_upper in tdu_mapping:
+        return tdu_mapping[tdu_upper]
+    for key, code in tdu_mapping.items():
+        if key in tdu_upper or tdu_upper in key:
+            return code
+    return tdu_upper
+
+
+@benchmark("tdu", "TDU names: memoized module-level mapping vs mapping rebuilt per row")
+def bench_tdu(args: argparse.Namespace) -> bool:
+    names = [
+        row.tdu
+        for path in archived_csv_files()
+        for row in _resolve_by_schema(path.read_text(encoding="utf-8").splitlines())
+    ]
+    # Variants exercising the partial-match scan, each repeated like a real column
+    names += [f"{name} {suffix}" for name in TDU_NAME_MAPPING for suffix in ("CO", "INC")] * 50
+    names += ["", "Entergy Texas", "AEP"] * 50
+    print(f"  {len(names)} TDU values, {len(set(names))} distinct")
+    print_header("per call", "memoized")
+    baseline, expected = best_of(
+        lambda: [_normalize_tdu_name_per_call(name) for name in names], args.repeat
+    )
+    normalize_tdu_name.cache_clear()
+    current, actual = best_of(lambda: [normalize_tdu_name(name) for name in names], args.repeat)
+    ok = expected == actual
+    print_row("normalize_tdu_name", baseline, current, ok)
+    return ok
+
+
+# --------------------------------------------------------------------------
+# numeric: fast-path, memoized field parsers vs cleanup before every conversion
+# --------------------------------------------------------------------------
+
+
+@benchmark("numeric", "Numeric fields: fast path + memo vs cleanup before every conversion")
+def bench_numeric(args: argparse.Namespace) -> bool:
+    rows = [
+        row
+        for path in archived_csv_files()
+        for row in _resolve_by_schema(path.read_text(encoding="utf-8").splitlines())
+    ]
+    columns = {
+        "price": (
+            [value for row in rows for value in (row.price_500, row.price_1000, row.price_2000)],
+            parse_price_cleanup_first,
+            parse_price,
+        ),
+        "float": (
+            [value for row in rows for value in (row.cancel_fee, row.base_charge or "0")],
+            parse_float_cleanup_first,
+            parse_float,
+        ),
+        "int": (
+            [value for row in rows for value in (row.term, row.renewable or "0")],
+            parse_int_cleanup_first,
+            parse_int,
+        ),
+    }
+    print(f"  {len(rows)} rows, {sum(len(values) for values, _, _ in columns.values())} values")
+    print_header("cleanup", "fast path")
+    all_ok = True
+    for name, (values, original, parser) in columns.items():
+        values = values + list(NUMERIC_EDGE_CASES)
+        baseline, expected = best_of(lambda: [original(v) for v in values], args.repeat)  # noqa: B023
+        current, actual = best_of(lambda: [parser(v) for v in values], args.repeat)  # noqa: B023
+        column, batch = best_of(lambda: parse_column(values, parser), args.repeat)  # noqa: B023
+        ok = exact_bits(expected) == exact_bits(actual) == exact_bits(batch)
+        all_ok = all_ok and ok
+        print_row(f"parse_{name} (per value)", baseline, current, ok)
+        print_row(f"parse_{name} (parse_column)", baseline, column, ok)
+    return all_ok
+
+
+# --------------------------------------------------------------------------
+# plan-record: memory held by slotted PlanRecords vs per-plan dicts
+# --------------------------------------------------------------------------
+
+
+def _as_parsed_dict(plan: PlanRecord) -> dict[str, Any]:
+    """A plan as the parser used to build it: a dict with its own string copies."""
+    # str.encode().decode() makes a new object, like the CSV reader did per row
+    return {
+        key: value.encode().decode() if isinstance(value, str) else value
+        for key, value in plan.to_dict().items()
+    }
+
+
+def _retained_bytes(build: Callable[[], T]) -> tuple[int, T]:
+    """Return the memory still allocated after `build()` returns, and its result."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return tracemalloc.get_traced_memory()[0] - before, result
+    finally:
+        tracemalloc.stop()
+
+
+@benchmark("plan-record", "Plans held in memory: slotted PlanRecords vs dicts (tracemalloc)")
+def bench_plan_record(args: argparse.Namespace) -> bool:
+    texts = [path.read_text(encoding="utf-8") for path in archived_csv_files()]
+
+    def parse_all() -> list[PlanRecord]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [plan for text in texts for plan in parse_csv_to_plans(text)]
+
+    dict_bytes, dicts = _retained_bytes(lambda: [_as_parsed_dict(p) for p in parse_all()])
+    record_bytes, records = _retained_bytes(parse_all)
+    ok = plans_as_dicts(records) == dicts
+    print(f"  {len(records)} plans from {len(texts)} snapshots")
+    print(f"  {'':<24} {'retained':>12} {'per plan':>10}")
+    for label, size in (("dicts", dict_bytes), ("PlanRecord", record_bytes)):
+        print(f"  {label:<24} {size / 1e6:>9.1f} MB {size / len(records):>8.0f} B")
+    print(f"  {'saved':<24} {1 - record_bytes / dict_bytes:>11.0%}  {'ok' if ok else 'MISMATCH'}")
+    return ok
+
+
+# --------------------------------------------------------------------------
+# json: plans.json and json-archive encode/decode, stdlib json vs json_codec
+# --------------------------------------------------------------------------
+
+
+def _stdlib_dumps(obj: Any, pretty: bool) -> bytes:
+    """Serialize as save_plans did before json_codec."""
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _map_all(func: Callable[[Any], T], items: list[Any]) -> list[T]:
+    """Apply a codec function to every document in a corpus."""
+    return [func(item) for item in items]
+
+
+@benchmark("json", "plans.json and json-archive encode/decode: stdlib json vs json_codec")
+def bench_json(args: argparse.Namespace) -> bool:
+    corpora = {
+        "plans.json": [PLANS_JSON.read_bytes()],
+        "json-archive": [path.read_bytes() for path in sorted(JSON_ARCHIVE_DIR.glob("*.json"))],
+    }
+    ok = True
+    print_header("json", json_codec.backend())
+    for name, payloads in corpora.items():
+        size = sum(len(payload) for payload in payloads)
+        print(f"  {name} ({len(payloads)} files, {size / 1e6:.1f} MB)")
+        base_t, documents = best_of(functools.partial(_map_all, json.loads, payloads), args.repeat)
+        fast_t, decoded = best_of(
+            functools.partial(_map_all, json_codec.loads, payloads), args.repeat
+        )
+        same = decoded == documents
+        print_row("decode", base_t, fast_t, same)
+        ok &= same
+        for label, pretty in (("encode (indented)", True), ("encode (compact)", False)):
+            stdlib_dumps = functools.partial(_stdlib_dumps, pretty=pretty)
+            codec_dumps = functools.partial(json_codec.dumps, pretty=pretty)
+            base_t, expected = best_of(
+                functools.partial(_map_all, stdlib_dumps, documents), args.repeat
+            )
+            fast_t, encoded = best_of(
+                functools.partial(_map_all, codec_dumps, documents), args.repeat
+            )
+            same = encoded == expected
+            print_row(label, base_t, fast_t, same)
+            ok &= same
+        compact = sum(len(payload) for payload in encoded)
+        print(
+            f"  {'compact size':<28} {compact / 1e6:>10.1f} MB ({compact / size:.0%} of indented)"
+        )
+    return ok
+
+
+# --------------------------------------------------------------------------
+# startup: python -X importtime of the pipeline entry points
+# --------------------------------------------------------------------------
+
+# Cumulative import time allowed per module (microseconds); wall-clock, so
+# only checked here
+IMPORT_BUDGETS_US = {"fetch_plans": 250_000, "efl_etf": 150_000}
+
+# Modules each entry point may pull in beyond interpreter startup. The count is
+# deterministic, so tests/test_startup.py enforces it (81 and 71 on Python 3.11;
+# requests alone adds about 60, NumPy over 100)
+IMPORT_MODULE_BUDGETS = {"fetch_plans": 100, "efl_etf": 90}
+
+# Dependencies that only the network, PDF, NumPy or validation stages need
+LAZY_DEPENDENCIES = ("requests", "pdfplumber", "numpy", "pydantic", "asyncio")
+
+
+def import_times(module: str) -> dict[str, int]:
+    """
+    Import a module in a fresh interpreter under `-X importtime`.
+
+    Args:
+        module: Module name importable from scripts/
+
+    Returns:
+        Cumulative import time in microseconds per imported module, excluding
+        modules the interpreter loads at startup (site, .pth hooks)
+    """
+    env = {**os.environ, "PYTHONPATH": str(SCRIPTS_DIR)}
+    startup = _parse_importtime(
+        subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "pass"],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        ).stderr
+    )
+    times = _parse_importtime(
+        subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        ).stderr
+    )
+    return {name: us for name, us in times.items() if name not in startup}
+
+
+def _parse_importtime(stderr: str) -> dict[str, int]:
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@benchmark("startup", "Import time of the pipeline entry points (python -X importtime)")
+def bench_startup(args: argparse.Namespace) -> bool:
+    all_ok = True
+    for module, budget in IMPORT_BUDGETS_US.items():
+        runs = [import_times(module) for _ in range(max(1, args.repeat))]
+        best = min(times[module] for times in runs)
+        modules, module_budget = len(runs[0]), IMPORT_MODULE_BUDGETS[module]
+        ok = best <= budget and modules <= module_budget
+        all_ok = all_ok and ok
+        status = "ok" if ok else "OVER BUDGET"
+        print(
+            f"  {module:<28} {best / 1000:>10.1f} ms  (budget {budget / 1000:.0f} ms)"
+            f"  {modules} modules (budget {module_budget})  {status}"
+        )
+
+    times = import_times("fetch_plans")
+    loaded = [name for name in LAZY_DEPENDENCIES if name in times]
+    print(f"  lazy dependencies loaded by fetch_plans: {', '.join(loaded) or 'none'}")
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[1:6]
+    for name, us in slowest:
+        print(f"    {name:<26} {us / 1000:>10.1f} ms")
+    return all_ok and not loaded
+
+
+# --------------------------------------------------------------------------
+# etf-text: single-pass ETF extractor vs one re.search per pattern
+# --------------------------------------------------------------------------
+
+
+def _extract_etf_by_search(text: str) -> dict[str, Any] | None:
+    """ETF extraction as originally written: re.sub, then up to 12 re.search calls."""
+    if not text:
+        return None
+    normalized = re.sub(r"\s+", " ", text).strip().lower()
+    no_fee_patterns = [
+        r"no\s+(?:early\s+)?(?:termination|cancellation)\s+fee",
+        r"early\s+termination\s+fee\s*[:\-]?\s*none",
+        r"early\s+termination\s+fee\s*[:\-]?\s*\$?0\b",
+        r"cancellation\s+fee\s*[:\-]?\s*none",
+        r"cancellation\s+fee\s*[:\-]?\s*\$?0\b",
+    ]
+    if any(re.search(pat, normalized) for pat in no_fee_patterns):
+        return {"structure": "none", "source": "efl"}
+    per_month_patterns = [
+        r"\$(\d+(?:\.\d{2})?)\s*(?:per|/)\s*(?:each\s+)?(?:month|mo)\s*(?:remaining|left)",
+        r"\$(\d+(?:\.\d{2})?)\s*(?:for\s+each)\s+(?:remaining\s+)?month",
+        r"\$(\d+(?:\.\d{2})?)\s*(?:multiplied\s+by|times|x)\s*(?:the\s+)?(?:number\s+of\s+)?"
+        r"months?\s*(?:remaining|left)",
+        r"\$(\d+(?:\.\d{2})?)\s*(?:multiplied\s+by|times|x)\s*(?:the\s+)?(?:number\s+of\s+)?"
+        r"months?\s*(?:remaining|left).*?term",
+        r"\$(\d+(?:\.\d{2})?)\s*(?:per|/)\s*(?:month|mo)\s*remaining",
+    ]
+    for pat in per_month_patterns:
+        match = re.search(pat, normalized)
+        if match:
+            return {
+                "structure": "per-month",
+                "per_month_rate": float(match.group(1)),
+                "source": "efl",
+            }
+    flat_patterns = [
+        r"early\s+(?:termination|cancellation)\s+fee[^\d\$]{0,20}\$?(\d+(?:\.\d{2})?)",
+        r"cancellation\s+fee[^\d\$]{0,20}\$?(\d+(?:\.\d{2})?)",
+    ]
+    for pat in flat_patterns:
+        match = re.search(pat, normalized)
+        if match:
+            return {"structure": "flat", "flat_fee": float(match.group(1)), "source": "efl"}
+    if "early termination fee" in normalized or "cancellation fee" in normalized:
+        return {"structure": "unknown", "source": "efl"}
+    return None
+
+
+# Building blocks of the synthetic EFL corpus
+_EFL_FILLER = (
+    "Electricity Facts Label\nAverage monthly use: 500 kWh 1,000 kWh 2,000 kWh",
+    "Average price per kWh 15.2\u00a2 14.1\u00a2 13.6\u00a2  Energy Charge: 11.2\u00a2 per kWh",
+    "This price disclosure is an example based on average prices. Your average price\n"
+    "for electric service will vary according to your usage.",
+    "TDU Delivery Charges: $4.23 per month and 5.5833\u00a2 per kWh are passed through.",
+    "Renewable content: 100%. Statewide average: 31%. Base charge: $9.95 per billing cycle.",
+    "Customer Service 1-800-555-0100, Mon\u2013Fri 8am\u20138pm. PUCT Cert. #10000.",
+)
+_ETF_PHRASES = (
+    "Early Termination Fee: ${amount}",
+    "Cancellation fee:\n ${amount} per month remaining",
+    "early termination fee ${amount} multiplied by the number of months remaining in term",
+    "a fee of ${amount} for each remaining month",
+    "Early Cancellation Fee (see Terms of Service) ${amount}",
+    "No early termination fee",
+    "Cancellation Fee: None",
+    "Early Termination Fee: $0",
+    "Termination fee applies; see your Terms of Service",
+    "see cancellation fee schedule",
+    "${amount}/mo left on the contract",
+    "${amount} x months remaining",
+)
+
+
+def efl_text_corpus() -> list[str]:
+    """
+    Build the ETF extraction corpus.
+
+    EFL texts (*.txt) from `EFL_TEXT_CORPUS_DIR` when set (EFL bodies are not
+    archived), the text columns of every archived CSV row, and synthetic
+    multi-page EFLs mixing the fee phrasings in varying order.
+    """
+    corpus = []
+    corpus_dir = os.getenv("EFL_TEXT_CORPUS_DIR")
+    if corpus_dir:
+        corpus += [p.read_text(encoding="utf-8") for p in sorted(Path(corpus_dir).glob("*.txt"))]
+
+    for path in archived_csv_files():
+        for row in _resolve_by_schema(path.read_text(encoding="utf-8").splitlines()):
+            text = " ".join(
+                (row.pricing_details, row.special_terms, row.promotion_details, row.fees_credits)
+            )
+            if text.strip():
+                corpus.append(text)
+
+    rng = random.Random(0)
+    for _ in range(2000):
+        parts = [rng.choice(_EFL_FILLER) for _ in range(rng.randint(10, 60))]
+        for _ in range(rng.randint(0, 3)):
+            amount = rng.choice(["10", "15.00", "20", "150", "175.50", "295", "0"])
+            phrase = rng.choice(_ETF_PHRASES).replace("{amount}", amount)
+            parts.insert(rng.randint(0, len(parts)), phrase)
+        corpus.append("\n".join(parts))
+    return corpus
+
+
+@benchmark("etf-text", "ETF extraction: keyword-anchored matching vs one re.search per pattern")
+def bench_etf_text(args: argparse.Namespace) -> bool:
+    corpus = efl_text_corpus()
+    print(f"  {len(corpus)} texts, {sum(len(text) for text in corpus):,} characters")
+    print_header("re.search", "anchored")
+    baseline, expected = best_of(
+        lambda: [_extract_etf_by_search(text) for text in corpus], args.repeat
+    )
+    current, actual = best_of(lambda: [extract_etf_from_text(text) for text in corpus], args.repeat)
+    ok = expected == actual
+    print_row("extract_etf_from_text", baseline, current, ok)
+    structures: dict[str, int] = {}
+    for result in actual:
+        key = result["structure"] if result else "no match"
+        structures[key] = structures.get(key, 0) + 1
+    print(f"  results: {', '.join(f'{k} {v}' for k, v in sorted(structures.items()))}")
+    return ok
+
+
+# --------------------------------------------------------------------------
+# pdf-text: bounded, cheapest-first PDF text extraction vs pdfplumber in full
+# --------------------------------------------------------------------------
+
+
+def efl_pdf_corpus(count: int = 40) -> list[bytes]:
+    """
+    Build the PDF extraction corpus.
+
+    EFL PDFs (*.pdf) from `EFL_PDF_CORPUS_DIR` when set, plus synthetic
+    one to three page EFLs with at most one fee phrase on a random page.
+    """
+    # The synthetic EFL builder is shared with the test suite
+    sys.path.insert(0, str(PROJECT_ROOT))
+    from tests.conftest import build_efl_pdf
+
+    corpus = []
+    corpus_dir = os.getenv("EFL_PDF_CORPUS_DIR")
+    if corpus_dir:
+        corpus += [p.read_bytes() for p in sorted(Path(corpus_dir).glob("*.pdf"))]
+
+    rng = random.Random(0)
+    for _ in range(count):
+        pages = [
+            [
+                line
+                for _ in range(rng.randint(8, 20))
+                for line in rng.choice(_EFL_FILLER).split("\n")
+            ]
+            for _ in range(rng.randint(1, 3))
+        ]
+        if rng.random() < 0.8:
+            amount = rng.choice(["10", "15.00", "150", "295", "0"])
+            phrase = rng.choice(_ETF_PHRASES).replace("{amount}", amount)
+            page = rng.choice(pages)
+            page[rng.randint(0, len(page)) : 0] = phrase.split("\n")
+        corpus.append(build_efl_pdf(pages))
+    return corpus
+
+
+def _extract_pdf_text_in_full(content: bytes) -> str:
+    """PDF text extraction as originally written: pdfplumber over the first two pages."""
+    pdfplumber = _load_pdfplumber()
+    if pdfplumber is None:
+        raise SystemExit("The pdf-text benchmark needs pdfplumber installed")
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        return "\n".join(page.extract_text() or "" for page in pdf.pages[:2])
+
+
+@benchmark("pdf-text", "EFL PDF text: cheapest extractor with early exit vs pdfplumber in full")
+def bench_pdf_text(args: argparse.Namespace) -> bool:
+    corpus = efl_pdf_corpus()
+    print(f"  {len(corpus)} PDFs, {sum(len(pdf) for pdf in corpus):,} bytes")
+    print_header("pdfplumber", "bounded")
+    baseline, expected = best_of(
+        lambda: [extract_etf_from_text(_extract_pdf_text_in_full(pdf)) for pdf in corpus],
+        args.repeat,
+    )
+    current, extractions = best_of(lambda: [extract_pdf_text(pdf) for pdf in corpus], args.repeat)
+    actual = [extract_etf_from_text(extraction.text) for extraction in extractions]
+    ok = expected == actual
+    print_row("ETF from EFL PDF", baseline, current, ok)
+
+    by_extractor: dict[str, int] = {}
+    for extraction in extractions:
+        key = extraction.extractor or "none"
+        by_extractor[key] = by_extractor.get(key, 0) + 1
+    slowest = max(extractions, key=lambda extraction: extraction.cpu_seconds)
+    print(
+        f"  extractor: {', '.join(f'{k} {v}' for k, v in sorted(by_extractor.items()))};"
+        f" pages read {sum(extraction.pages for extraction in extractions)};"
+        f" slowest document {slowest.cpu_seconds * 1000:.1f} ms CPU"
+    )
+    return ok
+
+
+def main() -> int:
+    """
+    Main entry point.
+
+    Returns:
+        Exit code (0 if every benchmark produced identical results)
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("names", nargs="*", help="Benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--list", action="store_true", help="List available benchmarks")
+    parser.add_argument("--profiles", type=int, default=200, help="Usage profiles (cost-engine)")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (_, description) in BENCHMARKS.items():
+            print(f"{name:<20} {description}")
+        return 0
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    all_ok = True
+    for name in args.names or list(BENCHMARKS):
+        func, description = BENCHMARKS[name]
+        print(f"\n{name}: {description}")
+        all_ok = func(args) and all_ok
+    return 0 if all_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
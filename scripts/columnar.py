@@ -0,0 +1,232 @@
+"""
+Compact columnar encoding of plans.json.
+
+`plans.json` repeats every key for every plan and is pretty-printed, so most
+of its bytes are whitespace and field names. The columnar artifact stores the
+same data as struct-of-arrays JSON:
+
+- `plans.columnar.json`: one array per field; low-cardinality strings
+  (`rep_name`, `tdu_area`, `rate_type`, `language`) are dictionary-encoded as
+  indices into a per-field value list, and fields that only some plans carry
+  (`etf_details`) are stored sparsely
+- `plans.text.json`: the long free-text fields, split out (and
+  dictionary-encoded, since the same terms repeat across TDUs) so the site
+  can defer loading them
+
+Both files are also written pre-compressed (`.gz`, and `.br` when the optional
+`brotli` package is installed). `decode_columnar` rebuilds the exact
+plans.json document, including key order.
+"""
+
+from __future__ import annotations
+
+import functools
+import gzip
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+from typing import Any, cast
+
+import json_codec
+from artifacts import keep_artifact, write_artifact
+
+COLUMNAR_FORMAT = "plans-columnar"
+COLUMNAR_VERSION = 1
+COLUMNAR_FILENAME = "plans.columnar.json"
+TEXT_FILENAME = "plans.text.json"
+
+# Repeated categorical strings stored once per distinct value
+DICTIONARY_FIELDS = frozenset({"rep_name", "tdu_area", "rate_type", "language"})
+
+# Long free-text fields moved to the separate text file
+TEXT_FIELDS = frozenset({"special_terms", "promotion_details", "fees_credits", "min_usage_fees"})
+
+# Top-level plans.json keys other than "plans", kept verbatim
+METADATA_FIELDS = ("last_updated", "data_source", "total_plans", "disclaimer")
+
+
+@functools.cache
+def _load_brotli() -> ModuleType | None:
+    """Import brotli (an optional dependency for .br output), or None if missing."""
+    try:
+        import brotli  # type: ignore[import-not-found, import-untyped, unused-ignore]
+    except ImportError:  # pragma: no cover - optional dependency for .br output
+        return None
+    return cast(ModuleType, brotli)
+
+
+def brotli_compress(payload: bytes) -> bytes | None:
+    """Compress at the highest brotli quality, or return None if brotli is not installed."""
+    brotli = _load_brotli()
+    if brotli is None:
+        return None
+    return cast(bytes, brotli.compress(payload, quality=11))
+
+
+def _dictionary_encode(values: list[Any]) -> tuple[list[Any], list[int]]:
+    """Encode values as (distinct values in first-seen order, indices)."""
+    index_by_value: dict[Any, int] = {}
+    indices = []
+    for value in values:
+        index = index_by_value.get(value)
+        if index is None:
+            index = index_by_value[value] = len(index_by_value)
+        indices.append(index)
+    return list(index_by_value), indices
+
+
+def encode_columnar(data: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Encode a plans.json document into columnar and text documents.
+
+    Args:
+        data: plans.json document (metadata plus "plans" list)
+
+    Returns:
+        Tuple of (columnar document, text document)
+    """
+    plans: list[dict[str, Any]] = data.get("plans", [])
+
+    # Field order as first seen, so decoding reproduces each plan's key order
+    fields: dict[str, None] = {}
+    for plan in plans:
+        fields.update(dict.fromkeys(plan))
+
+    columns: dict[str, Any] = {}
+    text_columns: dict[str, Any] = {}
+    dictionaries: dict[str, list[Any]] = {}
+    sparse: dict[str, dict[str, list[Any]]] = {}
+
+    for field in fields:
+        if not all(field in plan for plan in plans):
+            present = [i for i, plan in enumerate(plans) if field in plan]
+            sparse[field] = {"index": present, "values": [plans[i][field] for i in present]}
+            continue
+
+        values = [plan[field] for plan in plans]
+        if field in DICTIONARY_FIELDS or field in TEXT_FIELDS:
+            distinct, values = _dictionary_encode(values)
+            dictionaries[field] = distinct
+        (text_columns if field in TEXT_FIELDS else columns)[field] = values
+
+    columnar = {
+        "format": COLUMNAR_FORMAT,
+        "version": COLUMNAR_VERSION,
+        **{key: data[key] for key in METADATA_FIELDS if key in data},
+        "fields": list(fields),
+        "dictionaries": {k: v for k, v in dictionaries.items() if k not in TEXT_FIELDS},
+        "columns": columns,
+        "sparse": sparse,
+        "text_file": TEXT_FILENAME,
+    }
+    text = {
+        "format": f"{COLUMNAR_FORMAT}-text",
+        "version": COLUMNAR_VERSION,
+        "dictionaries": {k: v for k, v in dictionaries.items() if k in TEXT_FIELDS},
+        "columns": text_columns,
+    }
+    return columnar, text
+
+
+def decode_columnar(columnar: dict[str, Any], text: dict[str, Any] | None = None) -> dict[str, Any]:
+    """
+    Rebuild a plans.json document from its columnar encoding.
+
+    Args:
+        columnar: Columnar document
+        text: Text document; text fields are omitted from plans when absent
+
+    Returns:
+        plans.json document
+    """
+    if columnar.get("format") != COLUMNAR_FORMAT or columnar.get("version") != COLUMNAR_VERSION:
+        raise ValueError("Unsupported columnar plans format")
+
+    columns = dict(columnar["columns"])
+    dictionaries = dict(columnar["dictionaries"])
+    if text is not None:
+        columns.update(text["columns"])
+        dictionaries.update(text["dictionaries"])
+
+    for field, distinct in dictionaries.items():
+        columns[field] = [distinct[i] for i in columns[field]]
+
+    total = columnar.get("total_plans", 0)
+    sparse_values: dict[str, dict[int, Any]] = {
+        field: dict(zip(entry["index"], entry["values"], strict=True))
+        for field, entry in columnar["sparse"].items()
+    }
+
+    plans = []
+    for i in range(total):
+        plan: dict[str, Any] = {}
+        for field in columnar["fields"]:
+            if field in columns:
+                plan[field] = columns[field][i]
+            elif i in sparse_values.get(field, {}):
+                plan[field] = sparse_values[field][i]
+        plans.append(plan)
+
+    data: dict[str, Any] = {key: columnar[key] for key in METADATA_FIELDS if key in columnar}
+    data["plans"] = plans
+    return data
+
+
+def _write_with_compressed_variants(
+    document: dict[str, Any], path: Path, ignore_keys: tuple[str, ...] = ()
+) -> dict[str, int]:
+    """
+    Write a document plus .gz/.br variants and return their sizes in bytes.
+
+    The file is kept as it is when it already holds the document apart from
+    `ignore_keys`. When the payload file is unchanged, existing variants are
+    kept rather than compressed again (both compressors are deterministic).
+    """
+    if ignore_keys and json_codec.same_document(path, document, ignore_keys):
+        written = keep_artifact(path)
+        payload = path.read_bytes()  # what a missing variant must hold
+    else:
+        payload = json_codec.dumps(document)
+        written = write_artifact(path, payload)
+    sizes = {"raw": written.size}
+    changed = written.changed
+
+    variants: dict[str, tuple[str, Callable[[], bytes | None]]] = {
+        "gzip": (".gz", lambda: gzip.compress(payload, compresslevel=9, mtime=0))
+    }
+    if _load_brotli() is not None:
+        variants["brotli"] = (".br", lambda: brotli_compress(payload))
+    for encoding, (suffix, compress) in variants.items():
+        variant_path = path.with_name(path.name + suffix)
+        if not changed and variant_path.exists():
+            sizes[encoding] = variant_path.stat().st_size
+        elif (compressed := compress()) is not None:
+            sizes[encoding] = write_artifact(variant_path, compressed).size
+    return sizes
+
+
+def write_columnar_artifacts(data: dict[str, Any], output_dir: Path) -> dict[str, dict[str, int]]:
+    """
+    Write the columnar and text artifacts (plus compressed variants).
+
+    Args:
+        data: plans.json document
+        output_dir: Directory to write into (normally data/)
+
+    Returns:
+        Sizes in bytes per artifact file name and encoding
+    """
+    columnar, text = encode_columnar(data)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    sizes = {}
+    for name, document in ((COLUMNAR_FILENAME, columnar), (TEXT_FILENAME, text)):
+        try:
+            # A new fetch time alone does not rewrite the columnar file
+            sizes[name] = _write_with_compressed_variants(
+                document, output_dir / name, ignore_keys=("last_updated",)
+            )
+        except OSError as e:
+            print(f"Error: Failed to write {name}: {e}", file=sys.stderr)
+    return sizes
@@ -0,0 +1,274 @@
+"""
+Vectorized annual cost engine.
+
+Python/NumPy port of `src/ts/modules/cost-calculator.ts`. Plans are loaded once
+into column arrays (`PlanArrays`); `annual_costs` then evaluates every plan
+against any number of 12-month usage profiles in a single broadcast pass:
+
+- energy rate: piecewise-linear interpolation between the 500/1000/2000 kWh
+  prices (`interpolateRate`), flat outside 500..2000 kWh
+- REP base charge, usage-window bill credits and local sales tax
+  (`calculateMonthlyCost`)
+- TDU delivery charges from `tdu-rates.json`, reported separately; as in the
+  front end they are not added to the total because EFL prices already
+  include them
+
+Arithmetic is done in the same order as the TypeScript, and months are summed
+sequentially, so results are bit-identical to the scalar `annual_cost`.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import json_codec
+import numpy as np
+import numpy.typing as npt
+
+FloatArray = npt.NDArray[np.float64]
+
+MONTHS = 12
+
+# Upper bound on profile x month x plan elements evaluated per batch
+MAX_BATCH_ELEMENTS = 4_000_000
+
+# Same patterns as CostCalculator.calculateBillCredits
+BILL_CREDIT_PATTERN = re.compile(r"\$(\d+)\s+bill\s+credit", re.IGNORECASE)
+BILL_CREDIT_RANGE_PATTERN = re.compile(r"between\s+(\d+)-(\d+)\s+kwh", re.IGNORECASE)
+BILL_CREDIT_EXACT_PATTERN = re.compile(r"exactly\s+(\d+)\s+kwh", re.IGNORECASE)
+
+
+def parse_bill_credit(special_terms: str | None) -> tuple[float, float, float] | None:
+    """
+    Extract a usage-window bill credit from a plan's special terms.
+
+    Returns:
+        (credit in dollars, min kWh, max kWh), or None if the plan has none
+    """
+    if special_terms is None:
+        return None
+    terms = special_terms.lower()
+    credit = BILL_CREDIT_PATTERN.search(terms)
+    window = BILL_CREDIT_RANGE_PATTERN.search(terms) or BILL_CREDIT_EXACT_PATTERN.search(terms)
+    if credit is None or window is None:
+        return None
+    min_kwh = float(window.group(1))
+    max_kwh = float(window.group(2)) if window.lastindex == 2 else min_kwh
+    return float(credit.group(1)), min_kwh, max_kwh
+
+
+def load_tdu_rates(path: Path) -> dict[str, dict[str, Any]]:
+    """Load tdu-rates.json keyed by TDU code."""
+    data = json_codec.load(path)
+    return {tdu["code"]: tdu for tdu in data.get("tdus", [])}
+
+
+@dataclass(frozen=True)
+class PlanArrays:
+    """Per-plan inputs of the cost model as aligned column arrays."""
+
+    plan_ids: list[str]
+    tdu_areas: list[str]
+    price_500: FloatArray
+    price_1000: FloatArray
+    price_2000: FloatArray
+    base_charge: FloatArray
+    credit_amount: FloatArray
+    credit_min_kwh: FloatArray
+    credit_max_kwh: FloatArray
+    tdu_base_charge: FloatArray
+    tdu_per_kwh: FloatArray
+
+    def __len__(self) -> int:
+        return len(self.plan_ids)
+
+    @classmethod
+    def from_plans(
+        cls,
+        plans: Iterable[Mapping[str, Any]],
+        tdu_rates: Mapping[str, Mapping[str, Any]] | None = None,
+    ) -> PlanArrays:
+        """
+        Load plans (plans.json dicts, or `ElectricityPlan.model_dump()`) into arrays.
+
+        Missing prices and base charges count as 0, like the front end. Plans
+        without a bill credit get a NaN usage window, which never matches.
+        Plans whose TDU is not in `tdu_rates` get NaN TDU charges.
+        """
+        plans = list(plans)
+        tdu_rates = tdu_rates or {}
+
+        def column(values: Iterable[float | None]) -> FloatArray:
+            return np.array([0.0 if v is None else v for v in values], dtype=np.float64)
+
+        parsed_credits = [parse_bill_credit(plan.get("special_terms")) for plan in plans]
+        no_credit = (0.0, np.nan, np.nan)
+        credit_columns = np.array([c or no_credit for c in parsed_credits], dtype=np.float64)
+        credit_columns = credit_columns.reshape(len(plans), 3)
+
+        tdus = [tdu_rates.get(plan.get("tdu_area") or "") for plan in plans]
+        return cls(
+            plan_ids=[plan.get("plan_id", "") for plan in plans],
+            tdu_areas=[plan.get("tdu_area", "") for plan in plans],
+            price_500=column(plan.get("price_kwh_500") for plan in plans),
+            price_1000=column(plan.get("price_kwh_1000") for plan in plans),
+            price_2000=column(plan.get("price_kwh_2000") for plan in plans),
+            base_charge=column(plan.get("base_charge_monthly") for plan in plans),
+            credit_amount=credit_columns[:, 0].copy(),
+            credit_min_kwh=credit_columns[:, 1].copy(),
+            credit_max_kwh=credit_columns[:, 2].copy(),
+            tdu_base_charge=np.array(
+                [np.nan if t is None else t["monthly_base_charge"] for t in tdus], dtype=np.float64
+            ),
+            tdu_per_kwh=np.array(
+                [np.nan if t is None else t["per_kwh_rate"] for t in tdus], dtype=np.float64
+            ),
+        )
+
+
+def interpolate_rates(usage: FloatArray, plans: PlanArrays) -> FloatArray:
+    """
+    Energy rate (cents/kWh) for each usage value and plan.
+
+    Args:
+        usage: Usage in kWh, shape (..., 1) to broadcast against the plan axis
+        plans: Plan arrays
+
+    Returns:
+        Rates with shape broadcast(usage, (n_plans,))
+    """
+    p500, p1000, p2000 = plans.price_500, plans.price_1000, plans.price_2000
+    low = p500 + (p1000 - p500) * ((usage - 500) / 500)
+    high = p1000 + (p2000 - p1000) * ((usage - 1000) / 1000)
+    return np.where(
+        usage <= 500,
+        p500,
+        np.where(usage <= 1000, low, np.where(usage <= 2000, high, p2000)),
+    )
+
+
+def monthly_costs(usage: FloatArray, plans: PlanArrays, local_tax_rate: float = 0.0) -> FloatArray:
+    """
+    Monthly bill total for each usage value and plan (`calculateMonthlyCost`).
+
+    Args:
+        usage: Usage in kWh, shape (..., 1)
+        plans: Plan arrays
+        local_tax_rate: Local sales tax rate (e.g. 0.02 for 2%)
+
+    Returns:
+        Totals in dollars with shape broadcast(usage, (n_plans,))
+    """
+    energy_cost = (usage * interpolate_rates(usage, plans)) / 100
+    subtotal = energy_cost + plans.base_charge
+    in_window = (usage >= plans.credit_min_kwh) & (usage <= plans.credit_max_kwh)
+    bill_credits = np.where(in_window, plans.credit_amount, 0.0)
+    tax = np.maximum(0.0, subtotal - bill_credits) * local_tax_rate
+    result: FloatArray = np.maximum(0.0, subtotal - bill_credits + tax)
+    return result
+
+
+def _as_profiles(profiles: Sequence[float] | Sequence[Sequence[float]] | FloatArray) -> FloatArray:
+    array = np.asarray(profiles, dtype=np.float64)
+    if array.ndim == 1:
+        array = array[np.newaxis, :]
+    if array.ndim != 2 or array.shape[1] != MONTHS:
+        raise ValueError(
+            f"Usage profiles must have {MONTHS} monthly values, got shape {array.shape}"
+        )
+    return array
+
+
+def annual_costs(
+    profiles: Sequence[float] | Sequence[Sequence[float]] | FloatArray,
+    plans: PlanArrays,
+    local_tax_rate: float = 0.0,
+) -> FloatArray:
+    """
+    Annual cost of every plan for every 12-month usage profile.
+
+    Profiles are evaluated in batches so temporaries stay under
+    MAX_BATCH_ELEMENTS elements.
+
+    Args:
+        profiles: One profile (12 values) or an array of shape (n_profiles, 12)
+        plans: Plan arrays
+        local_tax_rate: Local sales tax rate
+
+    Returns:
+        Annual totals in dollars, shape (n_profiles, n_plans)
+
+    Raises:
+        ValueError: If a profile does not have 12 months
+    """
+    usage = _as_profiles(profiles)
+    totals = np.empty((usage.shape[0], len(plans)), dtype=np.float64)
+    batch = max(1, MAX_BATCH_ELEMENTS // (MONTHS * max(1, len(plans))))
+
+    for start in range(0, usage.shape[0], batch):
+        chunk = usage[start : start + batch, :, np.newaxis]
+        monthly = monthly_costs(chunk, plans, local_tax_rate)
+        # Sum months in order (not pairwise) to match the front end exactly
+        total = monthly[:, 0].copy()
+        for month in range(1, MONTHS):
+            total += monthly[:, month]
+        totals[start : start + batch] = total
+    return totals
+
+
+def annual_tdu_costs(
+    profiles: Sequence[float] | Sequence[Sequence[float]] | FloatArray, plans: PlanArrays
+) -> FloatArray:
+    """
+    Annual TDU delivery charges per profile and plan (already part of EFL prices).
+
+    Returns:
+        Dollars, shape (n_profiles, n_plans); NaN for plans with unknown TDU rates
+    """
+    usage = _as_profiles(profiles)[:, :, np.newaxis]
+    monthly = plans.tdu_base_charge + (usage * plans.tdu_per_kwh) / 100
+    result: FloatArray = monthly.sum(axis=1)
+    return result
+
+
+def annual_cost(
+    monthly_usage: Sequence[float],
+    plan: Mapping[str, Any],
+    local_tax_rate: float = 0.0,
+) -> float:
+    """
+    Scalar annual cost of one plan (`calculateAnnualCost`), for one-off checks.
+
+    Raises:
+        ValueError: If monthly_usage does not have 12 values
+    """
+    if len(monthly_usage) != MONTHS:
+        raise ValueError(
+            f"monthly_usage must contain exactly {MONTHS} values, got {len(monthly_usage)}"
+        )
+
+    p500 = plan.get("price_kwh_500") or 0.0
+    p1000 = plan.get("price_kwh_1000") or 0.0
+    p2000 = plan.get("price_kwh_2000") or 0.0
+    base = plan.get("base_charge_monthly") or 0.0
+    credit = parse_bill_credit(plan.get("special_terms"))
+
+    total = 0.0
+    for usage in monthly_usage:
+        if usage <= 500:
+            rate = p500
+        elif usage <= 1000:
+            rate = p500 + (p1000 - p500) * ((usage - 500) / 500)
+        elif usage <= 2000:
+            rate = p1000 + (p2000 - p1000) * ((usage - 1000) / 1000)
+        else:
+            rate = p2000
+        subtotal = (usage * rate) / 100 + base
+        bill_credits = credit[0] if credit and credit[1] <= usage <= credit[2] else 0.0
+        tax = max(0.0, subtotal - bill_credits) * local_tax_rate
+        total += max(0.0, subtotal - bill_credits + tax)
+    return total
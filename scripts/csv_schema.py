@@ -0,0 +1,185 @@
+"""
+Column resolution for Power to Choose CSV exports.
+
+Power to Choose has shipped several header dialects over time (bracketed
+`[kwh500]`, consumer-friendly `Price/kWh 500`, and our own archive columns
+such as `price_kwh_500`). Instead of probing every alias on every row, the
+header is resolved once into a `CsvSchemaAdapter` that maps each logical field
+to the ordered column indices that may hold it. Rows are then read as plain
+lists with `csv.reader`.
+
+Adapters are cached per header signature, so re-parsing many files that share
+a header (e.g. the CSV archive) resolves it only once.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import NamedTuple
+
+# Column aliases per logical field, in priority order. Each alias is also
+# tried in its bracketed form (`[alias]`) right after the bare name.
+# To support a new Power to Choose column, add it to the relevant tuple here.
+FIELD_ALIASES: dict[str, tuple[str, ...]] = {
+    "tdu": ("TduCompanyName", "TduCompany", "TDU", "TDU Area", "tdu_area"),
+    "price_500": ("kwh500", "Price/kWh 500", "Price/kWh: 500 kWh", "Price500", "price_kwh_500"),
+    "price_1000": (
+        "kwh1000",
+        "Price/kWh 1000",
+        "Price/kWh: 1000 kWh",
+        "Price1000",
+        "price_kwh_1000",
+    ),
+    "price_2000": (
+        "kwh2000",
+        "Price/kWh 2000",
+        "Price/kWh: 2000 kWh",
+        "Price2000",
+        "price_kwh_2000",
+    ),
+    "cancel_fee": ("CancelFee", "Cancellation Fee", "ETF", "early_termination_fee"),
+    "pricing_details": ("Pricing Details",),
+    "language": ("Language", "Lang", "language"),
+    "plan_id": ("idKey", "ID Plan", "Plan ID", "plan_id"),
+    "rep_name": ("RepCompany", "REP Name", "rep_name"),
+    "plan_name": ("Product", "Plan Name", "plan_name"),
+    "term": ("TermValue", "Term Value", "Term", "term_months"),
+    "rate_type": ("RateType", "Rate Type", "rate_type"),
+    "renewable": ("Renewable", "Renewable Perc", "Renewable Content", "renewable_pct"),
+    "prepaid": ("PrePaid", "Prepaid", "is_prepaid"),
+    "tou": ("TimeOfUse", "Time Of Use", "Time of Use", "is_tou"),
+    "base_charge": ("base_charge_monthly",),
+    "efl_url": (
+        "FactsURL",
+        "Fact Sheet",
+        "Electricity Facts Label (EFL) URL",
+        "EFL URL",
+        "efl_url",
+    ),
+    "enrollment_url": (
+        "EnrollURL",
+        "Ordering Info",
+        "Enroll URL",
+        "Enrollment URL",
+        "enrollment_url",
+    ),
+    "terms_url": (
+        "TermsURL",
+        "Terms of Service",
+        "Terms of Service (TOS) URL",
+        "TOS URL",
+        "terms_url",
+    ),
+    "special_terms": (
+        "SpecialTerms",
+        "Plan Details",
+        "Special terms and conditions",
+        "Special Terms",
+        "special_terms",
+    ),
+    "promotion_details": (
+        "PromotionDesc",
+        "Promotion",
+        "Promotion details",
+        "Promotions",
+        "promotion_details",
+    ),
+    "fees_credits": (
+        "Fees/Credits",
+        "MinUsageFeesCredits",
+        "Min Usage Fees/Credits",
+        "fees_credits",
+    ),
+    "min_usage_fees": (
+        "MinUsageFeesCredits",
+        "Min Usage Fees/Credits",
+        "Min Usage Fees",
+        "min_usage_fees",
+    ),
+}
+
+
+class CsvRow(NamedTuple):
+    """Raw string values of one CSV row, resolved to logical fields."""
+
+    tdu: str
+    price_500: str
+    price_1000: str
+    price_2000: str
+    cancel_fee: str
+    pricing_details: str
+    language: str
+    plan_id: str
+    rep_name: str
+    plan_name: str
+    term: str
+    rate_type: str
+    renewable: str
+    prepaid: str
+    tou: str
+    base_charge: str
+    efl_url: str
+    enrollment_url: str
+    terms_url: str
+    special_terms: str
+    promotion_details: str
+    fees_credits: str
+    min_usage_fees: str
+
+
+class CsvSchemaAdapter:
+    """
+    Precompiled column-resolution plan for one CSV header.
+
+    For every logical field, holds the indices of the columns that may
+    carry it, in alias priority order. The first non-empty value wins, which
+    matches probing the aliases by name on a `csv.DictReader` row.
+    """
+
+    __slots__ = ("columns", "fieldnames", "has_brackets")
+
+    def __init__(self, fieldnames: Sequence[str]) -> None:
+        self.fieldnames = tuple(fieldnames)
+        self.has_brackets = any(name.startswith("[") for name in self.fieldnames if name)
+
+        # Duplicate header names resolve to the last column, like DictReader
+        index_by_name = {name: i for i, name in enumerate(self.fieldnames)}
+
+        columns: list[tuple[int, ...]] = []
+        for field in CsvRow._fields:
+            indices: list[int] = []
+            for alias in FIELD_ALIASES[field]:
+                for name in (alias, f"[{alias}]"):
+                    index = index_by_name.get(name)
+                    if index is not None and index not in indices:
+                        indices.append(index)
+            columns.append(tuple(indices))
+        self.columns: tuple[tuple[int, ...], ...] = tuple(columns)
+
+    def extract(self, row: Sequence[str]) -> CsvRow:
+        """
+        Resolve a `csv.reader` row into its logical field values.
+
+        Args:
+            row: Row values in header order (may be shorter than the header)
+
+        Returns:
+            CsvRow with an empty string for fields that have no value
+        """
+        width = len(row)
+        values = []
+        for indices in self.columns:
+            value = ""
+            for index in indices:
+                if index < width and row[index]:
+                    value = row[index]
+                    break
+            values.append(value)
+        return CsvRow._make(values)
+
+
+@lru_cache(maxsize=32)
+def get_schema_adapter(fieldnames: tuple[str, ...]) -> CsvSchemaAdapter:
+    """Return the (cached) schema adapter for a header signature."""
+    return CsvSchemaAdapter(fieldnames)
@@ -0,0 +1,228 @@
+"""
+Persistent on-disk cache of EFL documents and their extracted ETF details.
+
+Entries are keyed by EFL URL and stored as sharded JSON files
+(`<first two hex digits of sha256(url)>.json`) so nightly commits only touch
+the shards that changed. Each entry records the HTTP validators
+(ETag/Last-Modified) for conditional GETs, a SHA-256 of the document body so
+unchanged documents are never re-parsed, and the extracted `etf_details`.
+
+A shard is only rewritten when one of its entries changes (validators,
+body hash or `etf_details`), so a night of 304s commits nothing. When each
+URL was last revalidated is kept apart in `revalidated.json`, which is not
+committed (the update workflow keeps it with actions/cache); without it,
+an entry counts as checked when its content last changed.
+
+Entries not revalidated within the TTL are evicted on save, and the cache is
+bounded to a maximum number of entries (least recently checked go first).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+import threading
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import json_codec
+
+DEFAULT_TTL_DAYS = 30
+DEFAULT_MAX_ENTRIES = 5000
+
+# Per-URL revalidation times (TTL bookkeeping, kept out of the shards)
+REVALIDATED_FILENAME = "revalidated.json"
+
+# Entry fields whose change rewrites the entry's shard
+CONTENT_FIELDS = ("etag", "last_modified", "content_sha256", "etf_details")
+
+
+def shard_name(url: str) -> str:
+    """Return the shard file name holding a URL's entry."""
+    return f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:2]}.json"
+
+
+class EflCache:
+    """Thread-safe persistent EFL cache backed by sharded JSON files."""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl_days: int = DEFAULT_TTL_DAYS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.ttl = timedelta(days=ttl_days)
+        self.max_entries = max_entries
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._checked: dict[str, str] = {}
+        self._dirty_shards: set[str] = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        if not self.cache_dir.is_dir():
+            return
+        for shard_path in sorted(self.cache_dir.glob("??.json")):
+            try:
+                shard = json_codec.load(shard_path)
+            except (OSError, json_codec.JSONDecodeError) as e:
+                print(
+                    f"Warning: Ignoring unreadable EFL cache shard {shard_path}: {e}",
+                    file=sys.stderr,
+                )
+                continue
+            if not isinstance(shard, dict):
+                continue
+            for url, entry in shard.items():
+                if isinstance(entry, dict):
+                    # Shards written before revalidation times moved out carry checked_at
+                    checked_at = entry.pop("checked_at", None)
+                    if isinstance(checked_at, str):
+                        self._checked[url] = checked_at
+                    self._entries[url] = entry
+        try:
+            checked = json_codec.load(self.cache_dir / REVALIDATED_FILENAME)
+        except (OSError, json_codec.JSONDecodeError):
+            checked = None
+        if isinstance(checked, dict):
+            self._checked.update(
+                (url, at)
+                for url, at in checked.items()
+                if url in self._entries and isinstance(at, str)
+            )
+
+    def _last_checked(self, url: str) -> str:
+        return self._checked.get(url) or str(self._entries[url].get("fetched_at", ""))
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        """Return a copy of the cached entry for a URL, if any."""
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry is not None else None
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """
+        Build conditional GET headers from a URL's stored validators.
+
+        Args:
+            url: EFL document URL
+
+        Returns:
+            If-None-Match/If-Modified-Since headers (empty if not cached)
+        """
+        entry = self.get(url)
+        headers: dict[str, str] = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def touch(self, url: str) -> None:
+        """Mark a cached entry as revalidated now (e.g. after a 304)."""
+        with self._lock:
+            if url in self._entries:
+                self._checked[url] = datetime.now(UTC).isoformat()
+
+    def put(
+        self,
+        url: str,
+        content_sha256: str,
+        etf_details: dict[str, Any] | None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """
+        Store the outcome of fetching (and possibly parsing) an EFL.
+
+        Args:
+            url: EFL document URL
+            content_sha256: SHA-256 hex digest of the document body
+            etf_details: Extracted ETF details (None if nothing was found)
+            etag: ETag response header, if any
+            last_modified: Last-Modified response header, if any
+        """
+        now = datetime.now(UTC).isoformat()
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_sha256": content_sha256,
+            "etf_details": etf_details,
+        }
+        with self._lock:
+            self._checked[url] = now
+            previous = self._entries.get(url)
+            if previous is not None and all(
+                previous.get(field) == entry[field] for field in CONTENT_FIELDS
+            ):
+                return
+            fetched_at = now
+            if previous is not None and previous.get("content_sha256") == content_sha256:
+                fetched_at = previous.get("fetched_at", now)
+            self._entries[url] = {**entry, "fetched_at": fetched_at}
+            self._dirty_shards.add(shard_name(url))
+
+    def evict(self, now: datetime | None = None) -> int:
+        """
+        Drop expired entries and enforce the max-entries bound.
+
+        Args:
+            now: Reference time (defaults to the current time)
+
+        Returns:
+            Number of entries evicted
+        """
+        cutoff = ((now or datetime.now(UTC)) - self.ttl).isoformat()
+        with self._lock:
+            expired = [url for url in self._entries if self._last_checked(url) < cutoff]
+            overflow = len(self._entries) - len(expired) - self.max_entries
+            if overflow > 0:
+                expired_set = set(expired)
+                remaining = sorted(
+                    (url for url in self._entries if url not in expired_set),
+                    key=self._last_checked,
+                )
+                expired.extend(remaining[:overflow])
+            for url in expired:
+                del self._entries[url]
+                self._checked.pop(url, None)
+                self._dirty_shards.add(shard_name(url))
+        return len(expired)
+
+    def save(self) -> None:
+        """Evict stale entries, rewrite the shards that changed and the revalidation times."""
+        evicted = self.evict()
+        if evicted:
+            print(f"  Evicted {evicted} EFL cache entries")
+
+        with self._lock:
+            checked = {url: self._checked[url] for url in self._entries if url in self._checked}
+            shards: dict[str, dict[str, dict[str, Any]]] = {name: {} for name in self._dirty_shards}
+            for url, entry in self._entries.items():
+                name = shard_name(url)
+                if name in shards:
+                    shards[name][url] = entry
+            self._dirty_shards.clear()
+        if not shards and not checked:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for name, shard in shards.items():
+            shard_path = self.cache_dir / name
+            try:
+                if not shard:
+                    shard_path.unlink(missing_ok=True)
+                    continue
+                json_codec.dump(shard, shard_path, pretty=True, sort_keys=True)
+            except OSError as e:
+                print(f"Error: Failed to write EFL cache shard {shard_path}: {e}", file=sys.stderr)
+        try:
+            json_codec.dump(checked, self.cache_dir / REVALIDATED_FILENAME, sort_keys=True)
+        except OSError as e:
+            print(f"Error: Failed to write EFL revalidation times: {e}", file=sys.stderr)
@@ -0,0 +1,738 @@
+"""
+Early termination fee enrichment from Electricity Facts Label (EFL) documents.
+
+Plans whose CSV/API row carries no cancellation fee are enriched with a small
+`etf_details` object parsed from the plan's EFL. Enrichment runs as its own
+stage after parsing:
+
+- EFL URLs are deduplicated across all plans, so each document is fetched once
+- Downloads run concurrently in a bounded thread pool, with a per-domain
+  concurrency limit so no single provider is hammered
+- PDF text extraction runs in a process pool so it does not contend for the
+  GIL with the download threads. Pages are read one at a time with the
+  cheapest extractor first and reading stops once the ETF section is found;
+  each document is held to a CPU-time and memory budget
+- A persistent cache (`data/efl-cache/`, see efl_cache.py) turns revisits
+  into conditional GETs and skips parsing documents whose body is unchanged
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import importlib.util
+import io
+import os
+import re
+import threading
+import time
+from collections.abc import Generator, Iterable, Iterator
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, cast
+from urllib.parse import urlparse
+
+import json_codec
+import run_metrics
+from efl_cache import EflCache
+
+# requests and the PDF libraries are imported on first use: runs with EFL
+# lookups disabled (and callers that only parse ETF text) never load them
+if TYPE_CHECKING:
+    import requests
+    from plan_record import Plan
+
+# Configuration
+EFL_ETF_LOOKUP = os.getenv("EFL_ETF_LOOKUP", "1") == "1"
+EFL_ETF_MAX_FETCHES = int(os.getenv("EFL_ETF_MAX_FETCHES", "2000"))
+EFL_ETF_TIMEOUT = int(os.getenv("EFL_ETF_TIMEOUT", "20"))
+EFL_ETF_WORKERS = int(os.getenv("EFL_ETF_WORKERS", "16"))
+EFL_ETF_PER_DOMAIN = int(os.getenv("EFL_ETF_PER_DOMAIN", "4"))
+EFL_ETF_PDF_WORKERS = int(os.getenv("EFL_ETF_PDF_WORKERS", str(os.cpu_count() or 2)))
+EFL_ETF_PDF_MAX_PAGES = int(os.getenv("EFL_ETF_PDF_MAX_PAGES", "2"))
+EFL_ETF_PDF_CPU_SECONDS = float(os.getenv("EFL_ETF_PDF_CPU_SECONDS", "10"))
+EFL_ETF_PDF_MEMORY_MB = int(os.getenv("EFL_ETF_PDF_MEMORY_MB", "1024"))
+EFL_ETF_AUTO_ALLOWLIST = os.getenv("EFL_ETF_AUTO_ALLOWLIST", "1") == "1"
+EFL_ETF_ALLOWED_DOMAINS = set(
+    filter(
+        None,
+        [
+            d.strip()
+            for d in os.getenv(
+                "EFL_ETF_ALLOWED_DOMAINS",
+                "api.gotrhythm.com,api.energytexas.com,paylesspower.com,signup.chariotenergy.com",
+            ).split(",")
+        ],
+    )
+)
+EFL_CACHE = os.getenv("EFL_CACHE", "1") == "1"
+EFL_CACHE_DIR = os.getenv("EFL_CACHE_DIR", "")
+EFL_CACHE_TTL_DAYS = int(os.getenv("EFL_CACHE_TTL_DAYS", "30"))
+EFL_CACHE_MAX_ENTRIES = int(os.getenv("EFL_CACHE_MAX_ENTRIES", "5000"))
+EFL_ETF_AUTO_DOMAINS: set[str] = set()
+_efl_etf_cache: dict[str, dict[str, Any] | None] = {}
+
+# One requests.Session per download thread (sessions are not thread-safe)
+_thread_local = threading.local()
+
+# PDFium is not thread-safe; inline extraction runs in the download threads
+_pdfium_lock = threading.Lock()
+
+# Set in PDF pool workers, where per-document resource limits are enforced
+_worker_limits = False
+
+
+def register_efl_domain(efl_url: str) -> None:
+    if not EFL_ETF_AUTO_ALLOWLIST or not efl_url:
+        return
+    if not efl_url.startswith(("http://", "https://")):
+        return
+    domain = urlparse(efl_url).netloc.lower()
+    if domain:
+        EFL_ETF_AUTO_DOMAINS.add(domain)
+
+
+def seed_efl_allowlist_from_existing_data(data_path: Path) -> None:
+    if not EFL_ETF_AUTO_ALLOWLIST:
+        return
+    if not data_path.exists():
+        return
+
+    try:
+        data = json_codec.load(data_path)
+    except (OSError, json_codec.JSONDecodeError):
+        return
+
+    plans = data.get("plans", []) if isinstance(data, dict) else []
+    if not isinstance(plans, list):
+        return
+
+    for plan in plans:
+        if not isinstance(plan, dict):
+            continue
+        register_efl_domain(plan.get("efl_url", ""))
+
+
+def should_attempt_efl_lookup(efl_url: str) -> bool:
+    if not EFL_ETF_LOOKUP or not efl_url:
+        return False
+    if not efl_url.startswith(("http://", "https://")):
+        return False
+    if not EFL_ETF_ALLOWED_DOMAINS and not EFL_ETF_AUTO_DOMAINS:
+        return True
+    domain = urlparse(efl_url).netloc.lower()
+    if any(domain.endswith(allowed) for allowed in EFL_ETF_ALLOWED_DOMAINS):
+        return True
+    if EFL_ETF_AUTO_ALLOWLIST and domain in EFL_ETF_AUTO_DOMAINS:
+        return True
+    return False
+
+
+# ETF phrases in priority order: any no-fee phrase wins, then the first
+# per-month phrase that occurs anywhere, then the first flat-fee phrase.
+# Each phrase starts with a fixed keyword (its anchor) in the normalized text.
+# Two older per-month phrases were dropped: each only matched where an
+# earlier per-month phrase already did.
+ETF_PATTERNS: tuple[tuple[str, str, re.Pattern[str]], ...] = tuple(
+    (structure, anchor, re.compile(pattern))
+    for structure, anchor, pattern in (
+        ("none", "no ", r"no\s+(?:early\s+)?(?:termination|cancellation)\s+fee"),
+        ("none", "early ", r"early\s+termination\s+fee\s*[:\-]?\s*none"),
+        ("none", "early ", r"early\s+termination\s+fee\s*[:\-]?\s*\$?0\b"),
+        ("none", "cancellation ", r"cancellation\s+fee\s*[:\-]?\s*none"),
+        ("none", "cancellation ", r"cancellation\s+fee\s*[:\-]?\s*\$?0\b"),
+        (
+            "per-month",
+            "$",
+            r"\$(\d+(?:\.\d{2})?)\s*(?:per|/)\s*(?:each\s+)?(?:month|mo)\s*(?:remaining|left)",
+        ),
+        ("per-month", "$", r"\$(\d+(?:\.\d{2})?)\s*(?:for\s+each)\s+(?:remaining\s+)?month"),
+        (
+            "per-month",
+            "$",
+            r"\$(\d+(?:\.\d{2})?)\s*(?:multiplied\s+by|times|x)\s*(?:the\s+)?"
+            r"(?:number\s+of\s+)?months?\s*(?:remaining|left)",
+        ),
+        (
+            "flat",
+            "early ",
+            r"early\s+(?:termination|cancellation)\s+fee[^\d\$]{0,20}\$?(\d+(?:\.\d{2})?)",
+        ),
+        ("flat", "cancellation ", r"cancellation\s+fee[^\d\$]{0,20}\$?(\d+(?:\.\d{2})?)"),
+    )
+)
+
+
+def normalize_efl_text(text: str) -> str:
+    """Collapse whitespace runs to single spaces and lowercase the text."""
+    # str.split() splits on exactly the characters re's \s matches in str patterns
+    return " ".join(text.split()).lower()
+
+
+def _find_all(text: str, keyword: str) -> list[int]:
+    positions = []
+    position = text.find(keyword)
+    while position != -1:
+        positions.append(position)
+        position = text.find(keyword, position + 1)
+    return positions
+
+
+def extract_etf_from_text(text: str) -> dict[str, Any] | None:
+    """
+    Extract ETF details from EFL text.
+
+    A phrase earlier in ETF_PATTERNS wins regardless of where it occurs, and
+    the leftmost occurrence of the winning phrase supplies the amount. Phrases
+    are only tried (anchored) where their keyword occurs, instead of
+    searching the whole text once per phrase.
+    """
+    if not text:
+        return None
+
+    normalized = normalize_efl_text(text)
+
+    anchors: dict[str, list[int]] = {}
+    for structure, anchor, pattern in ETF_PATTERNS:
+        positions = anchors.get(anchor)
+        if positions is None:
+            positions = anchors[anchor] = _find_all(normalized, anchor)
+        for position in positions:
+            match = pattern.match(normalized, position)
+            if match is None:
+                continue
+            if structure == "none":
+                return {"structure": "none", "source": "efl"}
+            if structure == "per-month":
+                return {
+                    "structure": "per-month",
+                    "per_month_rate": float(match.group(1)),
+                    "source": "efl",
+                }
+            return {"structure": "flat", "flat_fee": float(match.group(1)), "source": "efl"}
+
+    if "early termination fee" in normalized or "cancellation fee" in normalized:
+        return {"structure": "unknown", "source": "efl"}
+
+    return None
+
+
+@functools.cache
+def _load_pdfplumber() -> ModuleType | None:
+    """Import pdfplumber (an optional dependency for ETF enrichment), or None if missing."""
+    try:
+        import pdfplumber
+    except ImportError:  # pragma: no cover - optional dependency for ETF enrichment
+        return None
+    return pdfplumber
+
+
+@functools.cache
+def _load_pdfium() -> ModuleType | None:
+    """Import pypdfium2 (an optional dependency for ETF enrichment), or None if missing."""
+    try:
+        import pypdfium2  # type: ignore[import-not-found, import-untyped, unused-ignore]
+    except ImportError:  # pragma: no cover - optional dependency for ETF enrichment
+        return None
+    return cast(ModuleType, pypdfium2)
+
+
+def pdf_support_available() -> bool:
+    """Return whether a PDF text extractor is installed, without importing it."""
+    return any(importlib.util.find_spec(name) for name in ("pypdfium2", "pdfplumber"))
+
+
+class PdfLimitError(Exception):
+    """Raised when extracting one PDF exceeds its CPU-time budget."""
+
+
+@dataclass
+class PdfExtraction:
+    """Text extracted from one EFL PDF and what it cost (picklable for pool workers)."""
+
+    text: str = ""
+    extractor: str | None = None  # extractor that produced `text`
+    pages: int = 0  # pages read, summed over every extractor tried
+    cpu_seconds: float = 0.0
+    seconds: float = 0.0
+    limit: str | None = None  # "cpu" or "memory" when a limit stopped extraction
+
+
+def etf_section_found(text: str) -> bool:
+    """Return whether the text read so far already settles the ETF."""
+    result = extract_etf_from_text(text)
+    return result is not None and result["structure"] != "unknown"
+
+
+def _pdfium_pages(content: bytes, max_pages: int) -> Generator[str, None, None]:
+    """Yield page texts from PDFium's text layer (no layout analysis, the cheap path)."""
+    pdfium = _load_pdfium()
+    if pdfium is None:
+        return
+    with _pdfium_lock:
+        document = pdfium.PdfDocument(content)
+        try:
+            for index in range(min(len(document), max_pages)):
+                page = document[index]
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            document.close()
+
+
+def _pdfplumber_pages(content: bytes, max_pages: int) -> Generator[str, None, None]:
+    """Yield page texts from pdfplumber's layout-aware extraction (the expensive path)."""
+    pdfplumber = _load_pdfplumber()
+    if pdfplumber is None:
+        return
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        for page in pdf.pages[:max_pages]:
+            yield page.extract_text() or ""
+
+
+# Cheapest first; later extractors only run when earlier text does not settle the ETF
+PDF_EXTRACTORS = (("pdfium", _pdfium_pages), ("pdfplumber", _pdfplumber_pages))
+
+
+def _address_space_bytes() -> int | None:
+    """Return this process's current virtual memory size (Linux only)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _raise_cpu_limit(signum: int, frame: object) -> None:
+    raise PdfLimitError("cpu")
+
+
+def _init_pdf_worker() -> None:
+    """Process pool initializer: enable per-document limits in this worker."""
+    global _worker_limits
+    import signal
+
+    try:
+        signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+    except (AttributeError, ValueError):  # no SIGXCPU / resource limits on Windows
+        return
+    _worker_limits = True
+
+
+@contextmanager
+def _document_limits(cpu_seconds: float, memory_mb: int) -> Iterator[None]:
+    """
+    Hold a pool worker to a CPU-time and extra address-space budget for one document.
+
+    The soft RLIMIT_CPU is set to the CPU time used so far plus the budget
+    (the kernel then sends SIGXCPU, raised as PdfLimitError), and the soft
+    RLIMIT_AS to the current address space plus the budget (allocations past
+    it raise MemoryError). Both are restored afterwards. A no-op outside
+    limit-enabled workers.
+    """
+    if not _worker_limits:
+        yield
+        return
+
+    import resource
+
+    budgets: dict[int, int] = {}
+    if cpu_seconds > 0:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        budgets[resource.RLIMIT_CPU] = int(usage.ru_utime + usage.ru_stime + cpu_seconds) + 1
+    address_space = _address_space_bytes()
+    if memory_mb > 0 and address_space:
+        budgets[resource.RLIMIT_AS] = address_space + memory_mb * 1024 * 1024
+
+    saved: dict[int, tuple[int, int]] = {}
+    try:
+        for which, soft in budgets.items():
+            saved[which] = resource.getrlimit(which)
+            hard = saved[which][1]
+            resource.setrlimit(
+                which, (soft if hard == resource.RLIM_INFINITY else min(soft, hard), hard)
+            )
+        yield
+    finally:
+        for which, limit in saved.items():
+            resource.setrlimit(which, limit)
+
+
+def _read_until_etf(
+    pages: Generator[str, None, None],
+    extraction: PdfExtraction,
+    cpu_start: float,
+    cpu_seconds: float,
+) -> tuple[str, bool]:
+    """Read pages until the text settles the ETF; return the text and whether it did."""
+    texts: list[str] = []
+    with closing(pages):
+        for page_text in pages:
+            extraction.pages += 1
+            texts.append(page_text)
+            text = "\n".join(texts)
+            if etf_section_found(text):
+                return text, True
+            # Between pages, also enforce the budget where no signal limit applies
+            if cpu_seconds > 0 and time.thread_time() - cpu_start > cpu_seconds:
+                raise PdfLimitError("cpu")
+    return "\n".join(texts), False
+
+
+def extract_pdf_text(content: bytes, max_pages: int | None = None) -> PdfExtraction:
+    """
+    Extract text from an EFL PDF, stopping once the ETF section is found.
+
+    Extractors in PDF_EXTRACTORS are tried cheapest first, each reading one
+    page at a time; pdfplumber's layout extraction only runs when PDFium's
+    text does not settle the ETF. The document is held to
+    `EFL_ETF_PDF_CPU_SECONDS` of CPU time (checked between pages, and by
+    SIGXCPU in pool workers) and, in pool workers, `EFL_ETF_PDF_MEMORY_MB` of
+    extra address space.
+
+    Module-level so it can be shipped to a process pool worker.
+
+    Args:
+        content: Raw PDF bytes
+        max_pages: Pages to read at most (default: EFL_ETF_PDF_MAX_PAGES)
+
+    Returns:
+        Extracted text (empty if the PDF cannot be read) with its cost
+    """
+    max_pages = max_pages or EFL_ETF_PDF_MAX_PAGES
+    extraction = PdfExtraction()
+    start, cpu_start = time.perf_counter(), time.thread_time()
+    try:
+        with _document_limits(EFL_ETF_PDF_CPU_SECONDS, EFL_ETF_PDF_MEMORY_MB):
+            for name, read_pages in PDF_EXTRACTORS:
+                try:
+                    text, found = _read_until_etf(
+                        read_pages(content, max_pages),
+                        extraction,
+                        cpu_start,
+                        EFL_ETF_PDF_CPU_SECONDS,
+                    )
+                except (PdfLimitError, MemoryError):
+                    raise
+                except Exception:
+                    continue
+                # An extractor that is not installed (or reads no text) is not credited
+                if text.strip():
+                    extraction.text, extraction.extractor = text, name
+                if found:
+                    break
+    except PdfLimitError:
+        extraction.limit = "cpu"
+    except MemoryError:
+        extraction.limit = "memory"
+    extraction.seconds = round(time.perf_counter() - start, 4)
+    extraction.cpu_seconds = round(time.thread_time() - cpu_start, 4)
+    return extraction
+
+
+def record_pdf_extraction(efl_url: str, size: int, extraction: PdfExtraction) -> None:
+    """Add one document's extraction cost to the run metrics."""
+    run_metrics.count("efl.pdf_pages", extraction.pages)
+    run_metrics.count("efl.pdf_cpu_ms", round(extraction.cpu_seconds * 1000))
+    if extraction.extractor:
+        run_metrics.count(f"efl.pdf_extractor.{extraction.extractor}")
+    if extraction.limit:
+        run_metrics.count(f"efl.pdf_limit.{extraction.limit}")
+    cost = asdict(extraction)
+    del cost["text"]
+    run_metrics.record("efl.pdf_extraction", {"url": efl_url, "bytes": size, **cost})
+
+
+class PdfPool:
+    """
+    Process pool for PDF text extraction that outlives a dying worker.
+
+    A worker killed mid-document (e.g. by the kernel) breaks a
+    ProcessPoolExecutor for good. The broken pool is then replaced, and each
+    document that was in flight on it is retried once on the new pool. If no
+    new pool can be started, extraction continues in the calling thread.
+    """
+
+    def __init__(self, executor: Executor) -> None:
+        self._executor: Executor | None = executor
+        self._lock = threading.Lock()
+
+    def _replace(self, broken: Executor) -> None:
+        with self._lock:
+            if self._executor is not broken:
+                return  # another thread already replaced it
+            broken.shutdown(wait=False)
+            self._executor = _new_pdf_executor()
+            run_metrics.count("efl.pdf_pool_restarts")
+
+    def extract(self, content: bytes) -> PdfExtraction:
+        """
+        Extract text from an EFL PDF in a pool worker (see `extract_pdf_text`).
+
+        Raises:
+            BrokenExecutor: If the document also broke the replacement pool
+        """
+        retried = False
+        while True:
+            with self._lock:
+                executor = self._executor
+            if executor is None:
+                return extract_pdf_text(content)
+            try:
+                return executor.submit(extract_pdf_text, content).result()
+            except BrokenExecutor:
+                self._replace(executor)
+                if retried:
+                    raise
+                retried = True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+def fetch_etf_from_efl(
+    efl_url: str,
+    session: requests.Session,
+    pdf_pool: PdfPool | None = None,
+    cache: EflCache | None = None,
+) -> dict[str, Any] | None:
+    """
+    Download one EFL and extract its ETF details.
+
+    With a persistent cache, the request is a conditional GET using the stored
+    ETag/Last-Modified, and the document is only parsed when its SHA-256
+    differs from the cached body. Results are only cached when the document
+    was read in full: empty text, a PDF worker failure or a resource limit
+    leaves the cache as it was, so the next run tries again.
+
+    Args:
+        efl_url: EFL document URL
+        session: HTTP session used for the download
+        pdf_pool: Optional process pool for PDF text extraction; extraction
+            runs in the calling thread when omitted
+        cache: Optional persistent EFL cache
+
+    Returns:
+        ETF details dict, or None if the EFL could not be fetched or parsed
+    """
+    import requests
+
+    if not should_attempt_efl_lookup(efl_url):
+        return None
+    if efl_url in _efl_etf_cache:
+        run_metrics.count("efl.memo_hits")
+        return _efl_etf_cache[efl_url]
+
+    cached = cache.get(efl_url) if cache is not None else None
+    headers = cache.conditional_headers(efl_url) if cache is not None else {}
+
+    try:
+        run_metrics.count("efl.requests")
+        response = session.get(efl_url, timeout=EFL_ETF_TIMEOUT, headers=headers)
+        if response.status_code == 304 and cache is not None and cached:
+            run_metrics.count("efl.cache_not_modified")
+            cache.touch(efl_url)
+            _efl_etf_cache[efl_url] = cached.get("etf_details")
+            return _efl_etf_cache[efl_url]
+        response.raise_for_status()
+    except requests.RequestException:
+        run_metrics.count("efl.request_errors")
+        # Keep serving the last known result while the EFL host is unreachable
+        _efl_etf_cache[efl_url] = cached.get("etf_details") if cached else None
+        return _efl_etf_cache[efl_url]
+
+    run_metrics.count("efl.bytes_read", len(response.content))
+    content_sha256 = hashlib.sha256(response.content).hexdigest()
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if cache is not None and cached and cached.get("content_sha256") == content_sha256:
+        run_metrics.count("efl.cache_unchanged")
+        result = cached.get("etf_details")
+        cache.put(efl_url, content_sha256, result, etag, last_modified)
+        _efl_etf_cache[efl_url] = result
+        return result
+
+    content_type = response.headers.get("Content-Type", "").lower()
+    text = ""
+    # Only a complete read is persisted; a failed or cut-short one is retried next run
+    complete = True
+
+    if "pdf" in content_type or response.content[:4] == b"%PDF":
+        if not pdf_support_available():
+            _efl_etf_cache[efl_url] = None
+            return None
+        run_metrics.count("efl.pdf_documents")
+        try:
+            if pdf_pool is not None:
+                extraction = pdf_pool.extract(response.content)
+            else:
+                extraction = extract_pdf_text(response.content)
+        except (BrokenExecutor, PdfLimitError):
+            # The worker died, or its CPU limit fired just after extraction returned
+            run_metrics.count("efl.pdf_errors")
+            extraction = PdfExtraction()
+            complete = False
+        record_pdf_extraction(efl_url, len(response.content), extraction)
+        text = extraction.text
+        complete = complete and extraction.limit is None
+    else:
+        text = response.text
+
+    if not text.strip():
+        run_metrics.count("efl.empty_text")
+        _efl_etf_cache[efl_url] = None
+        return None
+
+    result = extract_etf_from_text(text)
+    run_metrics.count("efl.parsed")
+    _efl_etf_cache[efl_url] = result
+    if cache is not None and complete:
+        cache.put(efl_url, content_sha256, result, etag, last_modified)
+    return result
+
+
+def plan_needs_efl_etf(plan: Plan) -> bool:
+    """Return True if a plan has an EFL but no usable ETF value yet."""
+    if not plan or not plan.get("efl_url"):
+        return False
+    if plan.get("etf_details"):
+        return False
+    etf_value = plan.get("early_termination_fee")
+    return etf_value in (None, 0, 0.0, "", "0")
+
+
+def _thread_session() -> requests.Session:
+    session: requests.Session | None = getattr(_thread_local, "session", None)
+    if session is None:
+        import requests
+
+        session = requests.Session()
+        _thread_local.session = session
+    return session
+
+
+def _new_pdf_executor() -> Executor | None:
+    try:
+        return ProcessPoolExecutor(max_workers=EFL_ETF_PDF_WORKERS, initializer=_init_pdf_worker)
+    except (OSError, NotImplementedError):
+        # Process pools are unavailable on some restricted runners;
+        # fall back to extracting in the download threads
+        return None
+
+
+def _create_pdf_pool() -> PdfPool | None:
+    if not pdf_support_available() or EFL_ETF_PDF_WORKERS <= 0:
+        return None
+    executor = _new_pdf_executor()
+    return PdfPool(executor) if executor is not None else None
+
+
+def open_efl_cache(data_dir: Path) -> EflCache | None:
+    """
+    Open the persistent EFL cache under the data directory, if enabled.
+
+    Args:
+        data_dir: Project data directory
+
+    Returns:
+        EflCache instance, or None when `EFL_CACHE=0`
+    """
+    if not EFL_CACHE:
+        return None
+    cache_dir = Path(EFL_CACHE_DIR) if EFL_CACHE_DIR else data_dir / "efl-cache"
+    return EflCache(cache_dir, ttl_days=EFL_CACHE_TTL_DAYS, max_entries=EFL_CACHE_MAX_ENTRIES)
+
+
+def enrich_plans_with_efl_etf(
+    plans: Iterable[Plan],
+    cache: EflCache | None = None,
+) -> list[Plan]:
+    """
+    Enrich plans lacking an ETF with details parsed from their EFLs.
+
+    Each distinct EFL URL is fetched at most once. Downloads run in a bounded
+    thread pool (`EFL_ETF_WORKERS`) with at most `EFL_ETF_PER_DOMAIN` requests
+    in flight per host, and PDF parsing is delegated to a process pool
+    (`EFL_ETF_PDF_WORKERS`). At most `EFL_ETF_MAX_FETCHES` URLs are fetched.
+
+    Args:
+        plans: Parsed plans (mutated in place)
+        cache: Optional persistent EFL cache, saved when the stage finishes
+
+    Returns:
+        The plans as a list
+    """
+    plans = list(plans)
+
+    for plan in plans:
+        register_efl_domain(plan.get("efl_url", ""))
+
+    if not EFL_ETF_LOOKUP:
+        return plans
+
+    plans_by_url: dict[str, list[Plan]] = {}
+    for plan in plans:
+        if plan_needs_efl_etf(plan):
+            plans_by_url.setdefault(plan["efl_url"], []).append(plan)
+
+    urls = [url for url in plans_by_url if should_attempt_efl_lookup(url)]
+    if len(urls) > EFL_ETF_MAX_FETCHES:
+        print(f"  Limiting EFL lookups to {EFL_ETF_MAX_FETCHES} of {len(urls)} documents")
+        urls = urls[:EFL_ETF_MAX_FETCHES]
+    if not urls:
+        return plans
+
+    print(f"  Fetching {len(urls)} EFL documents for ETF details...")
+
+    domain_limits: dict[str, threading.BoundedSemaphore] = {}
+    for url in urls:
+        domain = urlparse(url).netloc.lower()
+        if domain not in domain_limits:
+            domain_limits[domain] = threading.BoundedSemaphore(max(1, EFL_ETF_PER_DOMAIN))
+
+    pdf_pool = _create_pdf_pool()
+    pdf_records = run_metrics.METRICS.records.setdefault("efl.pdf_extraction", [])
+    pdf_recorded = len(pdf_records)
+
+    def fetch(url: str) -> dict[str, Any] | None:
+        with domain_limits[urlparse(url).netloc.lower()]:
+            return fetch_etf_from_efl(url, _thread_session(), pdf_pool, cache)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, EFL_ETF_WORKERS)) as pool:
+            results = dict(zip(urls, pool.map(fetch, urls), strict=True))
+    finally:
+        if pdf_pool is not None:
+            pdf_pool.shutdown()
+        if cache is not None:
+            cache.save()
+
+    enriched = 0
+    for url, etf_details in results.items():
+        if not etf_details:
+            continue
+        for plan in plans_by_url[url]:
+            plan["etf_details"] = dict(etf_details)
+            enriched += 1
+
+    found = sum(1 for details in results.values() if details)
+    print(f"  ETF details found in {found}/{len(urls)} EFLs ({enriched} plans enriched)")
+    pdf_costs = pdf_records[pdf_recorded:]
+    if pdf_costs:
+        slowest = max(pdf_costs, key=lambda cost: cost["cpu_seconds"])
+        print(
+            f"  PDF text: {len(pdf_costs)} documents, {sum(c['pages'] for c in pdf_costs)} pages,"
+            f" {sum(c['cpu_seconds'] for c in pdf_costs):.2f}s CPU"
+            f" (slowest {slowest['cpu_seconds']:.2f}s: {slowest['url']})"
+        )
+    return plans
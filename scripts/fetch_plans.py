@@ -7,55 +7,70 @@ processes it, and saves it to a JSON file for the static site to consume.
 
 Features:
 - Exponential backoff retry logic for network resilience
-- Multiple API endpoint fallbacks
+- Multiple API endpoint fallbacks, raced concurrently with hedged requests
 - Robust CSV parsing with error handling
+- Streaming CSV ingestion (rows are parsed while the export downloads)
+- Compact columnar copy of the dataset with pre-compressed variants
+- Per-TDU shards with a content-hashed manifest
+- Precomputed rankings for the canonical usage profiles
+- Near-duplicate clusters (tolerant of price noise and small fee changes)
+- Bulk schema validation of every plan (invalid rows are reported and dropped)
+- Per-stage timings and counters in run-metrics.json (PIPELINE_PROFILE for more)
 - Rate limiting compliance
 """
 
+from __future__ import annotations
+
+import codecs
 import csv
-import io
+import functools
+import itertools
 import json
 import os
 import random
 import re
 import sys
+import threading
 import time
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
-from urllib.parse import urlparse
-
-import requests
+from typing import TYPE_CHECKING, Any
+
+import json_codec
+import run_metrics
+from columnar import write_columnar_artifacts
+from csv_schema import get_schema_adapter
+from efl_etf import (
+    enrich_plans_with_efl_etf,
+    open_efl_cache,
+    seed_efl_allowlist_from_existing_data,
+)
+from near_duplicates import write_near_duplicates
+from numeric_fields import parse_float, parse_int, parse_price
+from plan_record import Plan, PlanRecord, plans_as_dicts
+from tdu_shards import write_tdu_shards
 
-try:
-    import pdfplumber
-except ImportError:  # pragma: no cover - optional dependency for ETF enrichment
-    pdfplumber = None
+# asyncio and requests (network fetch) and the NumPy/pydantic stages (rankings,
+# plan_validation) are imported where they are used, so callers that only
+# parse or normalize plans do not pay for loading them
+if TYPE_CHECKING:
+    import requests
 
 # Configuration
 MAX_RETRIES = 4
 BASE_DELAY = 2  # Base delay in seconds for exponential backoff
 REQUEST_TIMEOUT = 45  # Timeout in seconds
+STREAM_CHUNK_SIZE = 64 * 1024  # Bytes read per chunk when streaming responses
+FETCH_MODE = os.getenv("PTC_FETCH_MODE", "race")  # "race" or "sequential"
+FETCH_HEDGE_DELAY = float(os.getenv("PTC_HEDGE_DELAY", "2"))  # Seconds between hedged starts
+# plans.json is compact unless indented for a diff-friendly commit (the update workflow sets it)
+PLANS_JSON_PRETTY = os.getenv("PLANS_JSON_PRETTY", "0") == "1"
 
-# Optional EFL ETF extraction
-EFL_ETF_LOOKUP = os.getenv("EFL_ETF_LOOKUP", "1") == "1"
-EFL_ETF_MAX_FETCHES = int(os.getenv("EFL_ETF_MAX_FETCHES", "250"))
-EFL_ETF_TIMEOUT = int(os.getenv("EFL_ETF_TIMEOUT", "20"))
-EFL_ETF_AUTO_ALLOWLIST = os.getenv("EFL_ETF_AUTO_ALLOWLIST", "1") == "1"
-EFL_ETF_ALLOWED_DOMAINS = set(
-    filter(
-        None,
-        [
-            d.strip()
-            for d in os.getenv(
-                "EFL_ETF_ALLOWED_DOMAINS",
-                "api.gotrhythm.com,api.energytexas.com,paylesspower.com,signup.chariotenergy.com",
-            ).split(",")
-        ],
-    )
-)
-EFL_ETF_AUTO_DOMAINS: set[str] = set()
-_efl_etf_cache: dict[str, dict[str, Any] | None] = {}
+# One requests.Session per fetch thread (sessions are not thread-safe)
+_thread_local = threading.local()
 
 # Power to Choose endpoints (in order of preference)
 ENDPOINTS = [
@@ -76,6 +91,9 @@ ENDPOINTS = [
     },
 ]
 
+# "Cancellation Fee: $XXX" inside the Pricing Details column
+CANCELLATION_FEE_RE = re.compile(r"Cancellation Fee:\s*\$?([\d\.]+)")
+
 
 def get_request_headers() -> dict[str, str]:
     """Generate browser-like headers for API requests."""
@@ -118,6 +136,8 @@ def retry_with_backoff(func, *args, **kwargs):
     Raises:
         Last exception if all retries fail
     """
+    import requests
+
     last_exception = None
 
     for attempt in range(MAX_RETRIES):
@@ -137,51 +157,301 @@ def retry_with_backoff(func, *args, **kwargs):
     raise last_exception
 
 
-def fetch_from_endpoint(endpoint: dict) -> tuple[str, str]:
+def validate_endpoint_content(content: str, endpoint: dict) -> None:
+    """
+    Reject empty responses and error pages from an endpoint.
+
+    Raises:
+        ValueError if the content does not look like plan data
+    """
+    if not content or len(content) < 100:
+        raise ValueError(f"Empty or too short response from {endpoint['name']}")
+
+    # Check for error pages
+    if "error" in content.lower()[:500] and "plan" not in content.lower()[:500]:
+        raise ValueError(f"Error page received from {endpoint['name']}")
+
+
+def create_fetch_session() -> requests.Session:
+    """Create a session with browser-like headers (sessions pool connections)."""
+    import requests
+
+    session = requests.Session()
+    session.headers.update(get_request_headers())
+    return session
+
+
+def _thread_fetch_session() -> requests.Session:
+    """Return this thread's fetch session (sessions are not thread-safe)."""
+    session: requests.Session | None = getattr(_thread_local, "session", None)
+    if session is None:
+        session = create_fetch_session()
+        _thread_local.session = session
+    return session
+
+
+class StreamedBody(Iterator[str]):
+    """Decoded text chunks of a streamed response; `close()` releases its connection."""
+
+    def __init__(self, chunks: Iterator[str], response: requests.Response) -> None:
+        self._chunks = chunks
+        self._response = response
+
+    def __next__(self) -> str:
+        return next(self._chunks)
+
+    def close(self) -> None:
+        self._response.close()
+
+
+def iter_decoded_chunks(byte_chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Incrementally decode a byte stream, dropping a leading BOM.
+
+    Args:
+        byte_chunks: Raw body chunks
+        encoding: Text encoding of the body
+
+    Yields:
+        Decoded text chunks
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    at_start = True
+    for chunk in byte_chunks:
+        run_metrics.count("bytes_read", len(chunk))
+        text = decoder.decode(chunk)
+        if at_start and text:
+            text = text.lstrip("\ufeff")
+            at_start = not text
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_text_lines(text_chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Split streamed text into lines without buffering the whole body.
+
+    Line boundaries follow str.splitlines(), including "\r\n" pairs that
+    straddle two chunks.
+
+    Args:
+        text_chunks: Decoded text chunks
+
+    Yields:
+        Lines without their line terminators
+    """
+    pending = ""
+    for chunk in text_chunks:
+        parts = (pending + chunk).splitlines(keepends=True)
+        pending = ""
+        if parts:
+            last = parts[-1]
+            # Hold back an unterminated line, or a "\r" that may precede "\n"
+            if len(last.splitlines()[0]) == len(last) or last.endswith("\r"):
+                pending = parts.pop()
+        for part in parts:
+            yield part.splitlines()[0]
+    if pending:
+        yield from pending.splitlines()
+
+
+def fetch_from_endpoint(
+    endpoint: dict[str, str], session: requests.Session | None = None
+) -> tuple[StreamedBody, str]:
     """
     Fetch data from a single endpoint.
 
+    The body is streamed: only the first chunks are read here to validate
+    the response, the rest is decoded lazily as the caller iterates.
+
     Args:
         endpoint: Endpoint configuration dict
+        session: Optional session (a new one is created if omitted)
 
     Returns:
-        Tuple of (response_text, endpoint_type)
+        Tuple of (decoded text chunks, endpoint_type); close the chunks to
+        abandon the response before reading all of it
     """
     url = endpoint["url"]
     endpoint_type = endpoint["type"]
 
     print(f"  Trying {endpoint['name']}: {url}")
 
-    headers = get_request_headers()
-
     # Create session for connection pooling
-    session = requests.Session()
-    session.headers.update(headers)
+    if session is None:
+        session = create_fetch_session()
 
-    response = session.get(url, timeout=REQUEST_TIMEOUT, allow_redirects=True)
-    response.raise_for_status()
+    response = session.get(url, timeout=REQUEST_TIMEOUT, allow_redirects=True, stream=True)
+    try:
+        response.raise_for_status()
 
-    # Validate response content
-    response.headers.get("Content-Type", "")
-    content = response.text
+        # Validate response content from the first chunks of the body
+        chunks = iter_decoded_chunks(
+            response.iter_content(chunk_size=STREAM_CHUNK_SIZE), response.encoding or "utf-8"
+        )
+        head: list[str] = []
+        head_length = 0
+        for chunk in chunks:
+            head.append(chunk)
+            head_length += len(chunk)
+            if head_length >= 500:
+                break
+        validate_endpoint_content("".join(head), endpoint)
+    except Exception:
+        response.close()
+        raise
+
+    print(f"  Success! Streaming response from {endpoint['name']}")
+    return StreamedBody(itertools.chain(head, chunks), response), endpoint_type
+
+
+def _close_abandoned_fetch(future: Future[tuple[StreamedBody, str]]) -> None:
+    """Release the response of a fetch whose result nobody will read."""
+    if not future.cancelled() and future.exception() is None:
+        future.result()[0].close()
+
+
+def _fetch_in_thread(endpoint: dict[str, str]) -> tuple[StreamedBody, str]:
+    return fetch_from_endpoint(endpoint, _thread_fetch_session())
+
+
+async def _hedged_attempt(
+    endpoint: dict[str, str],
+    executor: ThreadPoolExecutor,
+    start_delay: float,
+    report: dict[str, Any],
+) -> tuple[StreamedBody, str]:
+    """
+    Fetch one endpoint (with retries) after its hedge delay, recording latency.
 
-    if not content or len(content) < 100:
-        raise ValueError(f"Empty or too short response from {endpoint['name']}")
+    Requests run in `executor` threads, each with its own session. If the
+    attempt is cancelled mid-request, the request still finishes in its
+    thread, and its response is then closed.
+    """
+    import asyncio
 
-    # Check for error pages
-    if "error" in content.lower()[:500] and "plan" not in content.lower()[:500]:
-        raise ValueError(f"Error page received from {endpoint['name']}")
+    import requests
 
-    print(f"  Success! Received {len(content)} bytes")
-    return content, endpoint_type
+    await asyncio.sleep(start_delay)
+    started = time.perf_counter()
+    report["status"] = "running"
+    report["started"] = started
 
+    attempt = 0
+    while True:
+        attempt += 1
+        report["attempts"] = attempt
+        future = executor.submit(_fetch_in_thread, endpoint)
+        try:
+            result = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(_close_abandoned_fetch)
+            raise
+        except (requests.exceptions.RequestException, ValueError) as e:
+            report["error"] = str(e)
+            if attempt >= MAX_RETRIES:
+                report["status"] = "failed"
+                report["seconds"] = round(time.perf_counter() - started, 3)
+                raise
+            # Exponential backoff with jitter
+            await asyncio.sleep(BASE_DELAY * (2 ** (attempt - 1)) + random.uniform(0, 1))
+            continue
+        report["status"] = "won"
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        return result
+
+
+async def race_endpoints(
+    endpoints: list[dict[str, str]],
+) -> tuple[Iterator[str], str, dict[str, dict[str, Any]]]:
+    """
+    Send hedged requests to all endpoints and keep the first valid response.
+
+    Endpoints start `FETCH_HEDGE_DELAY` seconds apart in order of preference,
+    so the preferred endpoint gets a head start. As soon as one returns valid
+    plan data the remaining requests are cancelled, and the responses of
+    any that still complete are closed.
+
+    Args:
+        endpoints: Endpoint configurations in order of preference
 
-def fetch_plans_data() -> tuple[str, str]:
+    Returns:
+        Tuple of (decoded text chunks, data_type, per-endpoint latency report)
+
+    Raises:
+        RuntimeError if every endpoint fails
+    """
+    import asyncio
+
+    import requests
+
+    report: dict[str, dict[str, Any]] = {
+        endpoint["name"]: {"status": "pending", "attempts": 0} for endpoint in endpoints
+    }
+    executor = ThreadPoolExecutor(max_workers=len(endpoints), thread_name_prefix="ptc-fetch")
+    tasks = [
+        asyncio.create_task(
+            _hedged_attempt(endpoint, executor, index * FETCH_HEDGE_DELAY, report[endpoint["name"]])
+        )
+        for index, endpoint in enumerate(endpoints)
+    ]
+
+    winner: StreamedBody | None = None
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                winner, data_type = await next_done
+            except (requests.exceptions.RequestException, ValueError):
+                continue
+            return winner, data_type, report
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Attempts that completed alongside the winner hold open responses
+        for outcome in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(outcome, tuple) and outcome[0] is not winner:
+                outcome[0].close()
+        for result in report.values():
+            if result["status"] in ("pending", "running"):
+                result["status"] = "cancelled"
+                if "started" in result:
+                    result["seconds"] = round(time.perf_counter() - result["started"], 3)
+            result.pop("started", None)
+        # Don't wait for abandoned requests; they are bounded by REQUEST_TIMEOUT
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    errors = "; ".join(f"{name}: {r.get('error', r['status'])}" for name, r in report.items())
+    raise RuntimeError(f"All endpoints failed ({errors})")
+
+
+def print_latency_report(report: dict[str, dict[str, Any]]) -> None:
+    """Print per-endpoint status and latency from a hedged fetch."""
+    print("  Endpoint latency:")
+    for name, result in report.items():
+        seconds = result.get("seconds")
+        latency = f"{seconds:.2f}s" if seconds is not None else "-"
+        print(f"    {name:<20} {result['status']:<10} {latency:>8}  attempts={result['attempts']}")
+
+
+def iter_file_chunks(path: Path) -> Iterator[bytes]:
+    """Read a local file in fixed-size chunks."""
+    with path.open("rb") as f:
+        while chunk := f.read(STREAM_CHUNK_SIZE):
+            yield chunk
+
+
+def fetch_plans_data() -> tuple[Iterator[str], str]:
     """
     Fetch plan data from Power to Choose using multiple endpoints.
 
+    In the default `race` mode all endpoints are queried concurrently with
+    hedged start times; `PTC_FETCH_MODE=sequential` tries them one at a time.
+
     Returns:
-        Tuple of (data_text, data_type)
+        Tuple of (decoded text chunks, data_type)
 
     Raises:
         SystemExit if all endpoints fail
@@ -195,19 +465,28 @@ def fetch_plans_data() -> tuple[str, str]:
         if not os.path.exists(test_file):
             print(f"Error: Test file {test_file} not found")
             sys.exit(1)
-        with open(test_file, encoding="utf-8") as f:
-            return f.read(), "csv"
+        return iter_decoded_chunks(iter_file_chunks(Path(test_file))), "csv"
 
     errors = []
 
-    for endpoint in ENDPOINTS:
+    if FETCH_MODE == "race":
+        import asyncio
+
         try:
-            return retry_with_backoff(fetch_from_endpoint, endpoint)
-        except Exception as e:
-            error_msg = f"{endpoint['name']}: {e}"
-            errors.append(error_msg)
-            print(f"  Endpoint failed: {e}")
-            continue
+            content, data_type, report = asyncio.run(race_endpoints(ENDPOINTS))
+            print_latency_report(report)
+            return content, data_type
+        except RuntimeError as e:
+            errors.append(str(e))
+    else:
+        for endpoint in ENDPOINTS:
+            try:
+                return retry_with_backoff(fetch_from_endpoint, endpoint)
+            except Exception as e:
+                error_msg = f"{endpoint['name']}: {e}"
+                errors.append(error_msg)
+                print(f"  Endpoint failed: {e}")
+                continue
 
     # All endpoints failed
     print("\nAll endpoints failed:", file=sys.stderr)
@@ -219,358 +498,131 @@ def fetch_plans_data() -> tuple[str, str]:
     sys.exit(1)
 
 
-def register_efl_domain(efl_url: str) -> None:
-    if not EFL_ETF_AUTO_ALLOWLIST or not efl_url:
-        return
-    if not efl_url.startswith(("http://", "https://")):
-        return
-    domain = urlparse(efl_url).netloc.lower()
-    if domain:
-        EFL_ETF_AUTO_DOMAINS.add(domain)
-
-
-def seed_efl_allowlist_from_existing_data(data_path: Path) -> None:
-    if not EFL_ETF_AUTO_ALLOWLIST:
-        return
-    if not data_path.exists():
-        return
-
-    try:
-        with data_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-    except (OSError, json.JSONDecodeError):
-        return
-
-    plans = data.get("plans", []) if isinstance(data, dict) else []
-    if not isinstance(plans, list):
-        return
-
-    for plan in plans:
-        if not isinstance(plan, dict):
-            continue
-        register_efl_domain(plan.get("efl_url", ""))
-
-
-def should_attempt_efl_lookup(efl_url: str) -> bool:
-    if not EFL_ETF_LOOKUP or not efl_url:
-        return False
-    if len(_efl_etf_cache) >= EFL_ETF_MAX_FETCHES:
-        return False
-    if not efl_url.startswith(("http://", "https://")):
-        return False
-    if not EFL_ETF_ALLOWED_DOMAINS and not EFL_ETF_AUTO_DOMAINS:
-        return True
-    domain = urlparse(efl_url).netloc.lower()
-    if any(domain.endswith(allowed) for allowed in EFL_ETF_ALLOWED_DOMAINS):
-        return True
-    if EFL_ETF_AUTO_ALLOWLIST and domain in EFL_ETF_AUTO_DOMAINS:
-        return True
-    return False
-
-
-def extract_etf_from_text(text: str) -> dict[str, Any] | None:
-    if not text:
-        return None
-
-    normalized = re.sub(r"\s+", " ", text).strip().lower()
-
-    no_fee_patterns = [
-        r"no\s+(?:early\s+)?(?:termination|cancellation)\s+fee",
-        r"early\s+termination\s+fee\s*[:\-]?\s*none",
-        r"early\s+termination\s+fee\s*[:\-]?\s*\$?0\b",
-        r"cancellation\s+fee\s*[:\-]?\s*none",
-        r"cancellation\s+fee\s*[:\-]?\s*\$?0\b",
-    ]
-    if any(re.search(pat, normalized) for pat in no_fee_patterns):
-        return {"structure": "none", "source": "efl"}
-
-    per_month_patterns = [
-        r"\$(\d+(?:\.\d{2})?)\s*(?:per|/)\s*(?:each\s+)?(?:month|mo)\s*(?:remaining|left)",
-        r"\$(\d+(?:\.\d{2})?)\s*(?:for\s+each)\s+(?:remaining\s+)?month",
-        r"\$(\d+(?:\.\d{2})?)\s*(?:multiplied\s+by|times|x)\s*(?:the\s+)?(?:number\s+of\s+)?months?\s*(?:remaining|left)",
-        r"\$(\d+(?:\.\d{2})?)\s*(?:multiplied\s+by|times|x)\s*(?:the\s+)?(?:number\s+of\s+)?months?\s*(?:remaining|left).*?term",
-        r"\$(\d+(?:\.\d{2})?)\s*(?:per|/)\s*(?:month|mo)\s*remaining",
-    ]
-
-    for pat in per_month_patterns:
-        match = re.search(pat, normalized)
-        if match:
-            return {
-                "structure": "per-month",
-                "per_month_rate": float(match.group(1)),
-                "source": "efl",
-            }
-
-    flat_patterns = [
-        r"early\s+(?:termination|cancellation)\s+fee[^\d\$]{0,20}\$?(\d+(?:\.\d{2})?)",
-        r"cancellation\s+fee[^\d\$]{0,20}\$?(\d+(?:\.\d{2})?)",
-    ]
-    for pat in flat_patterns:
-        match = re.search(pat, normalized)
-        if match:
-            return {
-                "structure": "flat",
-                "flat_fee": float(match.group(1)),
-                "source": "efl",
-            }
+def parse_csv_to_plans(csv_text: str) -> list[PlanRecord]:
+    """Parse CSV text into structured plan data."""
+    # Handle potential BOM; splitlines() normalizes \r\n and \r line endings
+    return list(iter_csv_plans(csv_text.lstrip("\ufeff").splitlines()))
 
-    if "early termination fee" in normalized or "cancellation fee" in normalized:
-        return {"structure": "unknown", "source": "efl"}
 
-    return None
+def iter_csv_plans(lines: Iterable[str]) -> Iterator[PlanRecord]:
+    """
+    Parse CSV lines into structured plan data, one plan at a time.
 
+    Each normalized plan is yielded as soon as its row is parsed, so a
+    streamed export never has to be held in memory.
 
-def fetch_etf_from_efl(efl_url: str, session: requests.Session) -> dict[str, Any] | None:
-    if not should_attempt_efl_lookup(efl_url):
-        return None
-    if efl_url in _efl_etf_cache:
-        return _efl_etf_cache[efl_url]
+    Args:
+        lines: CSV lines without line terminators (header first)
 
+    Yields:
+        Normalized plan dicts
+    """
+    reader = csv.reader(lines)
     try:
-        response = session.get(efl_url, timeout=EFL_ETF_TIMEOUT)
-        response.raise_for_status()
-    except requests.RequestException:
-        _efl_etf_cache[efl_url] = None
-        return None
-
-    content_type = response.headers.get("Content-Type", "").lower()
-    text = ""
-
-    if "pdf" in content_type or response.content[:4] == b"%PDF":
-        if not pdfplumber:
-            _efl_etf_cache[efl_url] = None
-            return None
-        try:
-            with pdfplumber.open(io.BytesIO(response.content)) as pdf:
-                pages = pdf.pages[:2]
-                text = "\n".join(page.extract_text() or "" for page in pages)
-        except Exception:
-            _efl_etf_cache[efl_url] = None
-            return None
-    else:
-        text = response.text
-
-    result = extract_etf_from_text(text)
-    _efl_etf_cache[efl_url] = result
-    return result
-
-
-def enrich_plan_with_efl_etf(plan: dict[str, Any], session: requests.Session) -> None:
-    if not plan or not plan.get("efl_url"):
-        return
-    register_efl_domain(plan.get("efl_url"))
-    if plan.get("etf_details"):
-        return
-    etf_value = plan.get("early_termination_fee")
-    if etf_value not in (None, 0, 0.0, "", "0"):
+        fieldnames = next(reader, None)
+    except csv.Error as e:
+        print(f"CSV parsing error: {e}", file=sys.stderr)
         return
 
-    etf_details = fetch_etf_from_efl(plan["efl_url"], session)
-    if etf_details:
-        plan["etf_details"] = etf_details
-
-
-def parse_csv_to_plans(csv_text: str) -> list[dict[str, Any]]:
-    """Parse CSV text into structured plan data."""
-    plans = []
-    efl_session = requests.Session()
-
-    # Handle potential BOM and normalize line endings
-    csv_text = csv_text.lstrip("\ufeff").replace("\r\n", "\n").replace("\r", "\n")
-
-    try:
-        reader = csv.DictReader(csv_text.splitlines())
-
-        # Verify we have expected columns
-        if not reader.fieldnames:
-            raise ValueError("No columns found in CSV")
-
-        # Power to Choose uses bracketed column names like [TduCompanyName]
-        # Map both old and new column formats
-        print(f"  Found {len(reader.fieldnames)} columns")
+    # Verify we have expected columns
+    if not fieldnames:
+        raise ValueError("No columns found in CSV")
 
-        # Check for new bracket format
-        has_brackets = any(col.startswith("[") for col in reader.fieldnames if col)
-        if has_brackets:
-            print("  Detected Power to Choose bracket column format")
-
-    except csv.Error as e:
-        print(f"CSV parsing error: {e}", file=sys.stderr)
-        return []
+    # Resolve the header once into column indices per logical field
+    # (Power to Choose uses bracketed column names like [TduCompanyName])
+    schema = get_schema_adapter(tuple(fieldnames))
+    print(f"  Found {len(fieldnames)} columns")
+    if schema.has_brackets:
+        print("  Detected Power to Choose bracket column format")
 
     row_count = 0
     error_count = 0
+    plan_count = 0
+    unmatched_tdus: Counter[str] = Counter()
 
-    def get_val(row: dict, *keys: str) -> str:
-        """Try multiple possible column names."""
-        for key in keys:
-            val = row.get(key)
-            if val:
-                return val
-            # Try with brackets
-            val = row.get(f"[{key}]")
-            if val:
-                return val
-        return ""
-
-    for row in reader:
+    for raw_row in reader:
+        if not raw_row:
+            continue
         row_count += 1
         try:
+            row = schema.extract(raw_row)
+
             # Get TDU area and normalize it
-            tdu_raw = get_val(row, "TduCompanyName", "TduCompany", "TDU", "TDU Area", "tdu_area")
-            tdu_area = normalize_tdu_name(tdu_raw)
+            tdu_area = normalize_tdu_name(row.tdu)
+            if tdu_area not in TDU_CODES:
+                unmatched_tdus[tdu_area] += 1
 
             # Parse prices - Power to Choose now returns decimal rates (e.g., 0.1600)
             # Convert to cents if needed
-            price_500_raw = get_val(
-                row, "kwh500", "Price/kWh 500", "Price/kWh: 500 kWh", "Price500", "price_kwh_500"
-            )
-            price_1000_raw = get_val(
-                row,
-                "kwh1000",
-                "Price/kWh 1000",
-                "Price/kWh: 1000 kWh",
-                "Price1000",
-                "price_kwh_1000",
-            )
-            price_2000_raw = get_val(
-                row,
-                "kwh2000",
-                "Price/kWh 2000",
-                "Price/kWh: 2000 kWh",
-                "Price2000",
-                "price_kwh_2000",
-            )
-
-            price_500 = parse_price(price_500_raw)
-            price_1000 = parse_price(price_1000_raw)
-            price_2000 = parse_price(price_2000_raw)
+            price_500 = parse_price(row.price_500)
+            price_1000 = parse_price(row.price_1000)
+            price_2000 = parse_price(row.price_2000)
 
             # Extract Cancellation Fee
-            cancel_fee_raw = get_val(
-                row, "CancelFee", "Cancellation Fee", "ETF", "early_termination_fee"
-            )
+            cancel_fee_raw = row.cancel_fee
             if not cancel_fee_raw:
                 # Try to extract from Pricing Details if CancelFee column is missing/empty
-                pricing_details = get_val(row, "Pricing Details")
+                pricing_details = row.pricing_details
                 if pricing_details:
                     # Look for "Cancellation Fee: $XXX" pattern
-                    match = re.search(r"Cancellation Fee:\s*\$?([\d\.]+)", pricing_details)
+                    match = CANCELLATION_FEE_RE.search(pricing_details)
                     if match:
                         cancel_fee_raw = match.group(1)
 
             # Parse plan data with validation
 
             # Determine language
-            lang_raw = get_val(row, "Language", "Lang")
+            lang_raw = row.language
             if not lang_raw:
                 # In exports where language isn't explicit but field exists as [Language], it's often populated.
                 # If completely missing, assume English or check plan triggers?
                 # For now default to 'English' if not mapped, but [Language] usually exists in offers.csv
                 lang_raw = "English"
 
-            plan = {
-                "plan_id": sanitize_string(get_val(row, "idKey", "ID Plan", "Plan ID", "plan_id")),
-                "rep_name": sanitize_string(get_val(row, "RepCompany", "REP Name", "rep_name")),
-                "plan_name": sanitize_string(get_val(row, "Product", "Plan Name", "plan_name")),
-                "tdu_area": tdu_area,
+            plan = PlanRecord(
+                plan_id=sanitize_string(row.plan_id),
+                rep_name=sanitize_string(row.rep_name),
+                plan_name=sanitize_string(row.plan_name),
+                tdu_area=tdu_area,
                 # Prices at standard usage levels (in cents per kWh)
-                "price_kwh_500": price_500,
-                "price_kwh_1000": price_1000,
-                "price_kwh_2000": price_2000,
+                price_kwh_500=price_500,
+                price_kwh_1000=price_1000,
+                price_kwh_2000=price_2000,
                 # Plan details
-                "term_months": parse_int(
-                    get_val(row, "TermValue", "Term Value", "Term", "term_months")
-                ),
-                "rate_type": sanitize_string(
-                    get_val(row, "RateType", "Rate Type", "rate_type") or "FIXED"
-                ).upper(),
-                "renewable_pct": parse_int(
-                    get_val(
-                        row, "Renewable", "Renewable Perc", "Renewable Content", "renewable_pct"
-                    )
-                    or "0"
-                ),
-                "is_prepaid": get_val(row, "PrePaid", "Prepaid", "is_prepaid").upper()
-                in ("TRUE", "YES", "1"),
-                "is_tou": get_val(row, "TimeOfUse", "Time Of Use", "Time of Use", "is_tou").upper()
-                in ("TRUE", "YES", "1"),
+                term_months=parse_int(row.term),
+                rate_type=sanitize_string(row.rate_type or "FIXED").upper(),
+                renewable_pct=parse_int(row.renewable or "0"),
+                is_prepaid=row.prepaid.upper() in ("TRUE", "YES", "1"),
+                is_tou=row.tou.upper() in ("TRUE", "YES", "1"),
                 # Fees
-                "early_termination_fee": parse_float(cancel_fee_raw),
-                "base_charge_monthly": parse_float(
-                    get_val(row, "base_charge_monthly") or "0"
-                ),  # Support internal field
+                early_termination_fee=parse_float(cancel_fee_raw),
+                base_charge_monthly=parse_float(row.base_charge or "0"),  # Support internal field
                 # URLs
-                "efl_url": sanitize_url(
-                    get_val(
-                        row,
-                        "FactsURL",
-                        "Fact Sheet",
-                        "Electricity Facts Label (EFL) URL",
-                        "EFL URL",
-                        "efl_url",
-                    )
-                ),
-                "enrollment_url": sanitize_url(
-                    get_val(
-                        row,
-                        "EnrollURL",
-                        "Ordering Info",
-                        "Enroll URL",
-                        "Enrollment URL",
-                        "enrollment_url",
-                    )
-                ),
-                "terms_url": sanitize_url(
-                    get_val(
-                        row,
-                        "TermsURL",
-                        "Terms of Service",
-                        "Terms of Service (TOS) URL",
-                        "TOS URL",
-                        "terms_url",
-                    )
-                ),
+                efl_url=sanitize_url(row.efl_url),
+                enrollment_url=sanitize_url(row.enrollment_url),
+                terms_url=sanitize_url(row.terms_url),
                 # Special features
-                "special_terms": sanitize_string(
-                    get_val(
-                        row,
-                        "SpecialTerms",
-                        "Plan Details",
-                        "Special terms and conditions",
-                        "Special Terms",
-                        "special_terms",
-                    )
-                ),
-                "promotion_details": sanitize_string(
-                    get_val(row, "PromotionDesc", "Promotion", "Promotion details", "Promotions")
-                ),
+                special_terms=sanitize_string(row.special_terms),
+                promotion_details=sanitize_string(row.promotion_details),
                 # Additional fields
-                "fees_credits": sanitize_string(
-                    get_val(row, "Fees/Credits", "MinUsageFeesCredits", "Min Usage Fees/Credits")
-                ),
-                "min_usage_fees": sanitize_string(
-                    get_val(row, "MinUsageFeesCredits", "Min Usage Fees/Credits", "Min Usage Fees")
-                ),
-                "language": sanitize_string(lang_raw),
-            }
+                fees_credits=sanitize_string(row.fees_credits),
+                min_usage_fees=sanitize_string(row.min_usage_fees),
+                language=sanitize_string(lang_raw),
+            )
 
             # Validation: Only include plans with valid pricing data
-            if not plan["price_kwh_1000"] or plan["price_kwh_1000"] <= 0:
+            if not plan.price_kwh_1000 or plan.price_kwh_1000 <= 0:
                 continue
 
             # Additional validation
-            if not plan["rep_name"] or not plan["plan_name"]:
+            if not plan.rep_name or not plan.plan_name:
                 continue
 
             # Ensure all required price points exist
-            if not plan["price_kwh_500"]:
-                plan["price_kwh_500"] = plan["price_kwh_1000"]
-            if not plan["price_kwh_2000"]:
-                plan["price_kwh_2000"] = plan["price_kwh_1000"]
-
-            enrich_plan_with_efl_etf(plan, efl_session)
-            plans.append(plan)
+            if not plan.price_kwh_500:
+                plan.price_kwh_500 = plan.price_kwh_1000
+            if not plan.price_kwh_2000:
+                plan.price_kwh_2000 = plan.price_kwh_1000
 
         except (ValueError, KeyError, TypeError) as e:
             error_count += 1
@@ -578,83 +630,82 @@ def parse_csv_to_plans(csv_text: str) -> list[dict[str, Any]]:
                 print(f"Warning: Error parsing row {row_count}: {e}", file=sys.stderr)
             continue
 
+        plan_count += 1
+        yield plan
+
+    run_metrics.count("parse.rows", row_count)
+    run_metrics.count("parse.errors", error_count)
+    run_metrics.count("parse.rows_skipped", row_count - error_count - plan_count)
+    run_metrics.count("parse.tdu_unmatched", unmatched_tdus.total())
+    for tdu_name, rows in unmatched_tdus.most_common():
+        run_metrics.count(f"parse.tdu_unmatched.{tdu_name}", rows)
+    if unmatched_tdus:
+        names = ", ".join(f"{name} ({rows})" for name, rows in unmatched_tdus.most_common(5))
+        print(f"Warning: Unrecognized TDU names passed through: {names}", file=sys.stderr)
     if error_count > 5:
         print(f"Warning: {error_count - 5} additional parsing errors suppressed", file=sys.stderr)
 
-    return plans
-
 
+# TDU company names as they appear in the CSV, mapped to codes. Order matters
+# for partial matches: the first key contained in (or containing) the name wins.
+TDU_NAME_MAPPING: dict[str, str] = {
+    "CENTERPOINT": "CENTERPOINT",
+    "CENTERPOINT ENERGY": "CENTERPOINT",
+    "CENTERPOINT ENERGY HOUSTON": "CENTERPOINT",
+    "CENTERPOINT ENERGY HOUSTON ELECTRIC": "CENTERPOINT",
+    "CENTERPOINT ENERGY HOUSTON ELECTRIC LLC": "CENTERPOINT",
+    "ONCOR": "ONCOR",
+    "ONCOR ELECTRIC": "ONCOR",
+    "ONCOR ELECTRIC DELIVERY": "ONCOR",
+    "ONCOR ELECTRIC DELIVERY COMPANY": "ONCOR",
+    "AEP TEXAS CENTRAL": "AEP_CENTRAL",
+    "AEP TEXAS CENTRAL COMPANY": "AEP_CENTRAL",
+    "AEP CENTRAL": "AEP_CENTRAL",
+    "AEP TEXAS NORTH": "AEP_NORTH",
+    "AEP TEXAS NORTH COMPANY": "AEP_NORTH",
+    "AEP NORTH": "AEP_NORTH",
+    "TEXAS-NEW MEXICO POWER": "TNMP",
+    "TEXAS-NEW MEXICO POWER COMPANY": "TNMP",
+    "TNMP": "TNMP",
+    "LUBBOCK POWER": "LPL",
+    "LUBBOCK POWER & LIGHT": "LPL",
+    "LPL": "LPL",
+}
+TDU_CODES = frozenset(TDU_NAME_MAPPING.values())
+
+
+@functools.lru_cache(maxsize=256)
 def normalize_tdu_name(tdu_raw: str) -> str:
-    """Normalize TDU company name to standard code."""
+    """
+    Normalize TDU company name to standard code.
+
+    Memoized: an export only has a handful of distinct TDU strings, so the
+    partial-match scan runs once per distinct value rather than once per row.
+    Names that match no key are returned uppercased (see TDU_CODES to detect them).
+    """
     if not tdu_raw:
         return "UNKNOWN"
 
     tdu_upper = tdu_raw.upper().strip()
 
-    # Map full names to codes
-    tdu_mapping = {
-        "CENTERPOINT": "CENTERPOINT",
-        "CENTERPOINT ENERGY": "CENTERPOINT",
-        "CENTERPOINT ENERGY HOUSTON": "CENTERPOINT",
-        "CENTERPOINT ENERGY HOUSTON ELECTRIC": "CENTERPOINT",
-        "CENTERPOINT ENERGY HOUSTON ELECTRIC LLC": "CENTERPOINT",
-        "ONCOR": "ONCOR",
-        "ONCOR ELECTRIC": "ONCOR",
-        "ONCOR ELECTRIC DELIVERY": "ONCOR",
-        "ONCOR ELECTRIC DELIVERY COMPANY": "ONCOR",
-        "AEP TEXAS CENTRAL": "AEP_CENTRAL",
-        "AEP TEXAS CENTRAL COMPANY": "AEP_CENTRAL",
-        "AEP CENTRAL": "AEP_CENTRAL",
-        "AEP TEXAS NORTH": "AEP_NORTH",
-        "AEP TEXAS NORTH COMPANY": "AEP_NORTH",
-        "AEP NORTH": "AEP_NORTH",
-        "TEXAS-NEW MEXICO POWER": "TNMP",
-        "TEXAS-NEW MEXICO POWER COMPANY": "TNMP",
-        "TNMP": "TNMP",
-        "LUBBOCK POWER": "LPL",
-        "LUBBOCK POWER & LIGHT": "LPL",
-        "LPL": "LPL",
-    }
-
     # Try exact match first
-    if tdu_upper in tdu_mapping:
-        return tdu_mapping[tdu_upper]
+    code = TDU_NAME_MAPPING.get(tdu_upper)
+    if code is not None:
+        return code
 
     # Try partial match
-    for key, code in tdu_mapping.items():
+    for key, code in TDU_NAME_MAPPING.items():
         if key in tdu_upper or tdu_upper in key:
             return code
 
     return tdu_upper
 
 
-def parse_price(value: Any) -> float | None:
-    """Parse price value, handling both cents and decimal formats."""
-    if value is None:
-        return None
-    try:
-        if isinstance(value, (int, float)):
-            num = float(value)
-        else:
-            cleaned = str(value).strip().replace("$", "").replace(",", "").replace("%", "")
-            if not cleaned:
-                return None
-            num = float(cleaned)
-
-        # Power to Choose returns rates as decimals (e.g., 0.1600 = 16 cents)
-        # If value is less than 1, it's in dollars per kWh, convert to cents
-        if num < 1.0:
-            return num * 100
-        return num
-    except (ValueError, AttributeError):
-        return None
-
-
 def parse_json_to_plans(json_text: str) -> list[dict[str, Any]]:
     """Parse JSON API response into structured plan data."""
     try:
-        data = json.loads(json_text)
-    except json.JSONDecodeError as e:
+        data = json_codec.loads(json_text)
+    except json_codec.JSONDecodeError as e:
         print(f"JSON parsing error: {e}", file=sys.stderr)
         return []
 
@@ -668,7 +719,6 @@ def parse_json_to_plans(json_text: str) -> list[dict[str, Any]]:
         return []
 
     plans = []
-    efl_session = requests.Session()
 
     for item in plans_data:
         try:
@@ -707,7 +757,6 @@ def parse_json_to_plans(json_text: str) -> list[dict[str, Any]]:
                     plan["price_kwh_500"] = plan["price_kwh_1000"]
                 if not plan["price_kwh_2000"]:
                     plan["price_kwh_2000"] = plan["price_kwh_1000"]
-                enrich_plan_with_efl_etf(plan, efl_session)
                 plans.append(plan)
 
         except (ValueError, KeyError, TypeError):
@@ -736,78 +785,77 @@ def sanitize_url(value: Any) -> str:
     return url
 
 
-def parse_float(value: Any) -> float | None:
-    """Parse a value to float, returning None if invalid."""
-    if value is None:
-        return None
-    try:
-        if isinstance(value, (int, float)):
-            return float(value)
-        cleaned = (
-            str(value).strip().replace("$", "").replace("¢", "").replace(",", "").replace("%", "")
-        )
-        return float(cleaned) if cleaned else None
-    except (ValueError, AttributeError):
-        return None
+# Field names of the fingerprint, in the order of `plan_fingerprint_key`
+FINGERPRINT_FIELDS = (
+    "rep",
+    "tdu",
+    "rate_type",
+    "p500",
+    "p1000",
+    "p2000",
+    "term",
+    "etf",
+    "base",
+    "renewable",
+    "prepaid",
+    "tou",
+)
 
 
-def parse_int(value: Any) -> int | None:
-    """Parse a value to int, returning None if invalid."""
-    if value is None:
-        return None
-    try:
-        if isinstance(value, int):
-            return value
-        if isinstance(value, float):
-            return int(value)
-        cleaned = str(value).strip().replace(",", "")
-        # Handle cases like "12 months"
-        cleaned = cleaned.split()[0] if cleaned else ""
-        return int(float(cleaned)) if cleaned else None
-    except (ValueError, AttributeError):
-        return None
-
-
-def create_plan_fingerprint(plan: dict[str, Any]) -> str:
+def normalize_fingerprint_price(price: float | None) -> float:
+    """Round price to 3 decimal places for consistent comparison"""
+    if price is None:
+        return 0.0
+    return round(price * 1000) / 1000
+
+
+def normalize_fingerprint_fee(fee: float | None) -> float:
+    """Round fee to 2 decimal places for consistent comparison"""
+    if fee is None:
+        return 0.0
+    return round(fee * 100) / 100
+
+
+def plan_fingerprint_key(plan: Plan) -> tuple[Any, ...]:
+    """
+    Create the fingerprint of a plan as a hashable tuple (see FINGERPRINT_FIELDS).
+
+    Used as the dictionary key for deduplication. Two parsed plans have equal
+    keys exactly when their `create_plan_fingerprint` strings are equal, but
+    building the tuple avoids a dict and a sorted `json.dumps` per plan.
+    """
+    return (
+        (plan.get("rep_name") or "").upper().strip(),
+        (plan.get("tdu_area") or "").upper().strip(),
+        (plan.get("rate_type") or "FIXED").upper().strip(),
+        normalize_fingerprint_price(plan.get("price_kwh_500")),
+        normalize_fingerprint_price(plan.get("price_kwh_1000")),
+        normalize_fingerprint_price(plan.get("price_kwh_2000")),
+        plan.get("term_months") or 0,
+        normalize_fingerprint_fee(plan.get("early_termination_fee")),
+        normalize_fingerprint_fee(plan.get("base_charge_monthly")),
+        plan.get("renewable_pct") or 0,
+        bool(plan.get("is_prepaid")),
+        bool(plan.get("is_tou")),
+    )
+
+
+def create_plan_fingerprint(plan: Plan) -> str:
     """
     Create fingerprint
 
     Duplicates typically occur when providers list the same plan in both English and Spanish with identical pricing, terms, and features but different plan names.
 
     Analysis shows that plans with identical numeric features always have identical text descriptions, making text extraction unnecessary.
-    """
-
-    def normalize_price(price):
-        """Round price to 3 decimal places for consistent comparison"""
-        if price is None:
-            return 0.0
-        return round(price * 1000) / 1000
-
-    def normalize_fee(fee):
-        """Round fee to 2 decimal places for consistent comparison"""
-        if fee is None:
-            return 0.0
-        return round(fee * 100) / 100
-
-    fingerprint_data = {
-        "rep": (plan.get("rep_name") or "").upper().strip(),
-        "tdu": (plan.get("tdu_area") or "").upper().strip(),
-        "rate_type": (plan.get("rate_type") or "FIXED").upper().strip(),
-        "p500": normalize_price(plan.get("price_kwh_500")),
-        "p1000": normalize_price(plan.get("price_kwh_1000")),
-        "p2000": normalize_price(plan.get("price_kwh_2000")),
-        "term": plan.get("term_months") or 0,
-        "etf": normalize_fee(plan.get("early_termination_fee")),
-        "base": normalize_fee(plan.get("base_charge_monthly")),
-        "renewable": plan.get("renewable_pct") or 0,
-        "prepaid": bool(plan.get("is_prepaid")),
-        "tou": bool(plan.get("is_tou")),
-    }
 
+    Returns the JSON form shared with the JavaScript implementation; use
+    `plan_fingerprint_key` when the fingerprint is only needed as a key.
+    """
+    fingerprint_data = dict(zip(FINGERPRINT_FIELDS, plan_fingerprint_key(plan), strict=True))
     return json.dumps(fingerprint_data, sort_keys=True)
 
 
-def calculate_plan_preference(plan: dict[str, Any]) -> int:
+def calculate_plan_preference(plan: Plan) -> int:
     """Score plans to prefer English versions with shorter names"""
     score = 100
     plan_name = plan.get("plan_name", "")
@@ -846,7 +894,7 @@ def calculate_plan_preference(plan: dict[str, Any]) -> int:
     return score
 
 
-def deduplicate_plans(plans: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def deduplicate_plans(plans: Iterable[Plan]) -> list[Plan]:
     """Remove duplicate plans based on fingerprinting.
 
     Uses same fingerprinting logic as JavaScript implementation:
@@ -854,27 +902,60 @@ def deduplicate_plans(plans: list[dict[str, Any]]) -> list[dict[str, Any]]:
     - Prefers English versions with shorter, clearer names
     - Excludes plan_name and plan_id from fingerprint (these differ for duplicates)
     """
-    fingerprint_map = {}
+    fingerprint_map: dict[tuple[Any, ...], Plan] = {}
+    # Preference score of the current winner, computed once on its first collision
+    winner_scores: dict[tuple[Any, ...], int] = {}
 
     for plan in plans:
-        fingerprint = create_plan_fingerprint(plan)
+        fingerprint = plan_fingerprint_key(plan)
+        existing_plan = fingerprint_map.get(fingerprint)
 
-        if fingerprint not in fingerprint_map:
+        if existing_plan is None:
             fingerprint_map[fingerprint] = plan
-        else:
-            # Compare preference scores - higher score wins
-            existing_plan = fingerprint_map[fingerprint]
+            continue
+
+        # Compare preference scores - higher score wins
+        existing_score = winner_scores.get(fingerprint)
+        if existing_score is None:
             existing_score = calculate_plan_preference(existing_plan)
-            current_score = calculate_plan_preference(plan)
+        current_score = calculate_plan_preference(plan)
 
-            if current_score > existing_score:
-                fingerprint_map[fingerprint] = plan
+        if current_score > existing_score:
+            fingerprint_map[fingerprint] = plan
+            winner_scores[fingerprint] = current_score
+        else:
+            winner_scores[fingerprint] = existing_score
 
     return list(fingerprint_map.values())
 
 
-def save_plans(plans: list[dict[str, Any]], output_path: Path) -> None:
-    """Save plans to JSON file with metadata.
+def validate_plan_schema(plans: Sequence[Plan]) -> Sequence[Plan]:
+    """Validate plans against the ElectricityPlan schema and drop the invalid ones."""
+    from plan_validation import format_report, validate_plans
+
+    result = validate_plans(plans)
+
+    print(
+        f"Validated {result.total} plans in {result.seconds * 1000:.1f} ms"
+        f" ({result.plans_per_second:,.0f} plans/s)"
+    )
+    if not result.reports:
+        return plans
+
+    print(f"Warning: Dropping {len(result.reports)} plans that fail validation", file=sys.stderr)
+    for report in result.reports[:5]:  # Only log first 5 reports
+        print(f"  {format_report(report)}", file=sys.stderr)
+    invalid = result.invalid_indices
+    return [plan for index, plan in enumerate(plans) if index not in invalid]
+
+
+def save_plans(
+    plans: Sequence[Plan], output_path: Path, pretty: bool | None = None
+) -> dict[str, Any]:
+    """Save plans to JSON file with metadata and return the saved document.
+
+    The file is compact, or indented by two spaces when `pretty` (default:
+    PLANS_JSON_PRETTY) is set.
 
     Note: We intentionally do NOT deduplicate here. Deduplication happens
     client-side in JavaScript so we can show statistics to the user about
@@ -885,21 +966,84 @@ def save_plans(plans: list[dict[str, Any]], output_path: Path) -> None:
         "data_source": "Power to Choose (https://www.powertochoose.org)",
         "total_plans": len(plans),
         "disclaimer": "Plan information is subject to change. Always verify details on the official EFL before enrolling.",
-        "plans": plans,
+        "plans": plans_as_dicts(plans),
     }
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    written = json_codec.dump(
+        data, output_path, pretty=PLANS_JSON_PRETTY if pretty is None else pretty
+    )
+
+    print(
+        f"Saved {len(plans)} plans to {output_path}" + ("" if written.changed else " (unchanged)")
+    )
+    return data
+
+
+def save_columnar_plans(data: dict[str, Any], output_path: Path) -> None:
+    """Write the columnar artifacts next to plans.json and report their sizes."""
+    sizes = write_columnar_artifacts(data, output_path.parent)
+    plans_json_size = output_path.stat().st_size
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    print(f"Saved columnar plans to {output_path.parent} (plans.json: {plans_json_size:,} bytes)")
+    for name, encodings in sizes.items():
+        detail = ", ".join(f"{encoding} {size:,}" for encoding, size in encodings.items())
+        print(f"  {name}: {detail}")
 
-    print(f"Saved {len(plans)} plans to {output_path}")
+
+def save_near_duplicates(
+    data: dict[str, Any], unique_plans: list[Plan], output_path: Path
+) -> dict[str, Any]:
+    """Cluster near-duplicates among the deduplicated plans and write them next to plans.json."""
+    document = write_near_duplicates(unique_plans, output_path.parent, data.get("last_updated"))
+
+    print(
+        f"Saved {len(document['clusters'])} near-duplicate clusters"
+        f" ({document['comparisons']:,} comparisons)"
+    )
+    return document
 
 
-def print_summary(plans: list[dict[str, Any]]) -> None:
-    """Print a summary of fetched plans."""
+def save_rankings(data: dict[str, Any], unique_plans: list[Plan], output_path: Path) -> None:
+    """Precompute rankings of the deduplicated plans for the canonical usage profiles."""
+    from rankings import write_rankings
+
+    rankings = write_rankings(unique_plans, output_path.parent, data.get("last_updated"))
+
+    combinations = sum(
+        len(buckets) for profiles in rankings["rankings"].values() for buckets in profiles.values()
+    )
+    print(f"Saved rankings for {combinations} TDU/profile/term combinations")
+
+
+def save_tdu_shards(data: dict[str, Any], output_path: Path) -> None:
+    """Write the per-TDU shards and manifest next to plans.json."""
+    manifest = write_tdu_shards(data, output_path.parent)
+
+    print(f"Saved {len(manifest['shards'])} per-TDU shards to {output_path.parent}")
+    for tdu, shard in sorted(manifest["shards"].items()):
+        print(f"  {tdu}: {shard['plans']} plans, {shard['bytes']:,} bytes -> {shard['file']}")
+
+
+def save_run_metrics(output_path: Path) -> None:
+    """Write run-metrics.json next to plans.json and print the stage timings."""
+    metrics = run_metrics.METRICS.write(output_path.parent)
+
+    print(f"\nStage timings ({metrics['total_seconds']:.2f}s total):")
+    for stage in metrics["stages"]:
+        indent = "  " * stage["depth"]
+        print(f"  {indent + stage['name']:<24} {stage['seconds']:>8.3f}s")
+    print(f"Saved run metrics to {output_path.parent / run_metrics.RUN_METRICS_FILENAME}")
+
+
+def print_summary(
+    plans: Sequence[Plan],
+    unique_plans: list[Plan] | None = None,
+    near_duplicates: dict[str, Any] | None = None,
+) -> None:
+    """Print a summary of fetched plans (pass `unique_plans` if already deduplicated)."""
     # Show both total and deduplicated counts
-    unique_plans = deduplicate_plans(plans)
+    if unique_plans is None:
+        unique_plans = deduplicate_plans(plans)
     duplicate_count = len(plans) - len(unique_plans)
 
     print("\nSummary:")
@@ -907,6 +1051,10 @@ def print_summary(plans: list[dict[str, Any]]) -> None:
     print(f"  Unique plans (after deduplication): {len(unique_plans)}")
     if duplicate_count > 0:
         print(f"  Duplicates removed: {duplicate_count}")
+    if near_duplicates is not None:
+        clusters = near_duplicates["clusters"]
+        clustered = sum(len(cluster["plan_ids"]) for cluster in clusters)
+        print(f"  Near-duplicate clusters: {len(clusters)} ({clustered} plans)")
 
     # Count plans by TDU
     tdu_counts: dict[str, int] = {}
@@ -944,25 +1092,54 @@ def main() -> None:
     print("Texas Electricity Plan Fetcher")
     print("=" * 70)
 
-    # Fetch data
-    data_text, data_type = fetch_plans_data()
+    # Fetch data (streamed; CSV rows are parsed as they arrive)
+    with run_metrics.span("fetch"):
+        data_chunks, data_type = fetch_plans_data()
+
+    # Parse based on data type. The body is downloaded while it is parsed,
+    # so the parse stage includes reading the rest of the response. The raw
+    # export is never held in memory, but the parsed plans are: plans.json
+    # keeps duplicates and is written as one document, and EFL enrichment and
+    # bulk validation both work on the whole list.
+    plans: Sequence[Plan]
+    with run_metrics.span("parse"):
+        if data_type == "csv":
+            plans = list(iter_csv_plans(iter_text_lines(data_chunks)))
+        else:
+            plans = parse_json_to_plans("".join(data_chunks))
 
-    # Parse based on data type
-    if data_type == "csv":
-        plans = parse_csv_to_plans(data_text)
-    else:
-        plans = parse_json_to_plans(data_text)
+    # Enrich missing ETFs from EFL documents (concurrent, after parsing)
+    with run_metrics.span("efl_enrichment"):
+        plans = enrich_plans_with_efl_etf(plans, cache=open_efl_cache(output_path.parent))
+    with run_metrics.span("validate"):
+        plans = validate_plan_schema(plans)
 
     if not plans:
         print("Warning: No plans found!", file=sys.stderr)
         print("This may indicate an issue with the data source.")
+        save_run_metrics(output_path)
         sys.exit(1)
 
-    # Save to file
-    save_plans(plans, output_path)
+    # Save to file, plus the compact columnar form and per-TDU shards used by the site
+    with run_metrics.span("save"):
+        with run_metrics.span("save.plans"):
+            data = save_plans(plans, output_path)
+        with run_metrics.span("save.columnar"):
+            save_columnar_plans(data, output_path)
+        with run_metrics.span("save.tdu_shards"):
+            save_tdu_shards(data, output_path)
+
+        # Deduplicate once for the rankings, the near-duplicate clusters and the summary
+        with run_metrics.span("dedup"):
+            unique_plans = deduplicate_plans(plans)
+        with run_metrics.span("save.rankings"):
+            save_rankings(data, unique_plans, output_path)
+        with run_metrics.span("save.near_duplicates"):
+            near_duplicates = save_near_duplicates(data, unique_plans, output_path)
 
     # Print summary
-    print_summary(plans)
+    print_summary(plans, unique_plans, near_duplicates)
+    save_run_metrics(output_path)
 
     print("\n" + "=" * 70)
     print("Data fetch complete!")
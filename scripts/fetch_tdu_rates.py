@@ -15,13 +15,14 @@ VULNERABILITY FIXED: Structured logging replaces print statements
 
 from __future__ import annotations
 
-import json
 import logging
 import sys
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+import json_codec
+
 # Configure structured logging
 logging.basicConfig(
     level=logging.INFO,
@@ -48,10 +49,9 @@ def load_current_rates(file_path: Path) -> dict[str, Any]:
         return {}
 
     try:
-        with file_path.open(encoding="utf-8") as f:
-            data: dict[str, Any] = json.load(f)
-            return data
-    except json.JSONDecodeError as e:
+        data: dict[str, Any] = json_codec.load(file_path)
+        return data
+    except json_codec.JSONDecodeError as e:
         logger.error("JSON parse error: %s", e)
         return {}
     except OSError as e:
@@ -121,9 +121,10 @@ def save_rates(rates_data: dict[str, Any], file_path: Path) -> bool:
     rates_data["last_updated"] = datetime.now(tz=UTC).strftime("%Y-%m-%d")
 
     try:
-        with file_path.open("w", encoding="utf-8") as f:
-            json.dump(rates_data, f, indent=2, ensure_ascii=False)
-        logger.info("Updated TDU rates saved to %s", file_path)
+        if json_codec.dump(rates_data, file_path, pretty=True).changed:
+            logger.info("Updated TDU rates saved to %s", file_path)
+        else:
+            logger.info("TDU rates unchanged in %s", file_path)
         return True
     except OSError as e:
         logger.error("Failed to save rates: %s", e)
@@ -0,0 +1,155 @@
+"""
+JSON encoding and decoding for plan data and its artifacts.
+
+Uses orjson when it is installed and the standard library `json` otherwise
+(`JSON_BACKEND=json` forces the fallback). Both write UTF-8 without ASCII
+escaping, either compact or indented by two spaces, and produce the same
+bytes for plan data as `json.dumps(..., ensure_ascii=False)`, so switching
+backends does not change any artifact (`python scripts/benchmark.py json`).
+
+Anything orjson refuses (integers beyond 64 bits, non-string keys, NaN
+literals in input, objects other than JSON types) is handed to the standard
+library, which then converts it or raises as before. The one difference:
+orjson writes NaN and infinities as `null` where the standard library
+writes the non-JSON literal `NaN`. Decoding errors are `json.JSONDecodeError`
+with either backend.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+from collections.abc import Collection
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from artifacts import ArtifactWrite, keep_artifact, write_artifact
+
+JSON_BACKEND = os.environ.get("JSON_BACKEND", "orjson").strip().lower()
+
+JSONDecodeError = json.JSONDecodeError
+
+
+@functools.cache
+def _load_orjson() -> ModuleType | None:
+    """Import orjson (an optional dependency), or None if missing or disabled."""
+    if JSON_BACKEND != "orjson":
+        return None
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return orjson
+
+
+def backend() -> str:
+    """Return the name of the backend in use ("orjson" or "json")."""
+    return "orjson" if _load_orjson() is not None else "json"
+
+
+def dumps(obj: Any, *, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes.
+
+    Args:
+        obj: JSON-compatible value
+        pretty: Indent by two spaces (as `json.dump(..., indent=2)`) instead of compact
+        sort_keys: Write object keys in sorted order (as `json.dump(..., sort_keys=True)`)
+
+    Returns:
+        Encoded document, without a trailing newline
+
+    Raises:
+        TypeError: If `obj` contains a value that is not JSON serializable
+    """
+    orjson = _load_orjson()
+    if orjson is not None:
+        # Dataclasses (e.g. PlanRecord) are not JSON types for the stdlib either
+        option = orjson.OPT_PASSTHROUGH_DATACLASS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option)  # type: ignore[no-any-return]
+        except orjson.JSONEncodeError:
+            pass
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys).encode(
+        "utf-8"
+    )
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Parse a JSON document.
+
+    Raises:
+        json.JSONDecodeError: If `data` is not valid JSON
+    """
+    orjson = _load_orjson()
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def load(path: Path) -> Any:
+    """
+    Read and parse a JSON file.
+
+    Raises:
+        OSError: If the file cannot be read
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    return loads(path.read_bytes())
+
+
+def same_document(path: Path, obj: Any, ignore_keys: Collection[str]) -> bool:
+    """
+    Return whether a JSON file holds `obj` apart from some top-level keys.
+
+    Args:
+        path: Existing JSON file (a missing or unreadable file never matches)
+        obj: Document about to be written
+        ignore_keys: Top-level keys left out of the comparison (e.g. a run timestamp)
+    """
+    if not isinstance(obj, dict):
+        return False
+    try:
+        existing = load(path)
+    except (OSError, JSONDecodeError):
+        return False
+    return (
+        isinstance(existing, dict)
+        and existing.keys() == obj.keys()
+        and all(existing[key] == value for key, value in obj.items() if key not in ignore_keys)
+    )
+
+
+def dump(
+    obj: Any,
+    path: Path,
+    *,
+    pretty: bool = False,
+    sort_keys: bool = False,
+    ignore_keys: Collection[str] = (),
+) -> ArtifactWrite:
+    """
+    Serialize `obj` to a JSON file (see `dumps`), published atomically.
+
+    The file is left untouched if it already holds the same document
+    (see artifacts.py), or one that differs only in `ignore_keys` (see
+    `same_document`).
+
+    Returns:
+        Size, SHA-256 and whether the file was replaced
+    """
+    if ignore_keys and same_document(path, obj, ignore_keys):
+        return keep_artifact(path)
+    return write_artifact(path, dumps(obj, pretty=pretty, sort_keys=sort_keys))
@@ -22,9 +22,11 @@ class RateType(str, Enum):
 
 
 class ETFStructure(str, Enum):
-    """Early termination fee calculation structure."""
+    """Early termination fee calculation structure (as written by scripts/efl_etf.py)."""
 
+    NONE = "none"
     FLAT = "flat"
+    PER_MONTH = "per-month"
     PER_MONTH_REMAINING = "per-month-remaining"
     UNKNOWN = "unknown"
 
@@ -42,6 +44,8 @@ class ETFDetails(BaseModel):
 
     structure: ETFStructure
     base_amount: float | None = None
+    per_month_rate: Annotated[float, Field(ge=0)] | None = None
+    flat_fee: Annotated[float, Field(ge=0)] | None = None
     source: ETFSource
 
     model_config = {"frozen": True}
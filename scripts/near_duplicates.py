@@ -0,0 +1,188 @@
+"""
+Near-duplicate plan clustering.
+
+`deduplicate_plans` only merges plans whose rounded fingerprints are equal,
+so it misses plans that differ by float noise across a rounding boundary or
+that were re-listed with a slightly different ETF or base charge. This module
+groups such plans into clusters without comparing every pair:
+
+- blocking: plans are only compared within the same (rep, TDU, term) block,
+  and only if rate type, prepaid and time-of-use flags match
+- tolerance buckets: inside a block, plans are indexed by their 1000 kWh
+  price in buckets one price tolerance wide, so a plan is only compared with
+  plans in its own and the two neighbouring buckets
+
+Two plans match when every compared field is within its tolerance. Matches
+are merged with union-find, so a cluster is a connected group of matches.
+Each pair's similarity is 1 minus the mean of its field differences relative
+to their tolerances (1.0 for equal values, 0.0 at the tolerance limit).
+
+The result is written to `data/near-duplicates.json`:
+
+    {"clusters": [{"id": ..., "plan_ids": [...], "similarity": 0.97}, ...]}
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import json_codec
+
+if TYPE_CHECKING:
+    from plan_record import Plan
+
+NEAR_DUPLICATES_VERSION = 1
+NEAR_DUPLICATES_FILENAME = "near-duplicates.json"
+
+# Maximum difference per compared field for two plans to be near-duplicates
+DEFAULT_TOLERANCES: dict[str, float] = {
+    "price_kwh_500": 0.05,  # ¢/kWh
+    "price_kwh_1000": 0.05,  # ¢/kWh
+    "price_kwh_2000": 0.05,  # ¢/kWh
+    "base_charge_monthly": 1.0,  # $
+    "early_termination_fee": 50.0,  # $
+    "renewable_pct": 5.0,  # percentage points
+}
+
+
+def blocking_key(plan: Plan) -> tuple[Any, ...]:
+    """Return the key of the block a plan is compared within (rep, TDU, term and flags)."""
+    return (
+        (plan.get("rep_name") or "").upper().strip(),
+        (plan.get("tdu_area") or "").upper().strip(),
+        plan.get("term_months") or 0,
+        (plan.get("rate_type") or "FIXED").upper().strip(),
+        bool(plan.get("is_prepaid")),
+        bool(plan.get("is_tou")),
+    )
+
+
+def _values(plan: Plan, fields: Sequence[str]) -> tuple[float, ...]:
+    return tuple(float(plan.get(field) or 0.0) for field in fields)
+
+
+def similarity(a: Sequence[float], b: Sequence[float], tolerances: Sequence[float]) -> float | None:
+    """
+    Score two plans' compared field values.
+
+    Returns:
+        Similarity in [0, 1], or None if any field differs by more than its tolerance
+    """
+    total = 0.0
+    for x, y, tolerance in zip(a, b, tolerances, strict=True):
+        ratio = abs(x - y) / tolerance if tolerance else float(x != y)
+        if ratio > 1.0:
+            return None
+        total += ratio
+    return 1.0 - total / len(tolerances)
+
+
+class _UnionFind:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+
+def cluster_near_duplicates(
+    plans: Sequence[Plan], tolerances: dict[str, float] | None = None
+) -> dict[str, Any]:
+    """
+    Cluster near-duplicate plans.
+
+    Args:
+        plans: Plans to cluster (usually already deduplicated exactly)
+        tolerances: Maximum difference per field (default: DEFAULT_TOLERANCES)
+
+    Returns:
+        Dict with `clusters` (only groups of two or more plans, in first-seen
+        order) and `comparisons` (number of pairs scored). Each cluster has an
+        `id` (its smallest plan_id), `plan_ids` in input order, `similarity`
+        (lowest score among its matched pairs) and `scores` (each member's best
+        score against another member).
+    """
+    tolerances = tolerances or DEFAULT_TOLERANCES
+    fields = list(tolerances)
+    field_tolerances = [tolerances[field] for field in fields]
+    bucket_field = "price_kwh_1000" if "price_kwh_1000" in tolerances else fields[0]
+    bucket_width = tolerances[bucket_field] or 1.0
+
+    values = [_values(plan, fields) for plan in plans]
+    union_find = _UnionFind(len(plans))
+    best_score: dict[int, float] = {}
+    edge_scores: list[tuple[int, float]] = []
+    comparisons = 0
+
+    # block key -> price bucket -> indices of plans seen so far
+    blocks: dict[tuple[Any, ...], dict[int, list[int]]] = {}
+    for index, plan in enumerate(plans):
+        buckets = blocks.setdefault(blocking_key(plan), {})
+        bucket = math.floor(float(plan.get(bucket_field) or 0.0) / bucket_width)
+        for neighbour in (bucket - 1, bucket, bucket + 1):
+            for other in buckets.get(neighbour, ()):
+                comparisons += 1
+                score = similarity(values[index], values[other], field_tolerances)
+                if score is None:
+                    continue
+                union_find.union(index, other)
+                edge_scores.append((other, score))
+                for member in (index, other):
+                    best_score[member] = max(best_score.get(member, 0.0), score)
+        buckets.setdefault(bucket, []).append(index)
+
+    members: dict[int, list[int]] = {}
+    for index in best_score:
+        members.setdefault(union_find.find(index), []).append(index)
+    lowest: dict[int, float] = {}
+    for index, score in edge_scores:
+        root = union_find.find(index)
+        lowest[root] = min(lowest.get(root, 1.0), score)
+
+    clusters = []
+    for root in sorted(members):
+        indices = sorted(members[root])
+        plan_ids = [str(plans[i].get("plan_id")) for i in indices]
+        clusters.append(
+            {
+                "id": min(plan_ids),
+                "plan_ids": plan_ids,
+                "similarity": round(lowest[root], 4),
+                "scores": {plan_ids[n]: round(best_score[i], 4) for n, i in enumerate(indices)},
+            }
+        )
+    return {"clusters": clusters, "comparisons": comparisons}
+
+
+def write_near_duplicates(
+    plans: Sequence[Plan], output_dir: Path, last_updated: str | None = None
+) -> dict[str, Any]:
+    """
+    Cluster near-duplicates and write them as compact JSON to `output_dir/near-duplicates.json`.
+
+    Returns:
+        The near-duplicates document
+    """
+    result = cluster_near_duplicates(plans)
+    document = {
+        "last_updated": last_updated,
+        "version": NEAR_DUPLICATES_VERSION,
+        "tolerances": DEFAULT_TOLERANCES,
+        "total_plans": len(plans),
+        "clusters": result["clusters"],
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # A new fetch time alone does not rewrite the file
+    json_codec.dump(document, output_dir / NEAR_DUPLICATES_FILENAME, ignore_keys=("last_updated",))
+    return {**document, "comparisons": result["comparisons"]}
@@ -0,0 +1,152 @@
+"""
+Numeric field parsing for plan data.
+
+CSV cells are strings, and nearly all of them are either clean decimals
+("0.1560") or one of a few repeated literals ("0", "12", "150.0"). So each
+parser:
+
+- converts string input with float()/int() directly, and only falls back
+  to stripping currency symbols, separators and unit words when that fails.
+  float() ignores the same surrounding whitespace as str.strip(), and a
+  string it accepts contains none of the stripped characters, so both paths
+  agree wherever the fast one succeeds
+- memoizes string input in a bounded LRU (`NUMERIC_MEMO_SIZE` entries)
+
+Non-string input (numbers from the JSON API) is converted as before.
+`parse_column` parses a whole column at once with a per-column memo. The
+results are bit-identical to the cleanup-first parsers they replaced
+(`python scripts/benchmark.py numeric`).
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable, Iterable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Distinct strings remembered per parser
+NUMERIC_MEMO_SIZE = 4096
+
+# int(float(s)) loses precision beyond 15 digits, so only shorter strings
+# may take the int() fast path
+_INT_FAST_PATH_MAX_LEN = 15
+
+
+def _price_from_number(num: float) -> float:
+    # Power to Choose returns rates as decimals (e.g., 0.1600 = 16 cents)
+    # If value is less than 1, it's in dollars per kWh, convert to cents
+    if num < 1.0:
+        return num * 100
+    return num
+
+
+@functools.lru_cache(maxsize=NUMERIC_MEMO_SIZE)
+def _parse_price_text(text: str) -> float | None:
+    try:
+        return _price_from_number(float(text))
+    except ValueError:
+        pass
+    cleaned = text.strip().replace("$", "").replace(",", "").replace("%", "")
+    if not cleaned:
+        return None
+    try:
+        return _price_from_number(float(cleaned))
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=NUMERIC_MEMO_SIZE)
+def _parse_float_text(text: str) -> float | None:
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    cleaned = text.strip().replace("$", "").replace("¢", "").replace(",", "").replace("%", "")
+    try:
+        return float(cleaned) if cleaned else None
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=NUMERIC_MEMO_SIZE)
+def _parse_int_text(text: str) -> int | None:
+    if len(text) <= _INT_FAST_PATH_MAX_LEN:
+        try:
+            return int(text)
+        except ValueError:
+            pass
+    cleaned = text.strip().replace(",", "")
+    # Handle cases like "12 months"
+    cleaned = cleaned.split()[0] if cleaned else ""
+    try:
+        return int(float(cleaned)) if cleaned else None
+    except ValueError:
+        return None
+
+
+def parse_price(value: Any) -> float | None:
+    """Parse price value, handling both cents and decimal formats."""
+    if value.__class__ is str:
+        return _parse_price_text(value)
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return _price_from_number(float(value))
+    return _parse_price_text(str(value))
+
+
+def parse_float(value: Any) -> float | None:
+    """Parse a value to float, returning None if invalid."""
+    if value.__class__ is str:
+        return _parse_float_text(value)
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _parse_float_text(str(value))
+
+
+def parse_int(value: Any) -> int | None:
+    """Parse a value to int, returning None if invalid."""
+    if value.__class__ is str:
+        return _parse_int_text(value)
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        try:
+            return int(value)
+        except ValueError:  # NaN
+            return None
+    return _parse_int_text(str(value))
+
+
+def parse_column(values: Iterable[Any], parser: Callable[[Any], T]) -> list[T]:
+    """
+    Parse a whole column of values with one of the parsers above.
+
+    Each distinct string is parsed once per column (a dict lookup per
+    repeat instead of a parser call).
+
+    Args:
+        values: Column values, e.g. every row's `price_1000` cell
+        parser: parse_price, parse_float or parse_int
+
+    Returns:
+        Parsed values in input order
+    """
+    memo: dict[str, T] = {}
+    parsed = []
+    for value in values:
+        if value.__class__ is not str:
+            parsed.append(parser(value))
+            continue
+        try:
+            parsed.append(memo[value])
+        except KeyError:
+            result = memo[value] = parser(value)
+            parsed.append(result)
+    return parsed
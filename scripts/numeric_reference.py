@@ -0,0 +1,79 @@
+"""
+Reference implementations for checking numeric_fields.py.
+
+The field parsers as they were before the fast path and memo, plus inputs
+that exercise each fallback branch. Both the `numeric` benchmark and
+tests/test_numeric_fields.py compare the current parsers against these,
+type and bits included.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any
+
+
+def parse_price_cleanup_first(value: Any) -> float | None:
+    """parse_price as originally written: cleanup replaces before every conversion."""
+    if value is None:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            num = float(value)
+        else:
+            cleaned = str(value).strip().replace("$", "").replace(",", "").replace("%", "")
+            if not cleaned:
+                return None
+            num = float(cleaned)
+        if num < 1.0:
+            return num * 100
+        return num
+    except (ValueError, AttributeError):
+        return None
+
+
+def parse_float_cleanup_first(value: Any) -> float | None:
+    """parse_float as originally written."""
+    if value is None:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return float(value)
+        cleaned = (
+            str(value).strip().replace("$", "").replace("¢", "").replace(",", "").replace("%", "")
+        )
+        return float(cleaned) if cleaned else None
+    except (ValueError, AttributeError):
+        return None
+
+
+def parse_int_cleanup_first(value: Any) -> int | None:
+    """parse_int as originally written."""
+    if value is None:
+        return None
+    try:
+        if isinstance(value, int):
+            return value
+        if isinstance(value, float):
+            return int(value)
+        cleaned = str(value).strip().replace(",", "")
+        cleaned = cleaned.split()[0] if cleaned else ""
+        return int(float(cleaned)) if cleaned else None
+    except (ValueError, AttributeError):
+        return None
+
+
+# Inputs the archived CSVs rarely contain, covering each fallback branch
+NUMERIC_EDGE_CASES: tuple[Any, ...] = (
+    None, "", "  ", "0", "-0", "0.0", "0.1560", " 12 ", "1_000", "1,234.5", "$9.95", "15¢",
+    "100%", "12 months", "12.9 mo", "abc", "nan", "-1.5e3", "1e-3", "١٢", "9" * 15, "9" * 17,
+    "+7", 0, 1, True, False, 0.5, 12.0, float("nan"), -0.0,
+)  # fmt: skip
+
+
+def exact_bits(values: list[Any]) -> list[tuple[type, Any]]:
+    """Values keyed by type and exact bits, so NaN and -0.0 compare exactly."""
+    return [
+        (type(value), struct.pack("<d", value) if isinstance(value, float) else value)
+        for value in values
+    ]
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Day-over-day diff of plan snapshots.
+
+Both snapshots are indexed by `plan_id` (one dict pass each), so a diff is
+O(n) in the number of plans. Plans are classified as:
+
+- added / removed: `plan_id` only present in the newer / older snapshot
+- relisted: a removed and an added plan with the same `plan_fingerprint_key`
+  (same offer republished under a new `plan_id`)
+- repriced: any of the 500/1000/2000 kWh prices changed
+- changed: field-level changes to any other plan field
+
+Usage:
+    python scripts/plan_diff.py OLD.json NEW.json [-o changes.json]
+    python scripts/plan_diff.py --series [data/archive-store] [--json]
+    python scripts/plan_diff.py --series data/json-archive    # dated snapshot files
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import json_codec
+from archive_store import ArchiveStore
+from fetch_plans import plan_fingerprint_key
+
+CHANGES_VERSION = 1
+
+PRICE_FIELDS = ("price_kwh_500", "price_kwh_1000", "price_kwh_2000")
+
+# Fields copied into added/removed entries so consumers can show them without plans.json
+SUMMARY_FIELDS = ("plan_id", "rep_name", "plan_name", "tdu_area", "term_months", "price_kwh_1000")
+
+
+def plan_summary(plan: dict[str, Any]) -> dict[str, Any]:
+    """Return the identifying subset of a plan."""
+    return {field: plan.get(field) for field in SUMMARY_FIELDS}
+
+
+def diff_plan_fields(old: dict[str, Any], new: dict[str, Any]) -> dict[str, list[Any]]:
+    """
+    Compare two versions of a plan field by field.
+
+    Returns:
+        {field: [old value, new value]} for every field that differs (a field
+        missing on one side is reported as null)
+    """
+    changes = {}
+    for field in old.keys() | new.keys():
+        old_value = old.get(field)
+        new_value = new.get(field)
+        if old_value != new_value:
+            changes[field] = [old_value, new_value]
+    return dict(sorted(changes.items()))
+
+
+def snapshot_info(data: dict[str, Any]) -> dict[str, Any]:
+    return {"last_updated": data.get("last_updated"), "total_plans": len(data.get("plans", []))}
+
+
+def diff_snapshots(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """
+    Diff two plans.json documents.
+
+    Args:
+        old: Older snapshot
+        new: Newer snapshot
+
+    Returns:
+        Changes document with a summary and per-category plan lists
+    """
+    old_index = {plan["plan_id"]: plan for plan in old.get("plans", [])}
+    new_index = {plan["plan_id"]: plan for plan in new.get("plans", [])}
+
+    removed_ids = [plan_id for plan_id in old_index if plan_id not in new_index]
+    added_ids = [plan_id for plan_id in new_index if plan_id not in old_index]
+
+    # Pair removed/added plans that are the same offer under a new plan_id
+    removed_by_fingerprint: dict[tuple[Any, ...], list[str]] = {}
+    for plan_id in removed_ids:
+        fingerprint = plan_fingerprint_key(old_index[plan_id])
+        removed_by_fingerprint.setdefault(fingerprint, []).append(plan_id)
+
+    relisted = []
+    relisted_old_ids = set()
+    added = []
+    for plan_id in added_ids:
+        candidates = removed_by_fingerprint.get(plan_fingerprint_key(new_index[plan_id]))
+        if candidates:
+            old_id = candidates.pop(0)
+            relisted_old_ids.add(old_id)
+            relisted.append({**plan_summary(new_index[plan_id]), "previous_plan_id": old_id})
+        else:
+            added.append(plan_summary(new_index[plan_id]))
+    removed = [plan_summary(old_index[i]) for i in removed_ids if i not in relisted_old_ids]
+
+    repriced = []
+    changed = []
+    unchanged = 0
+    for plan_id, new_plan in new_index.items():
+        old_plan = old_index.get(plan_id)
+        if old_plan is None:
+            continue
+        if old_plan == new_plan:
+            unchanged += 1
+            continue
+
+        fields = diff_plan_fields(old_plan, new_plan)
+        prices = {field: fields.pop(field) for field in PRICE_FIELDS if field in fields}
+        if prices:
+            repriced.append(
+                {
+                    "plan_id": plan_id,
+                    "rep_name": new_plan.get("rep_name"),
+                    "tdu_area": new_plan.get("tdu_area"),
+                    **prices,
+                }
+            )
+        if fields:
+            changed.append({"plan_id": plan_id, "fields": fields})
+
+    return {
+        "version": CHANGES_VERSION,
+        "from": snapshot_info(old),
+        "to": snapshot_info(new),
+        "summary": {
+            "added": len(added),
+            "removed": len(removed),
+            "relisted": len(relisted),
+            "repriced": len(repriced),
+            "changed": len(changed),
+            "unchanged": unchanged,
+        },
+        "added": added,
+        "removed": removed,
+        "relisted": relisted,
+        "repriced": repriced,
+        "changed": changed,
+    }
+
+
+def load_snapshot(path: Path) -> dict[str, Any]:
+    """Load a plans.json document."""
+    data: dict[str, Any] = json_codec.load(path)
+    return data
+
+
+def iter_series_snapshots(source: Path) -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+    Load archived snapshots one at a time, oldest first.
+
+    Args:
+        source: Archive store (data/archive-store, or its days/ directory) or
+            a directory of dated plans_YYYY-MM-DD.json files
+
+    Yields:
+        Tuples of (snapshot file name, plans.json document)
+    """
+    root = (
+        source.parent if source.name == "days" and (source.parent / "objects").is_dir() else source
+    )
+    if (root / "days").is_dir():
+        # Day manifests only hold record hashes; the store reassembles each document
+        store = ArchiveStore(root)
+        for day in store.days():
+            yield store.day_path(day).name, store.load_snapshot(day)
+        return
+    for path in sorted(source.glob("plans_*.json")):
+        yield path.name, load_snapshot(path)
+
+
+def iter_series_diffs(source: Path) -> Iterator[tuple[str, str, dict[str, Any]]]:
+    """
+    Diff consecutive archived snapshots, holding at most two in memory.
+
+    Args:
+        source: Archive store or directory of dated files (see iter_series_snapshots)
+
+    Yields:
+        Tuples of (older file name, newer file name, changes document)
+    """
+    previous: tuple[str, dict[str, Any]] | None = None
+    for name, current in iter_series_snapshots(source):
+        if previous is not None:
+            yield previous[0], name, diff_snapshots(previous[1], current)
+        previous = (name, current)
+
+
+def write_changes(changes: dict[str, Any], output_path: Path) -> None:
+    """Write a changes document in compact form."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    json_codec.dump(changes, output_path)
+
+
+def format_summary(summary: dict[str, int]) -> str:
+    return "  ".join(f"{key} {value:>5}" for key, value in summary.items())
+
+
+def main() -> int:
+    """
+    Main entry point.
+
+    Returns:
+        Exit code (0 for success, 1 for error)
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("snapshots", nargs="*", type=Path, help="OLD.json NEW.json")
+    parser.add_argument(
+        "--series",
+        type=Path,
+        nargs="?",
+        const=Path(os.environ.get("ARCHIVE_STORE_DIR", "data/archive-store")),
+        help="Diff every consecutive archived day (archive store or dated files; default: the store)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print full diffs as JSON lines")
+    parser.add_argument("-o", "--output", type=Path, help="Write the changes document here")
+    args = parser.parse_args()
+
+    try:
+        if args.series:
+            for old_name, new_name, changes in iter_series_diffs(args.series):
+                if args.json:
+                    print(json.dumps(changes, ensure_ascii=False, separators=(",", ":")))
+                else:
+                    print(f"{old_name} -> {new_name}  {format_summary(changes['summary'])}")
+            return 0
+
+        if len(args.snapshots) != 2:
+            parser.error("expected OLD.json NEW.json (or --series [DIR])")
+        changes = diff_snapshots(load_snapshot(args.snapshots[0]), load_snapshot(args.snapshots[1]))
+    except (OSError, json.JSONDecodeError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.output:
+        write_changes(changes, args.output)
+    if args.json or not args.output:
+        print(json.dumps(changes, indent=2, ensure_ascii=False))
+    else:
+        print(format_summary(changes["summary"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Compact in-memory plan record.
+
+Between parsing and serialization, a plan used to be a 22-key dict with its
+own hash table (about 830 bytes before its values). `PlanRecord` holds the
+same fields in `__slots__` (about 220 bytes), and interns the few strings
+shared by thousands of plans (`rep_name`, `tdu_area`, `rate_type`,
+`language`), so reprocessing the whole archive keeps one copy of each
+(`python scripts/benchmark.py plan-record`).
+
+Records are read-only `Mapping`s over their fields (plus item assignment,
+used by EFL enrichment to set `etf_details`), so the stages that take plans
+(enrichment, dedup, rankings, near-duplicate clustering, the cost engine)
+accept records and plain dicts alike. A record compares equal to any mapping
+with the same items, so `record == record.to_dict()`. Convert at the edges: `to_dict()` for
+JSON output (same keys, in the same order, as the parser's dicts) and
+`to_model()` for an `ElectricityPlan`.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Any, ClassVar, TypeAlias
+
+if TYPE_CHECKING:
+    from models import ElectricityPlan
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if value.__class__ is str else value
+
+
+@dataclass(slots=True, eq=False)
+class PlanRecord(Mapping[str, Any]):
+    """One parsed plan; fields are in the key order of plans.json."""
+
+    plan_id: str
+    rep_name: str
+    plan_name: str
+    tdu_area: str
+    # Prices at standard usage levels (in cents per kWh)
+    price_kwh_500: float | None
+    price_kwh_1000: float | None
+    price_kwh_2000: float | None
+    # Plan details
+    term_months: int | None
+    rate_type: str
+    renewable_pct: int | None
+    is_prepaid: bool
+    is_tou: bool
+    # Fees
+    early_termination_fee: float | None
+    base_charge_monthly: float | None
+    # URLs
+    efl_url: str
+    enrollment_url: str
+    terms_url: str
+    # Special features
+    special_terms: str
+    promotion_details: str
+    fees_credits: str
+    min_usage_fees: str
+    language: str
+    # Set by EFL enrichment; omitted from to_dict() while None
+    etf_details: dict[str, Any] | None = None
+
+    FIELDS: ClassVar[tuple[str, ...]]
+    # Membership index for the mapping methods (FIELDS keeps the key order)
+    _FIELD_SET: ClassVar[frozenset[str]]
+
+    def __post_init__(self) -> None:
+        self.rep_name = _intern(self.rep_name)
+        self.tdu_area = _intern(self.tdu_area)
+        self.rate_type = _intern(self.rate_type)
+        self.language = _intern(self.language)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field like `dict.get` (unset `etf_details` counts as missing)."""
+        if key not in self._FIELD_SET:
+            return default
+        value = getattr(self, key)
+        return default if value is None and key == "etf_details" else value
+
+    def __getitem__(self, key: str) -> Any:
+        # Only fields are keys: methods and class attributes are not
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._FIELD_SET and (key != "etf_details" or self.etf_details is not None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS if self.etf_details is not None else self.FIELDS[:-1])
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) - (self.etf_details is None)
+
+    def __eq__(self, other: object) -> bool:
+        # Mapping equality (as for dicts), so records and parsed dicts compare equal
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.to_dict() == dict(other)
+
+    @classmethod
+    def from_dict(cls, plan: Mapping[str, Any]) -> PlanRecord:
+        """Build a record from a parsed plan dict (missing fields default to None)."""
+        values: list[Any] = [plan.get(name) for name in cls.FIELDS]
+        return cls(*values)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the plan as the parser's dict (as serialized to plans.json)."""
+        plan = {name: getattr(self, name) for name in self.FIELDS}
+        if plan["etf_details"] is None:
+            del plan["etf_details"]
+        return plan
+
+    def to_model(self) -> ElectricityPlan:
+        """Validate the record as an `ElectricityPlan` (raises pydantic's ValidationError)."""
+        from models import ElectricityPlan
+
+        return ElectricityPlan.model_validate(self.to_dict())
+
+
+PlanRecord.FIELDS = tuple(field.name for field in fields(PlanRecord))
+PlanRecord._FIELD_SET = frozenset(PlanRecord.FIELDS)
+
+
+# A plan as handled by the pipeline stages: a parsed record, or a dict (JSON API, tests)
+Plan: TypeAlias = PlanRecord | dict[str, Any]
+
+
+def plans_as_dicts(plans: Iterable[Plan]) -> list[dict[str, Any]]:
+    """Return plans as dicts for serialization (dicts are passed through)."""
+    return [plan.to_dict() if isinstance(plan, PlanRecord) else plan for plan in plans]
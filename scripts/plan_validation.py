@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Bulk schema validation of plan data against `models.ElectricityPlan`.
+
+The whole plans list is validated in one call through a cached
+`TypeAdapter(list[ElectricityPlan])` (straight from JSON bytes for files),
+so pydantic's core validator runs once over the list instead of building one
+model per plan from Python. Errors are collected for every row and grouped
+into per-plan reports instead of stopping at the first bad row:
+
+    {"index": 12, "plan_id": "34567",
+     "errors": [{"field": "price_kwh_500", "type": "float_parsing", "message": ...}]}
+
+Usage:
+    python scripts/plan_validation.py data/plans.json [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import sys
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from models import ElectricityPlan
+from plan_record import Plan
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+class _PlansFile(BaseModel):
+    """The part of a plans.json document that is validated (other keys are ignored)."""
+
+    plans: list[ElectricityPlan]
+
+
+@dataclass
+class ValidationResult:
+    """Outcome of validating a plans list."""
+
+    total: int
+    reports: list[dict[str, Any]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def invalid_indices(self) -> set[int]:
+        return {report["index"] for report in self.reports}
+
+    @property
+    def valid(self) -> int:
+        return self.total - len(self.reports)
+
+    @property
+    def plans_per_second(self) -> float:
+        return self.total / self.seconds if self.seconds else float("inf")
+
+
+@functools.cache
+def plans_adapter() -> TypeAdapter[list[ElectricityPlan]]:
+    """Return the shared list validator (its core schema is built once, on first use)."""
+    return TypeAdapter(list[ElectricityPlan])
+
+
+@functools.cache
+def plans_file_adapter() -> TypeAdapter[_PlansFile]:
+    """Return the shared validator for whole plans.json documents."""
+    return TypeAdapter(_PlansFile)
+
+
+def error_reports(
+    error: ValidationError, plans: Sequence[Plan] | None = None, loc_offset: int = 0
+) -> list[dict[str, Any]]:
+    """
+    Group a list validation error into one report per invalid plan.
+
+    Args:
+        error: Error raised by validating a list of plans
+        plans: The validated plans, used to look up each report's plan_id
+        loc_offset: Number of leading `loc` entries before the list index
+
+    Returns:
+        Reports ordered by plan index
+    """
+    by_index: dict[int, list[dict[str, Any]]] = {}
+    for detail in error.errors(include_url=False, include_input=False):
+        loc = detail["loc"][loc_offset:]
+        index = loc[0] if loc and isinstance(loc[0], int) else -1
+        by_index.setdefault(index, []).append(
+            {
+                "field": ".".join(str(part) for part in loc[1:]) or None,
+                "type": detail["type"],
+                "message": detail["msg"],
+            }
+        )
+
+    reports = []
+    for index, errors in sorted(by_index.items()):
+        plan_id = None
+        if plans is not None and 0 <= index < len(plans) and isinstance(plans[index], Mapping):
+            plan_id = plans[index].get("plan_id")
+        reports.append({"index": index, "plan_id": plan_id, "errors": errors})
+    return reports
+
+
+def validate_plans(plans: Sequence[Plan]) -> ValidationResult:
+    """
+    Validate parsed plan dicts in one call.
+
+    Args:
+        plans: Plans as produced by the parser (records or dicts)
+
+    Returns:
+        Validation result with one report per invalid plan
+    """
+    start = time.perf_counter()
+    try:
+        plans_adapter().validate_python(plans)
+        reports = []
+    except ValidationError as e:
+        reports = error_reports(e, plans)
+    return ValidationResult(len(plans), reports, time.perf_counter() - start)
+
+
+def validate_plans_json(payload: bytes | str) -> ValidationResult:
+    """
+    Validate a serialized plans.json document straight from JSON.
+
+    Args:
+        payload: plans.json contents
+
+    Returns:
+        Validation result with one report per invalid plan
+
+    Raises:
+        ValueError: If the payload is not a JSON object with a `plans` list
+    """
+    start = time.perf_counter()
+    try:
+        document = plans_file_adapter().validate_json(payload)
+        return ValidationResult(len(document.plans), [], time.perf_counter() - start)
+    except ValidationError as e:
+        details = e.errors(include_url=False)
+        if any(detail["loc"][:1] != ("plans",) or len(detail["loc"]) < 2 for detail in details):
+            raise ValueError(f"Not a plans document: {details[0]['msg']}") from e
+        plans = json.loads(payload)["plans"]
+        reports = error_reports(e, plans, loc_offset=1)
+        return ValidationResult(len(plans), reports, time.perf_counter() - start)
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Format one plan's report as a single line."""
+    errors = "; ".join(f"{error['field']}: {error['message']}" for error in report["errors"])
+    return f"plan {report['plan_id']} (row {report['index']}): {errors}"
+
+
+def main() -> int:
+    """
+    Main entry point.
+
+    Returns:
+        Exit code (0 if every plan is valid, 1 otherwise)
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("path", type=Path, help="plans.json document to validate")
+    parser.add_argument("--json", action="store_true", help="Print the reports as JSON")
+    args = parser.parse_args()
+
+    try:
+        result = validate_plans_json(args.path.read_bytes())
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(result.reports, ensure_ascii=False, indent=2))
+    else:
+        for report in result.reports:
+            print(format_report(report))
+        print(
+            f"{result.valid}/{result.total} plans valid"
+            f" ({result.seconds * 1000:.1f} ms, {result.plans_per_second:,.0f} plans/s)"
+        )
+    return 0 if not result.reports else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Price history index over the archived plan snapshots.
+
+Keeps the per-day price fields of every plan in a SQLite database
+(`data/price-history.sqlite3`), so trend and alert queries don't have to
+re-read every archived snapshot:
+
+- `prices`: one row per (plan_id, day), a WITHOUT ROWID table clustered on
+  that key, so a plan's history is a single range scan
+- index `prices_tdu_day` on (tdu_area, day) for per-TDU daily aggregates
+- `days`: snapshots already ingested, so `update` only loads new days
+
+The database is derived data and is not committed: `update` rebuilds it
+from `data/archive-store/` in a few seconds (the update workflow uploads
+it as a build artifact).
+
+Usage:
+    python scripts/price_history.py update [--store data/archive-store]
+    python scripts/price_history.py update --archive data/json-archive
+    python scripts/price_history.py add data/plans.json --day 2026-01-29
+    python scripts/price_history.py plan PLAN_ID
+    python scripts/price_history.py median [--field price_kwh_1000] [--tdu ONCOR]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+import statistics
+import sys
+from collections.abc import Iterable
+from itertools import groupby
+from pathlib import Path
+from typing import Any
+
+import json_codec
+from archive_store import ArchiveStore
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+DAY_FILE_PATTERN = re.compile(r"^plans_(\d{4}-\d{2}-\d{2})\.json$")
+
+# Plan fields tracked per day (also the only fields `median` accepts)
+PRICE_FIELDS: tuple[str, ...] = (
+    "price_kwh_500",
+    "price_kwh_1000",
+    "price_kwh_2000",
+    "early_termination_fee",
+    "base_charge_monthly",
+)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS prices (
+    plan_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    tdu_area TEXT,
+    rep_name TEXT,
+    {", ".join(f"{field} REAL" for field in PRICE_FIELDS)},
+    PRIMARY KEY (plan_id, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS prices_tdu_day ON prices (tdu_area, day);
+CREATE TABLE IF NOT EXISTS days (
+    day TEXT PRIMARY KEY,
+    last_updated TEXT,
+    total_plans INTEGER NOT NULL
+);
+"""
+
+
+def open_history(db_path: Path) -> sqlite3.Connection:
+    """
+    Open (creating if needed) the price history database.
+
+    Raises:
+        ValueError: If the database has an unknown schema version
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version not in (0, SCHEMA_VERSION):
+        conn.close()
+        raise ValueError(f"Unsupported price history schema version {version}")
+    conn.executescript(SCHEMA)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def ingest_snapshot(conn: sqlite3.Connection, day: str, data: dict[str, Any]) -> int:
+    """
+    Store (or replace) one day's prices.
+
+    Args:
+        conn: Open history database
+        day: Snapshot date (YYYY-MM-DD)
+        data: plans.json document
+
+    Returns:
+        Number of plans stored
+    """
+    plans = data.get("plans", [])
+    rows = [
+        (
+            plan["plan_id"],
+            day,
+            plan.get("tdu_area"),
+            plan.get("rep_name"),
+            *(plan.get(field) for field in PRICE_FIELDS),
+        )
+        for plan in plans
+    ]
+    placeholders = ", ".join("?" * (4 + len(PRICE_FIELDS)))
+    with conn:
+        conn.execute("DELETE FROM prices WHERE day = ?", (day,))
+        conn.executemany(f"INSERT OR REPLACE INTO prices VALUES ({placeholders})", rows)
+        conn.execute(
+            "INSERT OR REPLACE INTO days VALUES (?, ?, ?)",
+            (day, data.get("last_updated"), len(plans)),
+        )
+    return len(plans)
+
+
+def ingested_days(conn: sqlite3.Connection) -> set[str]:
+    return {row[0] for row in conn.execute("SELECT day FROM days")}
+
+
+def update_from_archive(conn: sqlite3.Connection, archive_dir: Path) -> list[str]:
+    """
+    Ingest archived snapshots whose day is not in the database yet.
+
+    Returns:
+        Days that were added
+    """
+    known = ingested_days(conn)
+    added = []
+    for path in sorted(archive_dir.glob("plans_*.json")):
+        match = DAY_FILE_PATTERN.match(path.name)
+        if not match or match.group(1) in known:
+            continue
+        count = ingest_snapshot(conn, match.group(1), json_codec.load(path))
+        logger.info("Indexed %s (%d plans)", path.name, count)
+        added.append(match.group(1))
+    return added
+
+
+def update_from_store(conn: sqlite3.Connection, store: ArchiveStore) -> list[str]:
+    """
+    Ingest the archive store's days that are not in the database yet.
+
+    Returns:
+        Days that were added
+    """
+    known = ingested_days(conn)
+    added = []
+    for day in store.days():
+        if day in known:
+            continue
+        count = ingest_snapshot(conn, day, store.load_snapshot(day))
+        logger.info("Indexed %s (%d plans)", day, count)
+        added.append(day)
+    return added
+
+
+def plan_history(conn: sqlite3.Connection, plan_id: str) -> list[dict[str, Any]]:
+    """Return a plan's tracked prices per day, oldest first."""
+    rows = conn.execute(
+        f"SELECT day, {', '.join(PRICE_FIELDS)} FROM prices WHERE plan_id = ? ORDER BY day",
+        (plan_id,),
+    )
+    return [dict(row) for row in rows]
+
+
+def median_by_tdu(
+    conn: sqlite3.Connection, field: str = "price_kwh_1000", tdu_area: str | None = None
+) -> list[dict[str, Any]]:
+    """
+    Median of a price field per TDU per day.
+
+    SQLite has no median aggregate, so rows are streamed in (tdu_area, day)
+    index order and grouped here.
+
+    Args:
+        conn: Open history database
+        field: One of PRICE_FIELDS
+        tdu_area: Restrict to one TDU
+
+    Returns:
+        Rows of {"tdu_area", "day", "median", "plans"} in TDU, day order
+
+    Raises:
+        ValueError: If the field is not tracked
+    """
+    if field not in PRICE_FIELDS:
+        raise ValueError(f"Unknown price field: {field}")
+
+    query = f"SELECT tdu_area, day, {field} FROM prices WHERE {field} IS NOT NULL"
+    params: tuple[str, ...] = ()
+    if tdu_area:
+        query += " AND tdu_area = ?"
+        params = (tdu_area,)
+    rows: Iterable[sqlite3.Row] = conn.execute(query + " ORDER BY tdu_area, day", params)
+
+    results = []
+    for (tdu, day), group in groupby(rows, key=lambda row: (row[0], row[1])):
+        values = [row[2] for row in group]
+        results.append(
+            {"tdu_area": tdu, "day": day, "median": statistics.median(values), "plans": len(values)}
+        )
+    return results
+
+
+def main() -> int:
+    """
+    Main entry point.
+
+    Returns:
+        Exit code (0 for success, 1 for error)
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=Path(os.environ.get("PRICE_HISTORY_DB", "data/price-history.sqlite3")),
+        help="History database",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    update = commands.add_parser("update", help="Index archived days not yet in the database")
+    source = update.add_mutually_exclusive_group()
+    source.add_argument(
+        "--store",
+        type=Path,
+        default=Path(os.environ.get("ARCHIVE_STORE_DIR", "data/archive-store")),
+        help="Archive store to index (default)",
+    )
+    source.add_argument("--archive", type=Path, help="Directory of dated snapshot files instead")
+
+    add = commands.add_parser("add", help="Index one snapshot file")
+    add.add_argument("path", type=Path)
+    add.add_argument("--day", required=True)
+
+    plan = commands.add_parser("plan", help="Price history of one plan")
+    plan.add_argument("plan_id")
+
+    median = commands.add_parser("median", help="Median price per TDU per day")
+    median.add_argument("--field", default="price_kwh_1000", choices=PRICE_FIELDS)
+    median.add_argument("--tdu")
+
+    args = parser.parse_args()
+
+    try:
+        conn = open_history(args.db)
+        try:
+            if args.command == "update":
+                if args.archive is not None:
+                    added = update_from_archive(conn, args.archive)
+                else:
+                    added = update_from_store(conn, ArchiveStore(args.store))
+                logger.info("Added %d day(s); %d indexed", len(added), len(ingested_days(conn)))
+            elif args.command == "add":
+                with args.path.open(encoding="utf-8") as f:
+                    count = ingest_snapshot(conn, args.day, json.load(f))
+                logger.info("Indexed %d plans for %s", count, args.day)
+            elif args.command == "plan":
+                for row in plan_history(conn, args.plan_id):
+                    print(json.dumps(row))
+            else:
+                for row in median_by_tdu(conn, args.field, args.tdu):
+                    print(
+                        f"{row['day']}  {row['tdu_area']:<28} {row['median']:>8.3f}  ({row['plans']})"
+                    )
+        finally:
+            conn.close()
+    except (OSError, json.JSONDecodeError, KeyError, ValueError, sqlite3.Error) as e:
+        logger.error("%s failed: %s", args.command, e)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    sys.exit(main())
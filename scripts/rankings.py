@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Precomputed plan rankings for the canonical usage profiles.
+
+Most visitors pick one of the home-size presets on the page, so the page's
+ranking (`PlanRanker.rankPlans` in `src/ts/modules/plan-ranker.ts`) is run
+once per fetch for those profiles and its top plans are written to
+`data/rankings.json`:
+
+    rankings[tdu_area][profile][term_bucket] = [[plan_id, annual_cost], ...]
+    best_annual_cost[tdu_area][profile] = cheapest annual cost of any plan
+
+- profiles: the page's home-size presets (plus 500/1000/1500/2000 kWh),
+  expanded to 12 months with the seasonal pattern of `usage-estimator.ts`
+- term buckets: the page's term filter (`all`, `short` 3-6, `medium` 12,
+  `long` 24+ months); each bucket lists its first `top_n` plans of the
+  TDU-wide ranking, which is what the page shows for that filter
+- order: the page's combined score of cost and quality (volatility,
+  warnings, early termination fee, base charge), over every deduplicated
+  plan of the TDU, with no local tax and no contract start date
+
+Local tax multiplies every monthly bill by the same factor, so it changes
+neither the quality scores nor the order. The page uses the lookup for
+preset usage and ranks client-side for custom usage.
+
+Usage:
+    python scripts/rankings.py [data/plans.json] [-o data/rankings.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import json_codec
+import numpy as np
+from cost_engine import PlanArrays, annual_costs, parse_bill_credit
+
+if TYPE_CHECKING:
+    from plan_record import Plan
+
+RANKINGS_VERSION = 2
+RANKINGS_FILENAME = "rankings.json"
+DEFAULT_TOP_N = 10
+
+# Same values as SEASONAL_MULTIPLIERS in src/ts/modules/usage-estimator.ts
+SEASONAL_MULTIPLIERS: tuple[float, ...] = (
+    1.2,
+    1.1,
+    1.0,
+    0.95,
+    1.0,
+    1.4,
+    1.7,
+    1.8,
+    1.5,
+    1.0,
+    0.95,
+    1.2,
+)
+
+# Home-size presets from src/index.html, plus the EFL reference usage levels
+CANONICAL_AVERAGE_USAGE: tuple[int, ...] = (400, 500, 600, 800, 1000, 1200, 1500, 2000, 2500)
+
+# Term filter of the results page: bucket -> (min months, max months)
+TERM_BUCKETS: dict[str, tuple[int, int | None]] = {
+    "all": (0, None),
+    "short": (3, 6),
+    "medium": (12, 12),
+    "long": (24, None),
+}
+
+
+# ETFCalculator.calculateEarlyTerminationFee text patterns (src/ts/modules/etf-calculator.ts)
+NO_FEE_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"no\s+(?:early\s+)?(?:termination|cancellation)\s+fee",
+        r"no\s+cancel(?:lation)?\s+fee",
+        r"no\s+etf\b",
+        r"without\s+(?:an?\s+)?early\s+termination\s+fee",
+        r"(?:termination|cancellation)\s+fee\s*(?:is|of)?\s*\$?0\b",
+        r"fee\s+waived",
+        r"waiv(?:e|ed)\s+(?:the\s+)?(?:termination|cancellation)\s+fee",
+    )
+)
+PER_MONTH_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"\$(\d+(?:\.\d{2})?)\s*(?:per|/)\s*(?:each\s+)?(?:month|mo)(?:nth)?\s*"
+        r"(?:remaining|left|of\s+(?:the\s+)?(?:contract|term))",
+        r"\$(\d+(?:\.\d{2})?)\s*(?:times|x|\u00d7|\*)\s*(?:the\s+)?(?:number\s+of\s+)?"
+        r"(?:remaining\s+)?months?\s*(?:remaining|left)?",
+        r"\$(\d+(?:\.\d{2})?)\s+multiplied\s+by\s+(?:the\s+)?(?:number\s+of\s+)?months?\s+remaining",
+    )
+)
+PER_MONTH_PHRASES = ("per remaining month", "per month remaining", "each remaining month")
+FIXED_FEE_PATTERN = re.compile(
+    r"(?:early\s+termination|termination|cancellation)\s+(?:fee|charge)\s*(?:is|of|:)?\s*"
+    r"\$?(\d+(?:\.\d{2})?)",
+    re.IGNORECASE,
+)
+
+
+def _js_round(value: float) -> int:
+    """Round half up like JavaScript's Math.round (Python's round() is half-even)."""
+    return math.floor(value + 0.5)
+
+
+def estimate_usage_pattern(avg_monthly_kwh: float) -> list[int]:
+    """
+    Expand an average monthly usage into 12 seasonal months.
+
+    Port of `UsageEstimator.estimateUsagePattern`: months are scaled by the
+    seasonal multipliers and the largest month absorbs the rounding error, so
+    the year totals exactly 12 x the average.
+    """
+    if not math.isfinite(avg_monthly_kwh) or avg_monthly_kwh <= 0:
+        avg_monthly_kwh = 1000
+
+    adjustment = 12 / sum(SEASONAL_MULTIPLIERS)
+    usage = [_js_round(avg_monthly_kwh * m * adjustment) for m in SEASONAL_MULTIPLIERS]
+
+    difference = _js_round(avg_monthly_kwh * 12) - sum(usage)
+    if difference:
+        usage[usage.index(max(usage))] += difference
+    return usage
+
+
+def _js_ratio(numerator: float, denominator: float) -> float:
+    """Divide like JavaScript: x / 0 is Infinity (NaN for 0 / 0) instead of an error."""
+    if denominator == 0:
+        return math.nan if numerator == 0 else math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+
+def _number(value: Any) -> float:
+    """A plan field in JavaScript arithmetic (null counts as 0)."""
+    return 0.0 if value is None else float(value)
+
+
+def early_termination_fee(plan: Plan, months_remaining: int) -> float:
+    """
+    Fee for cancelling with `months_remaining` months left.
+
+    Port of the `total` of `ETFCalculator.calculateEarlyTerminationFee`:
+    structured `etf_details` first, then the fee language of the plan's
+    terms, then `early_termination_fee`. Unknown fees count as 0.
+    """
+    details: Any = plan.get("etf_details")
+    if isinstance(details, str):
+        try:
+            details = json.loads(details)
+        except ValueError:
+            details = None
+    structure = str(details.get("structure") or "").lower() if isinstance(details, dict) else ""
+    if structure:
+        base_amount = _number(details.get("base_amount"))
+        if structure in ("none", "unknown"):
+            return 0.0
+        if structure == "flat" and math.isfinite(base_amount):
+            return base_amount
+        if structure == "per-month-remaining" and math.isfinite(base_amount):
+            return base_amount * months_remaining
+        if structure == "per-month":
+            return 0.0
+
+    sources = [
+        plan.get(field)
+        for field in ("special_terms", "fees_credits", "promotion_details", "min_usage_fees")
+    ]
+    text = " | ".join(source for source in sources if source is not None)
+    planned_etf = plan.get("early_termination_fee")
+    fee = 0.0
+    per_month_rate = 0.0
+    if text:
+        terms = re.sub(r"\s+", " ", text.lower()).strip()
+        if any(pattern.search(terms) for pattern in NO_FEE_PATTERNS):
+            return 0.0
+        for pattern in PER_MONTH_PATTERNS:
+            if match := pattern.search(terms):
+                per_month_rate = float(match.group(1))
+                if per_month_rate > 0:
+                    break
+        if per_month_rate == 0 and any(phrase in terms for phrase in PER_MONTH_PHRASES):
+            if 0 < _number(planned_etf) <= 50:
+                per_month_rate = _number(planned_etf)
+        if per_month_rate == 0 and planned_etf is None:
+            if match := FIXED_FEE_PATTERN.search(terms):
+                fee = float(match.group(1))
+
+    if per_month_rate > 0:
+        return per_month_rate * months_remaining
+
+    if fee == 0:
+        fee = _number(planned_etf)
+    if not (math.isfinite(fee) and fee > 0):
+        return 0.0
+    # Small fees on long contracts are treated as unknown
+    if fee <= 50 and (plan.get("term_months") or 0) >= 12 and not plan.get("is_prepaid"):
+        return 0.0
+    return fee
+
+
+def missed_credit_months(plan: Plan, usage: Sequence[int]) -> int:
+    """Months of `usage` that earn no bill credit (`calculateBillCredits` returns 0)."""
+    credit = parse_bill_credit(plan.get("special_terms"))
+    if credit is None or credit[0] == 0:
+        return len(usage)
+    _, min_kwh, max_kwh = credit
+    return sum(1 for kwh in usage if not min_kwh <= kwh <= max_kwh)
+
+
+def quality_score(
+    plan: Plan, annual_cost: float, best_annual_cost: float, usage: Sequence[int]
+) -> int:
+    """
+    Quality score (0-100) of a plan, as `PlanRanker.calculateQualityScore`.
+
+    Covers the penalties that apply without a contract start date: cost
+    against the best plan, volatility, warnings and base charge.
+    Non-fixed, prepaid and time-of-use plans score 0 (an automatic F).
+    """
+    if plan.get("rate_type") != "FIXED" or plan.get("is_prepaid") or plan.get("is_tou"):
+        return 0
+
+    score = 100
+    if annual_cost > best_annual_cost > 0:
+        cost_diff = (annual_cost - best_annual_cost) / best_annual_cost
+        score -= min(40, _js_round(cost_diff * 100))
+
+    special_terms = plan.get("special_terms")
+    has_credit = special_terms is not None and "credit" in special_terms
+    missed = missed_credit_months(plan, usage) if has_credit else 0
+
+    # calculateVolatility
+    rate_500 = _number(plan.get("price_kwh_500"))
+    rate_1000 = _number(plan.get("price_kwh_1000"))
+    rate_2000 = _number(plan.get("price_kwh_2000"))
+    volatility = 0.5 + (missed / 12) * 0.3 if has_credit else 0.0
+    low_ratio = _js_ratio(abs(rate_500 - rate_1000), rate_1000)
+    high_ratio = _js_ratio(abs(rate_2000 - rate_1000), rate_1000)
+    variance = (
+        math.nan if math.isnan(low_ratio) or math.isnan(high_ratio) else max(low_ratio, high_ratio)
+    )
+    if variance > 0.3:
+        volatility += variance * 0.5
+    score -= _js_round(min(volatility, 1.0) * 25)
+
+    # identifyWarnings
+    warnings = 0
+    if has_credit and missed > 0:
+        warnings += 1
+    if _number(plan.get("early_termination_fee")) > 0 or special_terms is not None:
+        term = plan.get("term_months")
+        midpoint = math.floor((12 if term is None else term) / 2)
+        if early_termination_fee(plan, midpoint) > 200:
+            warnings += 1
+    if low_ratio > 0.5:
+        warnings += 1
+    score -= min(25, warnings * 5)
+
+    base_charge = _number(plan.get("base_charge_monthly"))
+    if base_charge > 15:
+        score -= min(5, _js_round((base_charge - 15) / 3))
+
+    return max(0, min(100, score))
+
+
+def rank_order(plans: Sequence[Plan], costs: Sequence[float], usage: Sequence[int]) -> list[int]:
+    """
+    Order plans as `PlanRanker.rankPlans` does for one TDU and usage profile.
+
+    Args:
+        plans: Every plan the page ranks together (one TDU)
+        costs: Annual cost of each plan for `usage`
+        usage: The 12-month usage profile
+
+    Returns:
+        Plan indices, best combined score first (ties keep their input order)
+    """
+    best = min(costs)
+    cost_range = (max(costs) - best) or 1
+
+    combined = []
+    for plan, cost in zip(plans, costs, strict=True):
+        quality = quality_score(plan, cost, best, usage)
+        cost_score = 100 - ((cost - best) / cost_range) * 100
+        score = cost_score * (max(1, quality) / 100)
+        if quality < 60:
+            score = quality - 1000 + cost_score * 0.1
+        elif quality < 70:
+            score -= 10
+        combined.append(score)
+
+    return sorted(range(len(plans)), key=lambda index: -combined[index])
+
+
+def in_term_bucket(term_months: int | None, bucket: str) -> bool:
+    minimum, maximum = TERM_BUCKETS[bucket]
+    term = term_months or 0
+    return term >= minimum and (maximum is None or term <= maximum)
+
+
+def build_rankings(
+    plans: Sequence[Plan],
+    top_n: int = DEFAULT_TOP_N,
+    average_usage: Sequence[int] = CANONICAL_AVERAGE_USAGE,
+) -> dict[str, Any]:
+    """
+    Rank plans for every (TDU, canonical profile, term bucket).
+
+    Args:
+        plans: Deduplicated plans (as the page ranks them)
+        top_n: Plans kept per combination
+        average_usage: Average monthly kWh of each canonical profile
+
+    Returns:
+        Rankings document (see module docstring)
+    """
+    profiles = {str(avg): estimate_usage_pattern(avg) for avg in average_usage}
+    arrays = PlanArrays.from_plans(plans)
+    costs = annual_costs(np.array(list(profiles.values()), dtype=np.float64), arrays)
+
+    by_tdu: dict[str, list[int]] = {}
+    for index, plan in enumerate(plans):
+        by_tdu.setdefault(plan.get("tdu_area") or "UNKNOWN", []).append(index)
+
+    rankings: dict[str, dict[str, dict[str, list[list[Any]]]]] = {}
+    best_annual_cost: dict[str, dict[str, float]] = {}
+    for tdu_area, indices in sorted(by_tdu.items()):
+        tdu_plans = [plans[index] for index in indices]
+        for row, (profile, usage) in enumerate(profiles.items()):
+            tdu_costs = costs[row, indices].tolist()
+            best_annual_cost.setdefault(tdu_area, {})[profile] = min(tdu_costs)
+
+            buckets: dict[str, list[list[Any]]] = {}
+            for position in rank_order(tdu_plans, tdu_costs, usage):
+                plan = tdu_plans[position]
+                for bucket in TERM_BUCKETS:
+                    top = buckets.setdefault(bucket, [])
+                    if len(top) < top_n and in_term_bucket(plan.get("term_months"), bucket):
+                        top.append([plan["plan_id"], round(tdu_costs[position], 2)])
+            rankings.setdefault(tdu_area, {})[profile] = {
+                bucket: top for bucket, top in buckets.items() if top
+            }
+
+    return {
+        "version": RANKINGS_VERSION,
+        "top_n": top_n,
+        "profiles": profiles,
+        "term_buckets": {name: list(bounds) for name, bounds in TERM_BUCKETS.items()},
+        "best_annual_cost": best_annual_cost,
+        "rankings": rankings,
+    }
+
+
+def write_rankings(
+    plans: Sequence[Plan], output_dir: Path, last_updated: str | None = None
+) -> dict[str, Any]:
+    """
+    Build the rankings and write them as compact JSON to `output_dir/rankings.json`.
+
+    A new fetch time alone does not rewrite the file.
+
+    Returns:
+        The rankings document
+    """
+    document = {"last_updated": last_updated, **build_rankings(plans)}
+    output_dir.mkdir(parents=True, exist_ok=True)
+    json_codec.dump(document, output_dir / RANKINGS_FILENAME, ignore_keys=("last_updated",))
+    return document
+
+
+def main() -> int:
+    """
+    Main entry point.
+
+    Returns:
+        Exit code (0 for success, 1 for error)
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("plans", nargs="?", type=Path, default=Path("data/plans.json"))
+    parser.add_argument("-o", "--output", type=Path, default=Path("data") / RANKINGS_FILENAME)
+    args = parser.parse_args()
+
+    from fetch_plans import deduplicate_plans
+
+    try:
+        data = json_codec.load(args.plans)
+        plans = deduplicate_plans(data["plans"])
+        document = {"last_updated": data.get("last_updated"), **build_rankings(plans)}
+        json_codec.dump(document, args.output)
+    except (OSError, json_codec.JSONDecodeError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    combinations = sum(
+        len(buckets) for profiles in document["rankings"].values() for buckets in profiles.values()
+    )
+    print(f"Saved rankings for {combinations} TDU/profile/term combinations to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Re-derive normalized plan data for every archived snapshot.
+
+After a fix to `parse_csv_to_plans`, the normalizers or
+`create_plan_fingerprint`, this re-runs parse, normalize and dedup on each
+day in `data/archive-store/` (or, with `--source`, on each dated
+`plans_YYYY-MM-DD.csv` in a directory such as `data/csv-archive/`) in a
+process pool and writes one `plans_YYYY-MM-DD.json` per snapshot:
+
+    {"source": ..., "total_plans": n, "unique_plans": m,
+     "unique_plan_ids": [...], "plans": [...]}
+
+Each output is published atomically (see artifacts.py), so an interrupted
+run never leaves a truncated file, and an unchanged output is not rewritten.
+Results are reported in snapshot order regardless of which worker finishes
+first. Stored days are rendered back to the archive CSV columns
+(`archive_to_csv.CSV_COLUMNS`) and parsed again. EFL lookups are not
+repeated.
+
+Usage:
+    python scripts/reprocess_archive.py [--store data/archive-store | --source data/csv-archive]
+        [--output data/reprocessed] [--workers N] [--glob 'plans_2026-01-*']
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import json_codec
+from archive_store import ArchiveStore
+from archive_to_csv import CSV_COLUMNS
+from fetch_plans import deduplicate_plans, parse_csv_to_plans
+from plan_record import plans_as_dicts
+
+
+def stored_plans_csv(plans: list[dict[str, Any]]) -> str:
+    """Render stored plan records as archive CSV text (the columns archive_to_csv.py writes)."""
+    buffer = io.StringIO(newline="")
+    writer = csv.DictWriter(buffer, fieldnames=list(CSV_COLUMNS), extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(plans)
+    return buffer.getvalue()
+
+
+def _reprocess_csv(name: str, csv_text: str, output_path: Path, start: float) -> dict[str, Any]:
+    """Parse, normalize and deduplicate one snapshot's CSV text and write the result."""
+    plans = parse_csv_to_plans(csv_text)
+    unique = deduplicate_plans(plans)
+
+    document = {
+        "source": name,
+        "total_plans": len(plans),
+        "unique_plans": len(unique),
+        "unique_plan_ids": [plan["plan_id"] for plan in unique],
+        "plans": plans_as_dicts(plans),
+    }
+    json_codec.dump(document, output_path)
+    return {
+        "name": name,
+        "plans": len(plans),
+        "unique": len(unique),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def reprocess_snapshot(csv_path: Path, output_dir: Path) -> dict[str, Any]:
+    """
+    Parse, normalize and deduplicate one archived CSV snapshot.
+
+    Runs in a worker process, so it takes and returns only picklable values.
+
+    Returns:
+        Per-file report: name, plans, unique, seconds
+    """
+    start = time.perf_counter()
+    csv_text = csv_path.read_text(encoding="utf-8")
+    return _reprocess_csv(csv_path.name, csv_text, output_dir / f"{csv_path.stem}.json", start)
+
+
+def reprocess_stored_day(store_root: Path, day: str, output_dir: Path) -> dict[str, Any]:
+    """
+    Parse, normalize and deduplicate one day of the archive store.
+
+    Runs in a worker process, so it takes and returns only picklable values
+    (each worker opens the store itself).
+
+    Returns:
+        Per-day report: name, plans, unique, seconds
+    """
+    start = time.perf_counter()
+    store = ArchiveStore(store_root)
+    csv_text = stored_plans_csv(store.load_snapshot(day)["plans"])
+    name = store.day_path(day).name
+    return _reprocess_csv(name, csv_text, output_dir / name, start)
+
+
+def reprocess_archive(
+    csv_paths: list[Path], output_dir: Path, workers: int | None = None
+) -> list[dict[str, Any]]:
+    """
+    Reprocess CSV snapshots across a process pool.
+
+    Args:
+        csv_paths: Snapshots to reprocess (reports follow this order)
+        output_dir: Directory for the per-snapshot JSON output
+        workers: Pool size (default: CPU count)
+
+    Returns:
+        Per-file reports in input order
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(
+            pool.map(reprocess_snapshot, csv_paths, [output_dir] * len(csv_paths), chunksize=1)
+        )
+
+
+def reprocess_store(
+    store_root: Path, days: list[str], output_dir: Path, workers: int | None = None
+) -> list[dict[str, Any]]:
+    """
+    Reprocess days of the archive store across a process pool.
+
+    Args:
+        store_root: Archive store directory
+        days: Days to reprocess (reports follow this order)
+        output_dir: Directory for the per-day JSON output
+        workers: Pool size (default: CPU count)
+
+    Returns:
+        Per-day reports in input order
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(
+            pool.map(
+                reprocess_stored_day,
+                [store_root] * len(days),
+                days,
+                [output_dir] * len(days),
+                chunksize=1,
+            )
+        )
+
+
+def main() -> int:
+    """
+    Main entry point.
+
+    Returns:
+        Exit code (0 for success, 1 for error)
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--store",
+        type=Path,
+        default=Path(os.environ.get("ARCHIVE_STORE_DIR", "data/archive-store")),
+        help="Archive store to reprocess (default)",
+    )
+    source.add_argument("--source", type=Path, help="Directory of dated CSV snapshots instead")
+    parser.add_argument("--output", type=Path, default=Path("data/reprocessed"))
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument(
+        "--glob", default="plans_*", help="Snapshot name pattern, without the extension"
+    )
+    args = parser.parse_args()
+
+    if args.source is not None:
+        location = args.source
+        csv_paths = sorted(args.source.glob(f"{args.glob}.csv"))
+        count = len(csv_paths)
+    else:
+        location = args.store
+        store = ArchiveStore(args.store)
+        days = [day for day in store.days() if store.day_path(day).match(f"{args.glob}.json")]
+        count = len(days)
+    if not count:
+        print(f"No snapshots matching {args.glob} in {location}", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    try:
+        if args.source is not None:
+            reports = reprocess_archive(csv_paths, args.output, args.workers)
+        else:
+            reports = reprocess_store(args.store, days, args.output, args.workers)
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+
+    for report in reports:
+        print(
+            f"  {report['name']:<24} {report['plans']:>6} plans {report['unique']:>6} unique"
+            f" {report['seconds'] * 1000:>9.1f} ms"
+        )
+    busy = sum(report["seconds"] for report in reports)
+    print(
+        f"Reprocessed {len(reports)} snapshots into {args.output} in {elapsed:.2f}s"
+        f" ({busy:.2f}s of worker time)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Lightweight run instrumentation for the data pipeline.
+
+Stages are timed with `span()` (a context manager) or `@timed` (a
+decorator); work is tallied with `count()`. Both record into the
+process-wide `METRICS` collector, which `fetch_plans.py` writes to
+`data/run-metrics.json` at the end of a run:
+
+    {"total_seconds": 12.3,
+     "stages": [{"name": "fetch", "seconds": 1.2, "cpu_seconds": 0.1}, ...],
+     "counters": {"bytes_read": 4521334, "efl.requests": 37, ...},
+     "record_stats": {"efl.pdf_extraction": {"count": 412,
+                                             "cpu_seconds": {"total": 9.1, "p50": 0.02, ...}}}}
+
+Counters are thread-safe (EFL downloads run in a thread pool), and span
+nesting is tracked per thread. Work done in worker processes is reported
+back with `record()`, one entry per item (e.g. the cost of extracting each
+EFL PDF); the committed file only carries their count and the total and
+percentiles of each numeric field.
+
+Set `PIPELINE_PROFILE` to a comma-separated list of modes for a deeper look:
+`records` adds every recorded entry, `cprofile` adds the top main-thread
+functions by cumulative time (and saves `run-profile.prof` for
+pstats/snakeviz), `tracemalloc` adds per-stage and overall peak memory plus
+the top allocation sites. Any mode includes the recorded entries. An
+unknown mode is reported on stderr and profiling stays off.
+"""
+
+from __future__ import annotations
+
+import functools
+import io
+import math
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    import cProfile
+
+RUN_METRICS_VERSION = 1
+RUN_METRICS_FILENAME = "run-metrics.json"
+PROFILE_FILENAME = "run-profile.prof"
+
+PROFILE_MODES = frozenset({"records", "cprofile", "tracemalloc"})
+
+# Number of functions / allocation sites kept in the profile sections
+PROFILE_TOP_N = 20
+
+# Percentiles reported for each numeric field of recorded entries
+RECORD_PERCENTILES = (50, 90, 99)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class RunMetrics:
+    """Collects stage timings, counters and optional profiles for one run."""
+
+    def __init__(self, profile: str | None = None) -> None:
+        """
+        Args:
+            profile: Comma-separated profile modes (`records`, `cprofile`, `tracemalloc`)
+        """
+        modes = {mode.strip().lower() for mode in (profile or "").split(",") if mode.strip()}
+        unknown = modes - PROFILE_MODES
+        if unknown:
+            raise ValueError(f"Unknown PIPELINE_PROFILE mode(s): {', '.join(sorted(unknown))}")
+
+        self.started_at = datetime.now(UTC)
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        # Span nesting depth of the current thread
+        self._local = threading.local()
+        self.stages: list[dict[str, Any]] = []
+        self.counters: Counter[str] = Counter()
+        self.records: dict[str, list[dict[str, Any]]] = {}
+        self.keep_records = bool(modes)
+
+        self.profiler: cProfile.Profile | None = None
+        if "cprofile" in modes:
+            import cProfile  # only loaded when profiling (pstats is slow to import)
+
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.trace_memory = "tracemalloc" in modes
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time a pipeline stage (spans may nest; `depth` records the nesting in this thread)."""
+        depth: int = getattr(self._local, "depth", 0)
+        stage: dict[str, Any] = {"name": name, "depth": depth}
+        with self._lock:
+            self.stages.append(stage)
+        if self.trace_memory:
+            self._enter_peak()
+        self._local.depth = depth + 1
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            stage["seconds"] = round(time.perf_counter() - start, 4)
+            stage["cpu_seconds"] = round(time.process_time() - cpu_start, 4)
+            if self.trace_memory:
+                stage["peak_bytes"] = self._exit_peak()
+
+    def _enter_peak(self) -> None:
+        # tracemalloc keeps a single peak, reset for each span. The peak reached
+        # so far is carried on a per-thread stack, one entry per open span, so
+        # an enclosing span still reports the high-water mark from before its
+        # children started.
+        peaks: list[int] | None = getattr(self._local, "peaks", None)
+        if peaks is None:
+            peaks = self._local.peaks = []
+        elif peaks:
+            peaks[-1] = max(peaks[-1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        peaks.append(0)
+
+    def _exit_peak(self) -> int:
+        peaks: list[int] = self._local.peaks
+        peak = max(peaks.pop(), tracemalloc.get_traced_memory()[1])
+        if peaks:
+            peaks[-1] = max(peaks[-1], peak)
+        return peak
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """Decorator form of `span`."""
+
+        def decorate(func: F) -> F:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(name):
+                    return func(*args, **kwargs)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorate
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to a named counter."""
+        with self._lock:
+            self.counters[name] += amount
+
+    def record(self, name: str, entry: dict[str, Any]) -> None:
+        """Append a per-item entry (e.g. one document's cost) to a named list."""
+        with self._lock:
+            self.records.setdefault(name, []).append(entry)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the metrics document (stops the profilers)."""
+        document: dict[str, Any] = {
+            "version": RUN_METRICS_VERSION,
+            "started_at": self.started_at.isoformat(),
+            "python": platform.python_version(),
+            "total_seconds": round(time.perf_counter() - self._start, 4),
+            "stages": self.stages,
+            "counters": dict(sorted(self.counters.items())),
+        }
+        records = {name: entries for name, entries in self.records.items() if entries}
+        if records:
+            document["record_stats"] = {
+                name: _summarize_records(entries) for name, entries in records.items()
+            }
+            if self.keep_records:
+                document["records"] = records
+
+        if self.profiler is not None:
+            self.profiler.disable()
+            document["cprofile"] = _top_functions(self.profiler)
+        if self.trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            document["tracemalloc"] = {
+                "current_bytes": current,
+                # The peak is reset at each span start, so combine the per-stage peaks
+                "peak_bytes": max([peak] + [stage.get("peak_bytes", 0) for stage in self.stages]),
+                "top_allocations": [
+                    {"site": str(stat.traceback[0]), "bytes": stat.size, "blocks": stat.count}
+                    for stat in snapshot.statistics("lineno")[:PROFILE_TOP_N]
+                ],
+            }
+        return document
+
+    def write(self, output_dir: Path) -> dict[str, Any]:
+        """
+        Write `run-metrics.json` (and `run-profile.prof` when profiling) to a directory.
+
+        Returns:
+            The metrics document
+        """
+        document = self.to_dict()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        if self.profiler is not None:
+            self.profiler.dump_stats(output_dir / PROFILE_FILENAME)
+        # Imported here: json_codec publishes through artifacts, which counts its writes here
+        import json_codec
+
+        json_codec.dump(document, output_dir / RUN_METRICS_FILENAME, pretty=True)
+        return document
+
+
+def _percentile(ordered: list[float], percent: int) -> float:
+    """Nearest-rank percentile of an ascending, non-empty list."""
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def _summarize_records(entries: list[dict[str, Any]]) -> dict[str, Any]:
+    """Return the count of entries and the total and percentiles of each numeric field."""
+    values: dict[str, list[float]] = {}
+    for entry in entries:
+        for field, value in entry.items():
+            if isinstance(value, int | float) and not isinstance(value, bool):
+                values.setdefault(field, []).append(value)
+
+    summary: dict[str, Any] = {"count": len(entries)}
+    for field, field_values in values.items():
+        ordered = sorted(field_values)
+        stats = {"total": round(math.fsum(ordered), 4)}
+        stats.update((f"p{p}", _percentile(ordered, p)) for p in RECORD_PERCENTILES)
+        stats["max"] = ordered[-1]
+        summary[field] = stats
+    return summary
+
+
+def _top_functions(profiler: cProfile.Profile) -> list[dict[str, Any]]:
+    """Return the top functions of a profile by cumulative time."""
+    import pstats
+
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    entries = stats.stats.items()  # type: ignore[attr-defined]
+    for (filename, line, function), (_, calls, own, cumulative, _) in entries:
+        rows.append(
+            {
+                "function": f"{Path(filename).name}:{line}({function})",
+                "calls": calls,
+                "own_seconds": round(own, 4),
+                "cumulative_seconds": round(cumulative, 4),
+            }
+        )
+    rows.sort(key=lambda row: row["cumulative_seconds"], reverse=True)
+    return rows[:PROFILE_TOP_N]
+
+
+def _from_environment() -> RunMetrics:
+    """Build the collector from PIPELINE_PROFILE, ignoring an invalid value."""
+    try:
+        return RunMetrics(os.getenv("PIPELINE_PROFILE"))
+    except ValueError as e:
+        print(f"Warning: {e}; profiling disabled", file=sys.stderr)
+        return RunMetrics()
+
+
+METRICS = _from_environment()
+
+
+def span(name: str) -> AbstractContextManager[None]:
+    """Time a stage in the process-wide collector (see `RunMetrics.span`)."""
+    return METRICS.span(name)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator timing a function as a stage in the process-wide collector."""
+    return METRICS.timed(name)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add to a counter in the process-wide collector."""
+    METRICS.count(name, amount)
+
+
+def record(name: str, entry: dict[str, Any]) -> None:
+    """Append a per-item entry in the process-wide collector."""
+    METRICS.record(name, entry)
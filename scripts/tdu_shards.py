@@ -0,0 +1,123 @@
+"""
+Per-TDU shards of plans.json.
+
+A ZIP code lookup only ever needs the plans of one TDU, so the plans are also
+written as one shard per `tdu_area` under `data/plans-by-tdu/`, plus a small
+`manifest.json` listing each shard's file name, plan count, byte size and
+SHA-256.
+
+Shard file names embed a prefix of their content hash
+(`plans-oncor.3f2a9c1e7b4d.json`), so they can be served as immutable,
+cache-busting URLs; only the manifest needs revalidating. Shards carry no
+timestamp, so a TDU whose plans did not change keeps the same file name
+between runs. A shard is removed once it is listed in neither the new
+manifest nor the previous one, so a client still holding the previous
+manifest can fetch its shards until the next run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sys
+from pathlib import Path
+from typing import Any
+
+import json_codec
+from artifacts import write_artifact
+
+SHARD_DIRNAME = "plans-by-tdu"
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Hex digits of the content hash used in shard file names
+SHARD_HASH_LENGTH = 12
+
+
+def tdu_slug(tdu_area: str) -> str:
+    """Return a file-name-safe slug for a TDU code (e.g. AEP_CENTRAL -> aep-central)."""
+    return re.sub(r"[^a-z0-9]+", "-", tdu_area.lower()).strip("-") or "unknown"
+
+
+def build_tdu_shards(data: dict[str, Any]) -> dict[str, tuple[int, bytes]]:
+    """
+    Split a plans.json document into serialized per-TDU shards.
+
+    Args:
+        data: plans.json document
+
+    Returns:
+        (plan count, serialized shard) per TDU code, in first-seen TDU order
+    """
+    plans_by_tdu: dict[str, list[dict[str, Any]]] = {}
+    for plan in data.get("plans", []):
+        plans_by_tdu.setdefault(plan.get("tdu_area") or "UNKNOWN", []).append(plan)
+
+    shards = {}
+    for tdu_area, plans in plans_by_tdu.items():
+        shard = {"tdu_area": tdu_area, "total_plans": len(plans), "plans": plans}
+        shards[tdu_area] = (len(plans), json_codec.dumps(shard))
+    return shards
+
+
+def _manifest_files(manifest_path: Path) -> set[str]:
+    """Return the shard file names listed in a manifest (empty if missing or unreadable)."""
+    try:
+        manifest = json_codec.load(manifest_path)
+        return {entry["file"] for entry in manifest["shards"].values()}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return set()
+
+
+def write_tdu_shards(data: dict[str, Any], output_dir: Path) -> dict[str, Any]:
+    """
+    Write per-TDU shards and their manifest, removing stale shards.
+
+    Shards of the previous manifest are kept for one more run (see module
+    docstring); only files listed in neither manifest are deleted.
+
+    Args:
+        data: plans.json document
+        output_dir: Data directory (shards go in its `plans-by-tdu/` subdirectory)
+
+    Returns:
+        The manifest that was written
+    """
+    shard_dir = output_dir / SHARD_DIRNAME
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    previous = _manifest_files(shard_dir / MANIFEST_FILENAME)
+
+    manifest: dict[str, Any] = {
+        "version": MANIFEST_VERSION,
+        "last_updated": data.get("last_updated"),
+        "total_plans": data.get("total_plans", len(data.get("plans", []))),
+        "shards": {},
+    }
+
+    for tdu_area, (count, payload) in build_tdu_shards(data).items():
+        digest = hashlib.sha256(payload).hexdigest()
+        filename = f"plans-{tdu_slug(tdu_area)}.{digest[:SHARD_HASH_LENGTH]}.json"
+        # Content-addressed names: an existing shard already holds this payload
+        path = shard_dir / filename
+        if not path.exists():
+            write_artifact(path, payload)
+        manifest["shards"][tdu_area] = {
+            "file": filename,
+            "plans": count,
+            "bytes": len(payload),
+            "sha256": digest,
+        }
+
+    keep = {entry["file"] for entry in manifest["shards"].values()} | previous
+    for stale in shard_dir.glob("plans-*.json"):
+        if stale.name not in keep:
+            try:
+                stale.unlink()
+            except OSError as e:
+                print(f"Warning: Could not remove stale shard {stale.name}: {e}", file=sys.stderr)
+
+    # A new fetch time alone does not rewrite the manifest
+    json_codec.dump(
+        manifest, shard_dir / MANIFEST_FILENAME, pretty=True, ignore_keys=("last_updated",)
+    )
+    return manifest
@@ -13,6 +13,7 @@ import type {
   ElectricityPlan,
   LocalTaxesData,
   PlansData,
+  RankingsData,
   TaxInfo,
   TDURate,
   TDURatesData,
@@ -27,7 +28,7 @@ import Logger from './utils/logger';
 /**
  * Cache key type.
  */
-type CacheKey = 'plans' | 'tduRates' | 'localTaxes';
+type CacheKey = 'plans' | 'tduRates' | 'localTaxes' | 'rankings';
 
 /**
  * Cache entry with data and timestamp.
@@ -44,6 +45,7 @@ interface CacheStore {
   plans: CacheEntry<PlansData>;
   tduRates: CacheEntry<TDURatesData>;
   localTaxes: CacheEntry<LocalTaxesData>;
+  rankings: CacheEntry<RankingsData>;
 }
 
 /**
@@ -144,7 +146,8 @@ const API = {
   cache: {
     plans: { data: null, timestamp: 0 },
     tduRates: { data: null, timestamp: 0 },
-    localTaxes: { data: null, timestamp: 0 }
+    localTaxes: { data: null, timestamp: 0 },
+    rankings: { data: null, timestamp: 0 }
   } as CacheStore,
 
   /**
@@ -153,7 +156,8 @@ const API = {
   loadingPromises: {
     plans: null as Promise<PlansData> | null,
     tduRates: null as Promise<TDURatesData> | null,
-    localTaxes: null as Promise<LocalTaxesData> | null
+    localTaxes: null as Promise<LocalTaxesData> | null,
+    rankings: null as Promise<RankingsData | null> | null
   },
 
   /**
@@ -350,6 +354,46 @@ const API = {
     return this.loadingPromises.localTaxes;
   },
 
+  /**
+   * Load precomputed rankings for the canonical usage profiles.
+   *
+   * The file is optional: without it the page ranks every plan itself,
+   * so a failed request is not retried and resolves to null.
+   */
+  async loadRankings(forceRefresh: boolean = false): Promise<RankingsData | null> {
+    if (!forceRefresh && this.isCacheValid('rankings')) {
+      return this.cache.rankings.data;
+    }
+
+    if (this.loadingPromises.rankings !== null) {
+      return this.loadingPromises.rankings;
+    }
+
+    this.loadingPromises.rankings = (async (): Promise<RankingsData | null> => {
+      try {
+        const response = await fetch(`${this.basePath}/rankings.json`);
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const data = (await response.json()) as RankingsData;
+
+        if (data === null || typeof data.rankings !== 'object') {
+          throw new Error('Invalid rankings data structure');
+        }
+
+        this.cache.rankings = { data, timestamp: Date.now() };
+        return data;
+      } catch (error) {
+        logger.warn('Rankings unavailable, ranking plans on the page', { error });
+        return null;
+      } finally {
+        this.loadingPromises.rankings = null;
+      }
+    })();
+
+    return this.loadingPromises.rankings;
+  },
+
   /**
    * Preload all data in parallel.
    */
@@ -467,7 +511,8 @@ const API = {
       this.cache = {
         plans: { data: null, timestamp: 0 },
         tduRates: { data: null, timestamp: 0 },
-        localTaxes: { data: null, timestamp: 0 }
+        localTaxes: { data: null, timestamp: 0 },
+        rankings: { data: null, timestamp: 0 }
       };
     }
   },
@@ -510,6 +555,11 @@ const API = {
         age:
           this.cache.localTaxes.timestamp > 0 ? Date.now() - this.cache.localTaxes.timestamp : null,
         valid: this.isCacheValid('localTaxes')
+      },
+      rankings: {
+        cached: this.cache.rankings.data !== null,
+        age: this.cache.rankings.timestamp > 0 ? Date.now() - this.cache.rankings.timestamp : null,
+        valid: this.isCacheValid('rankings')
       }
     };
   },
@@ -595,6 +645,7 @@ const API = {
         if (existing === undefined) {
           throw new Error('Fingerprint map consistency error');
         }
+        const currentPreference = this.calculatePlanPreference(plan);
         if (currentPreference > existing.preference) {
           fingerprintMap.set(fingerprint, {
             plan,
@@ -17,7 +17,13 @@
  * VULNERABILITY FIXED: Safe array access and null checks throughout
  */
 
-import type { ElectricityPlan, QualityGrade, QualityGradeLetter, TDURate } from '../types';
+import type {
+  ElectricityPlan,
+  QualityGrade,
+  QualityGradeLetter,
+  RankingEntry,
+  TDURate
+} from '../types';
 import { ETFCalculator } from './etf-calculator';
 
 // ==============================
@@ -253,18 +259,9 @@ const PlanRanker = {
   },
 
   /**
-   * Rank plans by combined weighted score.
+   * Resolve the cost calculator (fallback to global if available).
    */
-  rankPlans(
-    plans: readonly ElectricityPlan[],
-    userUsage: readonly number[],
-    tduRates: TDURate,
-    options: RankingOptions = {},
-    CostCalc: CostCalculatorLike | null = null
-  ): RankedPlan[] {
-    const { localTaxRate = 0, contractStartDate = null, includeNonFixed = true } = options;
-
-    // Get calculator (fallback to global if available)
+  resolveCalculator(CostCalc: CostCalculatorLike | null): CostCalculatorLike {
     const windowCalc =
       typeof window !== 'undefined'
         ? (window as unknown as Record<string, CostCalculatorLike | undefined>).CostCalculator
@@ -274,45 +271,74 @@ const PlanRanker = {
     if (calculator === null) {
       throw new Error('CostCalculator is required for plan ranking');
     }
+    return calculator;
+  },
 
-    // Calculate metrics for all plans
-    const rankedPlans: RankedPlan[] = plans.map((plan) => {
-      const isNewCustomerOnly = this.isNewCustomerOnly(plan);
-      const annualResult = calculator.calculateAnnualCost(userUsage, plan, tduRates, localTaxRate);
-      const volatility = this.calculateVolatility(plan, userUsage);
-      const warnings = this.identifyWarnings(plan, userUsage, contractStartDate);
-
-      // Add non-fixed rate warning
-      if (plan.rate_type !== 'FIXED') {
-        warnings.unshift(this.getNonFixedWarning(plan.rate_type));
+  /**
+   * Calculate cost, volatility and warnings for one plan (scores are filled in later).
+   */
+  measurePlan(
+    plan: ElectricityPlan,
+    userUsage: readonly number[],
+    tduRates: TDURate,
+    options: RankingOptions,
+    calculator: CostCalculatorLike
+  ): RankedPlan {
+    const { localTaxRate = 0, contractStartDate = null } = options;
+    const isNewCustomerOnly = this.isNewCustomerOnly(plan);
+    const annualResult = calculator.calculateAnnualCost(userUsage, plan, tduRates, localTaxRate);
+    const volatility = this.calculateVolatility(plan, userUsage);
+    const warnings = this.identifyWarnings(plan, userUsage, contractStartDate);
+
+    // Add non-fixed rate warning
+    if (plan.rate_type !== 'FIXED') {
+      warnings.unshift(this.getNonFixedWarning(plan.rate_type));
+    }
+
+    return {
+      ...plan,
+      annualCost: annualResult.annualCost,
+      averageMonthlyCost: annualResult.averageMonthlyCost,
+      effectiveRate: annualResult.effectiveAnnualRate,
+      monthlyCosts: annualResult.monthlyCosts,
+      totalUsage: annualResult.totalUsage,
+      volatility,
+      warnings,
+      isGimmick: warnings.length > 0 || volatility > 0.3,
+      isNonFixed: plan.rate_type !== 'FIXED',
+      is_new_customer_only: isNewCustomerOnly,
+      qualityScore: 0,
+      combinedScore: 0,
+      scoreBreakdown: {
+        baseScore: 100,
+        costPenalty: 0,
+        volatilityPenalty: 0,
+        warningPenalty: 0,
+        baseChargePenalty: 0,
+        expirationPenalty: 0,
+        automaticF: false,
+        automaticFReason: null
       }
+    };
+  },
 
-      return {
-        ...plan,
-        annualCost: annualResult.annualCost,
-        averageMonthlyCost: annualResult.averageMonthlyCost,
-        effectiveRate: annualResult.effectiveAnnualRate,
-        monthlyCosts: annualResult.monthlyCosts,
-        totalUsage: annualResult.totalUsage,
-        volatility,
-        warnings,
-        isGimmick: warnings.length > 0 || volatility > 0.3,
-        isNonFixed: plan.rate_type !== 'FIXED',
-        is_new_customer_only: isNewCustomerOnly,
-        qualityScore: 0,
-        combinedScore: 0,
-        scoreBreakdown: {
-          baseScore: 100,
-          costPenalty: 0,
-          volatilityPenalty: 0,
-          warningPenalty: 0,
-          baseChargePenalty: 0,
-          expirationPenalty: 0,
-          automaticF: false,
-          automaticFReason: null
-        }
-      };
-    });
+  /**
+   * Rank plans by combined weighted score.
+   */
+  rankPlans(
+    plans: readonly ElectricityPlan[],
+    userUsage: readonly number[],
+    tduRates: TDURate,
+    options: RankingOptions = {},
+    CostCalc: CostCalculatorLike | null = null
+  ): RankedPlan[] {
+    const { includeNonFixed = true } = options;
+    const calculator = this.resolveCalculator(CostCalc);
+
+    // Calculate metrics for all plans
+    const rankedPlans: RankedPlan[] = plans.map((plan) =>
+      this.measurePlan(plan, userUsage, tduRates, options, calculator)
+    );
 
     // Filter if needed
     const filteredPlans = includeNonFixed
@@ -356,6 +382,44 @@ const PlanRanker = {
     return filteredPlans;
   },
 
+  /**
+   * Rank plans from a precomputed lookup (data/rankings.json, scripts/rankings.py).
+   *
+   * Only the listed plans are measured and scored. `entries` are in rank
+   * order and `bestAnnualCost` is the TDU's cheapest plan for the same usage,
+   * both without local tax, which scales every cost by the same factor.
+   *
+   * @returns Ranked plans, or null if the lookup does not apply
+   */
+  rankFromLookup(
+    plans: readonly ElectricityPlan[],
+    entries: readonly RankingEntry[],
+    bestAnnualCost: number,
+    userUsage: readonly number[],
+    tduRates: TDURate,
+    options: RankingOptions = {},
+    CostCalc: CostCalculatorLike | null = null
+  ): RankedPlan[] | null {
+    // The lookup assumes no contract start date and every plan type
+    if (options.contractStartDate != null || options.includeNonFixed === false) return null;
+
+    const calculator = this.resolveCalculator(CostCalc);
+    const byId = new Map(plans.map((plan) => [plan.plan_id, plan]));
+    const best = bestAnnualCost * (1 + (options.localTaxRate ?? 0));
+
+    const rankedPlans: RankedPlan[] = [];
+    for (const [index, [planId]] of entries.entries()) {
+      const plan = byId.get(planId);
+      if (plan === undefined) return null; // lookup built from different data
+
+      const ranked = this.measurePlan(plan, userUsage, tduRates, options, calculator);
+      ranked.qualityScore = this.calculateQualityScore(ranked, best, options);
+      ranked.combinedScore = entries.length - index;
+      rankedPlans.push(ranked);
+    }
+    return rankedPlans;
+  },
+
   /**
    * Calculate quality score for a plan (0-100 scale).
    */
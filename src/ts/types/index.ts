@@ -90,6 +90,27 @@ export interface PlansData {
   readonly disclaimer: string;
 }
 
+/**
+ * Precomputed ranking entry: [plan_id, annual cost without local tax].
+ */
+export type RankingEntry = readonly [string, number];
+
+/**
+ * Precomputed rankings file structure (data/rankings.json).
+ * Lists are keyed by TDU code, average monthly kWh and term bucket.
+ */
+export interface RankingsData {
+  readonly version: number;
+  readonly last_updated: string | null;
+  readonly top_n: number;
+  readonly profiles: Readonly<Record<string, readonly number[]>>;
+  readonly term_buckets: Readonly<Record<string, readonly [number, number | null]>>;
+  readonly best_annual_cost: Readonly<Record<string, Readonly<Record<string, number>>>>;
+  readonly rankings: Readonly<
+    Record<string, Readonly<Record<string, Readonly<Record<string, readonly RankingEntry[]>>>>>
+  >;
+}
+
 // ==============================
 // TDU (Transmission and Distribution Utility) Types
 // ==============================
@@ -367,7 +388,7 @@ export interface CacheEntry<T> {
 /**
  * Cache key identifiers.
  */
-export type CacheKey = 'plans' | 'tduRates' | 'localTaxes';
+export type CacheKey = 'plans' | 'tduRates' | 'localTaxes' | 'rankings';
 
 /**
  * Cache configuration options.
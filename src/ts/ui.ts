@@ -41,6 +41,18 @@ type UsageMethod = 'estimate' | 'average' | 'detailed';
  */
 type SortDirection = 'asc' | 'desc';
 
+/**
+ * Precomputed ranking behind the current results (data/rankings.json).
+ * Keeps the inputs needed to rank every plan when a view needs more than the top lists.
+ */
+interface RankingLookup {
+  readonly buckets: Readonly<Record<string, readonly string[]>>;
+  readonly plans: ElectricityPlan[];
+  readonly monthlyUsage: number[];
+  readonly tdu: TDURate;
+  readonly localTaxRate: number;
+}
+
 /**
  * UI State.
  */
@@ -52,6 +64,7 @@ interface UIState {
   avgUsage: number | null;
   monthlyUsage: number[];
   rankedPlans: ElectricityPlan[] | null;
+  rankingLookup: RankingLookup | null;
   isLoading: boolean;
   autoCalculateTimer: ReturnType<typeof setTimeout> | null;
   zipValidationTimer: ReturnType<typeof setTimeout> | null;
@@ -280,6 +293,7 @@ const UI = {
     avgUsage: null,
     monthlyUsage: Array(12).fill(0),
     rankedPlans: null,
+    rankingLookup: null,
     isLoading: false,
     autoCalculateTimer: null,
     zipValidationTimer: null,
@@ -841,13 +855,17 @@ const UI = {
         return;
       }
 
-      const rankedPlans = PlanRanker.rankPlans(
-        tduPlans,
-        monthlyUsage,
-        this.state.tdu,
-        { localTaxRate: this.state.localTaxRate },
-        CostCalculator
-      );
+      // Canonical usage profiles are ranked ahead of time; anything else is ranked here
+      this.state.rankingLookup = null;
+      const rankedPlans =
+        (await this.rankFromLookup(tduPlans, monthlyUsage, this.state.tdu)) ??
+        PlanRanker.rankPlans(
+          tduPlans,
+          monthlyUsage,
+          this.state.tdu,
+          { localTaxRate: this.state.localTaxRate },
+          CostCalculator
+        );
 
       this.state.rankedPlans = rankedPlans;
       this.sortState.column = null;
@@ -866,7 +884,7 @@ const UI = {
         Toast.success(
           `Lowest cost plan: ${formatCurrency(best.annualCost)}/year.`,
           6000,
-          `${rankedPlans.length} Plans Analyzed`
+          `${tduPlans.length} Plans Analyzed`
         );
       }
     } catch (error) {
@@ -878,6 +896,83 @@ const UI = {
     }
   },
 
+  /**
+   * Rank plans from the precomputed lookup when the usage is a canonical profile.
+   *
+   * @returns Ranked plans of every term bucket, or null to rank all plans on the page
+   */
+  async rankFromLookup(
+    tduPlans: ElectricityPlan[],
+    monthlyUsage: number[],
+    tdu: TDURate
+  ): Promise<RankedPlanWithMetrics[] | null> {
+    const rankings = await API.loadRankings();
+    if (rankings === null) return null;
+
+    const profile = String(Math.round(monthlyUsage.reduce((a, b) => a + b, 0) / 12));
+    const pattern = rankings.profiles[profile];
+    if (pattern === undefined || pattern.some((kwh, i) => kwh !== monthlyUsage[i])) return null;
+
+    const buckets = rankings.rankings[tdu.code]?.[profile];
+    const bestAnnualCost = rankings.best_annual_cost[tdu.code]?.[profile];
+    if (buckets === undefined || bestAnnualCost === undefined) return null;
+
+    // Score each listed plan once, the overall top list first
+    const seen = new Set<string>();
+    const entries = [buckets.all ?? [], ...Object.values(buckets)].flat().filter(([planId]) => {
+      if (seen.has(planId)) return false;
+      seen.add(planId);
+      return true;
+    });
+
+    const rankedPlans = PlanRanker.rankFromLookup(
+      tduPlans,
+      entries,
+      bestAnnualCost,
+      monthlyUsage,
+      tdu,
+      { localTaxRate: this.state.localTaxRate },
+      CostCalculator
+    );
+    if (rankedPlans === null) {
+      logger.warn('Rankings do not match the loaded plans, ranking plans on the page');
+      return null;
+    }
+
+    this.state.rankingLookup = {
+      buckets: Object.fromEntries(
+        Object.entries(buckets).map(([bucket, list]) => [bucket, list.map(([planId]) => planId)])
+      ),
+      plans: tduPlans,
+      monthlyUsage,
+      tdu,
+      localTaxRate: this.state.localTaxRate
+    };
+    return rankedPlans as RankedPlanWithMetrics[];
+  },
+
+  /**
+   * Replace lookup results with a ranking of every plan.
+   */
+  rankAllPlans(): void {
+    const lookup = this.state.rankingLookup;
+    if (lookup === null) return;
+
+    this.state.rankingLookup = null;
+    this.state.rankedPlans = PlanRanker.rankPlans(
+      lookup.plans,
+      lookup.monthlyUsage,
+      lookup.tdu,
+      { localTaxRate: lookup.localTaxRate },
+      CostCalculator
+    );
+  },
+
+  showAllPlans(): void {
+    this.rankAllPlans();
+    this.applyFilters();
+  },
+
   showLoading(): void {
     if (this.elements.statusIdle !== null) this.elements.statusIdle.hidden = true;
     if (this.elements.statusLoading !== null) this.elements.statusLoading.hidden = false;
@@ -1039,6 +1134,15 @@ const UI = {
         `;
       })
       .join('');
+
+    // Lookup results only hold the top plans of each term bucket
+    const lookup = this.state.rankingLookup;
+    if (lookup !== null) {
+      this.elements.comparisonBody.insertAdjacentHTML(
+        'beforeend',
+        `<tr><td class="table-empty" colspan="11"><button class="btn-view" type="button" onclick="UI.showAllPlans()">Show all ${this.countTermPlans(lookup.plans)} plans</button></td></tr>`
+      );
+    }
   },
 
   renderPlanCard(plan: RankedPlanWithMetrics, index: number): string {
@@ -1231,18 +1335,32 @@ const UI = {
     }
   },
 
+  matchesTermFilter(plan: ElectricityPlan, termFilter: string): boolean {
+    if (termFilter === 'short') return plan.term_months >= 3 && plan.term_months <= 6;
+    if (termFilter === 'medium') return plan.term_months === 12;
+    if (termFilter === 'long') return plan.term_months >= 24;
+    return true;
+  },
+
+  countTermPlans(plans: readonly ElectricityPlan[]): number {
+    const termFilter = this.elements.filterTerm?.value ?? 'all';
+    return plans.filter((plan) => this.matchesTermFilter(plan, termFilter)).length;
+  },
+
   getFilteredPlans(): RankedPlanWithMetrics[] {
     const plans = (this.state.rankedPlans ?? []) as RankedPlanWithMetrics[];
     let filtered = plans.slice();
 
     const termFilter = this.elements.filterTerm?.value ?? 'all';
-    if (termFilter !== 'all') {
-      filtered = filtered.filter((plan) => {
-        if (termFilter === 'short') return plan.term_months >= 3 && plan.term_months <= 6;
-        if (termFilter === 'medium') return plan.term_months === 12;
-        if (termFilter === 'long') return plan.term_months >= 24;
-        return true;
-      });
+    const lookup = this.state.rankingLookup;
+    if (lookup !== null) {
+      // Term buckets are ranked ahead of time, in rank order
+      const byId = new Map(plans.map((plan) => [plan.plan_id, plan]));
+      filtered = (lookup.buckets[termFilter] ?? [])
+        .map((planId) => byId.get(planId))
+        .filter((plan): plan is RankedPlanWithMetrics => plan !== undefined);
+    } else if (termFilter !== 'all') {
+      filtered = filtered.filter((plan) => this.matchesTermFilter(plan, termFilter));
     }
 
     const renewableFilter = this.elements.filterRenewable?.value ?? 'all';
@@ -1377,6 +1495,12 @@ const UI = {
   applyFilters(): void {
     if (this.state.rankedPlans === null) return;
 
+    // Renewable filters and column sorts need every plan, not just the top lists
+    const renewableFilter = this.elements.filterRenewable?.value ?? 'all';
+    if (this.sortState.column !== null || renewableFilter !== 'all') {
+      this.rankAllPlans();
+    }
+
     const filtered = this.getFilteredPlans();
     const sorted = this.getSortedPlans(filtered);
 
@@ -1384,7 +1508,9 @@ const UI = {
     this.displayComparisonTable(sorted);
 
     if (this.elements.resultsCount !== null) {
-      this.elements.resultsCount.textContent = String(sorted.length);
+      const lookup = this.state.rankingLookup;
+      const count = lookup === null ? sorted.length : this.countTermPlans(lookup.plans);
+      this.elements.resultsCount.textContent = String(count);
     }
   },
 
@@ -1413,7 +1539,14 @@ const UI = {
 
 export default UI;
 export { UI, Toast };
-export type { UIState, UIElements, ToastType, UsageMethod, RankedPlanWithMetrics };
+export type {
+  UIState,
+  UIElements,
+  ToastType,
+  UsageMethod,
+  RankedPlanWithMetrics,
+  RankingLookup
+};
 
 // Browser compatibility
 declare global {
@@ -0,0 +1,92 @@
+"""
+Shared fixtures for the pipeline script tests.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+
+def build_plan(plan_id: str, price: float = 14.0, **fields: Any) -> dict[str, Any]:
+    """
+    Build a plan dict in plans.json key order.
+
+    Args:
+        plan_id: Plan ID (also used in the plan name and EFL URL)
+        price: Rate at 1000 kWh in cents; the 500 and 2000 kWh rates are one
+            cent higher and lower
+        **fields: Fields to override or add
+
+    Returns:
+        A fixed-rate ONCOR plan that passes ElectricityPlan validation
+    """
+    return {
+        "plan_id": plan_id,
+        "plan_name": f"Plan {plan_id}",
+        "rep_name": "REP A",
+        "tdu_area": "ONCOR",
+        "rate_type": "FIXED",
+        "term_months": 12,
+        "price_kwh_500": price + 1,
+        "price_kwh_1000": price,
+        "price_kwh_2000": price - 1,
+        "base_charge_monthly": 0.0,
+        "early_termination_fee": 150.0,
+        "is_prepaid": False,
+        "is_tou": False,
+        "efl_url": f"https://example.com/{plan_id}.pdf",
+        "special_terms": "",
+        "language": "English",
+        **fields,
+    }
+
+
+@pytest.fixture
+def make_plan() -> Callable[..., dict[str, Any]]:
+    """Factory for plan dicts (see `build_plan`)."""
+    return build_plan
+
+
+def build_efl_pdf(pages: list[list[str]]) -> bytes:
+    """Build a minimal PDF with one Helvetica text line per string."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for lines in pages:
+        # Each line is a string shown with the ' (next line) operator
+        shown = " ".join(
+            "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") '"
+            for line in lines
+        )
+        stream = f"BT /F1 10 Tf 14 TL 50 750 Td {shown} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792]"
+            f" /Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1", "replace")
+    xref = len(pdf)
+    trailer = [f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"]
+    trailer += [f"{offset:010d} 00000 n \n" for offset in offsets]
+    trailer.append(
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    )
+    pdf += "".join(trailer).encode("ascii")
+    return bytes(pdf)
+
+
+@pytest.fixture
+def efl_pdf() -> Callable[[list[list[str]]], bytes]:
+    """Factory for minimal EFL PDFs (see `build_efl_pdf`)."""
+    return build_efl_pdf
@@ -0,0 +1,103 @@
+"""
+Test suite for the content-addressed snapshot store (scripts/archive_store.py).
+
+Tests cover:
+- Byte-for-byte rebuild of migrated and added snapshots (indented or compact)
+- Record deduplication across days
+- Rejection of non-canonical or corrupted snapshots
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from archive_store import ArchiveStore, add_verified, migrate_archive, serialize_snapshot
+
+
+def make_snapshot(*prices: float) -> dict[str, Any]:
+    plans = [
+        {"plan_id": str(i), "rep_name": "ÉNERGIE", "price_kwh_1000": price, "etf_details": None}
+        for i, price in enumerate(prices)
+    ]
+    return {
+        "last_updated": "2026-01-10T06:00:00+00:00",
+        "total_plans": len(plans),
+        "plans": plans,
+    }
+
+
+@pytest.fixture
+def json_archive(tmp_path: Path) -> Path:
+    source = tmp_path / "json-archive"
+    source.mkdir()
+    for day, prices in (("2026-01-10", (14.2, 13.9)), ("2026-01-11", (14.2, 15.1))):
+        (source / f"plans_{day}.json").write_bytes(serialize_snapshot(make_snapshot(*prices)))
+    return source
+
+
+class TestMigrateArchive:
+    """Tests for ingesting the dated json-archive files."""
+
+    def test_migrate_rebuilds_byte_for_byte(self, json_archive: Path, tmp_path: Path) -> None:
+        """Test that every migrated day rebuilds to the original bytes."""
+        store = ArchiveStore(tmp_path / "store")
+
+        assert migrate_archive(json_archive, store) == 0
+
+        reader = ArchiveStore(tmp_path / "store")
+        assert reader.days() == ["2026-01-10", "2026-01-11"]
+        for day in reader.days():
+            assert reader.rebuild(day) == (json_archive / f"plans_{day}.json").read_bytes()
+
+    def test_unchanged_records_are_stored_once(self, json_archive: Path, tmp_path: Path) -> None:
+        """Test that a plan unchanged between days is a single object."""
+        store = ArchiveStore(tmp_path / "store")
+        migrate_archive(json_archive, store)
+
+        lines = [
+            line
+            for path in store.objects_dir.glob("*.jsonl")
+            for line in path.read_text().splitlines()
+        ]
+        assert len(lines) == 3
+
+
+class TestAddSnapshot:
+    """Tests for adding single snapshots."""
+
+    def test_add_verified_stores_the_day(self, tmp_path: Path) -> None:
+        """Test that a daily plans.json is stored and rebuilds to the same bytes."""
+        store = ArchiveStore(tmp_path / "store")
+        original = serialize_snapshot(make_snapshot(14.2, 13.9))
+
+        assert add_verified(store, "2026-01-12", original) == 2
+        assert ArchiveStore(store.root).rebuild("2026-01-12") == original
+
+    def test_compact_snapshot_rebuilds_compact(self, tmp_path: Path) -> None:
+        """Test that a compact plans.json (PLANS_JSON_PRETTY=0) is stored and rebuilt as written."""
+        store = ArchiveStore(tmp_path / "store")
+        original = serialize_snapshot(make_snapshot(14.2, 13.9), pretty=False)
+
+        store.add_snapshot("2026-01-10", json.loads(original), original)
+
+        assert ArchiveStore(store.root).rebuild("2026-01-10") == original
+
+    def test_non_canonical_snapshot_is_rejected(self, tmp_path: Path) -> None:
+        """Test that a snapshot that could not be rebuilt exactly is not stored."""
+        store = ArchiveStore(tmp_path / "store")
+        original = json.dumps(make_snapshot(14.2)).encode()
+
+        with pytest.raises(ValueError, match="canonical"):
+            add_verified(store, "2026-01-10", original)
+        assert store.days() == []
+
+    def test_corrupted_record_fails_rebuild(self, json_archive: Path, tmp_path: Path) -> None:
+        """Test that a tampered object is detected through the day hash."""
+        store = ArchiveStore(tmp_path / "store")
+        migrate_archive(json_archive, store)
+        for path in store.objects_dir.glob("*.jsonl"):
+            path.write_text(path.read_text().replace("14.2", "14.3"))
+
+        with pytest.raises(ValueError, match="does not match"):
+            ArchiveStore(store.root).rebuild("2026-01-10")
@@ -0,0 +1,131 @@
+"""
+Tests for atomic artifact publishing (scripts/artifacts.py).
+
+Tests cover:
+- Atomic replacement with published permissions
+- Unchanged content leaves the target untouched
+- Failed writes leave the previous file and no temporary files
+- Streamed text and chunked writes
+- A repeated pipeline save of the same plans only rewrites plans.json
+"""
+
+import contextlib
+import csv
+import hashlib
+import io
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import fetch_plans
+import json_codec
+import pytest
+import run_metrics
+from artifacts import AtomicArtifact, write_artifact
+
+
+class TestWriteArtifact:
+    """Tests for publishing a payload with write_artifact."""
+
+    def test_write_replace_and_skip_unchanged(self, tmp_path: Path) -> None:
+        """Test that new content replaces the file and identical content is skipped."""
+        path = tmp_path / "data" / "plans.json"
+
+        first = write_artifact(path, b'{"plans":[]}')
+
+        assert first.changed
+        assert first.sha256 == hashlib.sha256(b'{"plans":[]}').hexdigest()
+        assert path.read_bytes() == b'{"plans":[]}'
+        assert path.stat().st_mode & 0o777 == 0o644
+
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        again = write_artifact(path, [b'{"plans"', b":[]}"])
+
+        assert not again.changed
+        assert again.sha256 == first.sha256
+        assert path.stat().st_mtime_ns == 1_000_000_000
+
+        assert write_artifact(path, b'{"plans":[1]}').changed
+        assert path.read_bytes() == b'{"plans":[1]}'
+        assert sorted(p.name for p in path.parent.iterdir()) == ["plans.json"]
+
+
+class TestAtomicArtifact:
+    """Tests for the streaming AtomicArtifact context manager."""
+
+    def test_failed_write_keeps_previous_file(self, tmp_path: Path) -> None:
+        """Test that an exception mid-write leaves the old content and no temporary file."""
+        path = tmp_path / "plans.json"
+        path.write_bytes(b"old")
+
+        with pytest.raises(RuntimeError), AtomicArtifact(path) as f:
+            f.write(b"partial")
+            raise RuntimeError("interrupted")
+
+        assert path.read_bytes() == b"old"
+        assert [p.name for p in tmp_path.iterdir()] == ["plans.json"]
+
+    def test_streamed_text(self, tmp_path: Path) -> None:
+        """Test that text streamed through csv.writer is hashed and published as written."""
+        path = tmp_path / "plans.csv"
+        artifact = AtomicArtifact(path, encoding="utf-8", newline="")
+
+        with artifact as f:
+            csv.writer(f).writerows([["rep_name", "price"], ["ÉNERGIE", "14.2"]])
+
+        content = "rep_name,price\r\nÉNERGIE,14.2\r\n".encode()
+        assert path.read_bytes() == content
+        assert artifact.result is not None
+        assert artifact.result.size == len(content)
+        assert artifact.result.sha256 == hashlib.sha256(content).hexdigest()
+
+
+class TestRepeatedSave:
+    """Tests for saving the same plans twice through the pipeline writers."""
+
+    @staticmethod
+    def save(plans: list[dict[str, Any]], output_path: Path) -> run_metrics.RunMetrics:
+        """Run the save stage of fetch_plans.main() and return its metrics."""
+        metrics = run_metrics.RunMetrics()
+        with contextlib.redirect_stdout(io.StringIO()):
+            with pytest.MonkeyPatch.context() as monkeypatch:
+                monkeypatch.setattr(run_metrics, "METRICS", metrics)
+                data = fetch_plans.save_plans(plans, output_path)
+                fetch_plans.save_columnar_plans(data, output_path)
+                fetch_plans.save_tdu_shards(data, output_path)
+                unique_plans = fetch_plans.deduplicate_plans(plans)
+                fetch_plans.save_rankings(data, unique_plans, output_path)
+                fetch_plans.save_near_duplicates(data, unique_plans, output_path)
+        return metrics
+
+    def test_second_save_only_rewrites_plans_json(
+        self, tmp_path: Path, make_plan: Callable[..., dict[str, Any]]
+    ) -> None:
+        """Test that a new fetch time alone rewrites plans.json but none of its derived files."""
+        plans = [make_plan("1"), make_plan("2", 12.0, tdu_area="CENTERPOINT"), make_plan("3")]
+        output_path = tmp_path / "plans.json"
+
+        first = self.save(plans, output_path)
+        first_updated = json_codec.load(output_path)["last_updated"]
+        before = {path: path.stat().st_mtime_ns for path in tmp_path.rglob("*") if path.is_file()}
+        second = self.save(plans, output_path)
+        after = {path: path.stat().st_mtime_ns for path in tmp_path.rglob("*") if path.is_file()}
+
+        assert first.counters["artifacts.written"] > 1
+        assert second.counters["artifacts.written"] == 1
+        assert second.counters["artifacts.unchanged"] > 0
+        assert [path.name for path in after if after[path] != before[path]] == ["plans.json"]
+        assert json_codec.load(output_path)["last_updated"] > first_updated
+
+    def test_changed_plans_rewrite_derived_files(
+        self, tmp_path: Path, make_plan: Callable[..., dict[str, Any]]
+    ) -> None:
+        """Test that a changed plan list rewrites the derived files with the new fetch time."""
+        output_path = tmp_path / "plans.json"
+        self.save([make_plan("1")], output_path)
+
+        self.save([make_plan("1", 13.0)], output_path)
+
+        manifest = json_codec.load(tmp_path / "plans-by-tdu" / "manifest.json")
+        assert manifest["last_updated"] == json_codec.load(output_path)["last_updated"]
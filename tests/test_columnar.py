@@ -0,0 +1,88 @@
+"""
+Test suite for the columnar plans artifact (scripts/columnar.py).
+
+Tests cover:
+- Exact round-trip to the plans.json document
+- Dictionary and sparse field encoding
+- Artifact files and compressed variants
+"""
+
+import gzip
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from columnar import (
+    COLUMNAR_FILENAME,
+    TEXT_FILENAME,
+    decode_columnar,
+    encode_columnar,
+    write_columnar_artifacts,
+)
+
+
+@pytest.fixture
+def plans_document(make_plan: Callable[..., dict[str, Any]]) -> dict[str, Any]:
+    """A plans.json document with three plans, one carrying etf_details."""
+    terms = "Same terms for everyone"
+    plans = [
+        make_plan("1", special_terms=terms),
+        make_plan(
+            "2", rep_name="REP B", special_terms=terms, etf_details={"structure": "per-month"}
+        ),
+        make_plan("3", tdu_area="CENTERPOINT", special_terms=terms),
+    ]
+    return {
+        "last_updated": "2026-01-08T12:00:00+00:00",
+        "data_source": "Power to Choose (https://www.powertochoose.org)",
+        "total_plans": len(plans),
+        "disclaimer": "Verify details on the official EFL.",
+        "plans": plans,
+    }
+
+
+class TestColumnarEncoding:
+    """Tests for encode_columnar / decode_columnar."""
+
+    def test_round_trip_is_exact(self, plans_document: dict[str, Any]) -> None:
+        """Test that decoding reproduces plans.json byte-for-byte."""
+        columnar, text = encode_columnar(plans_document)
+
+        decoded = decode_columnar(json.loads(json.dumps(columnar)), json.loads(json.dumps(text)))
+
+        assert json.dumps(decoded, indent=2) == json.dumps(plans_document, indent=2)
+
+    def test_dictionary_and_sparse_fields(self, plans_document: dict[str, Any]) -> None:
+        """Test categorical columns store indices and partial fields are sparse."""
+        columnar, text = encode_columnar(plans_document)
+
+        assert columnar["dictionaries"]["rep_name"] == ["REP A", "REP B"]
+        assert columnar["columns"]["rep_name"] == [0, 1, 0]
+        assert columnar["sparse"]["etf_details"]["index"] == [1]
+        assert "special_terms" not in columnar["columns"]
+        assert text["columns"]["special_terms"] == [0, 0, 0]
+
+    def test_decode_without_text_omits_text_fields(self, plans_document: dict[str, Any]) -> None:
+        """Test that the table loads without the deferred text file."""
+        columnar, _ = encode_columnar(plans_document)
+
+        plans = decode_columnar(columnar)["plans"]
+
+        assert "special_terms" not in plans[0]
+        assert plans[2]["tdu_area"] == "CENTERPOINT"
+
+
+class TestColumnarArtifacts:
+    """Tests for write_columnar_artifacts."""
+
+    def test_write_columnar_artifacts(self, plans_document: dict[str, Any], tmp_path: Path) -> None:
+        """Test that artifacts and their gzip variants decode to the same data."""
+        sizes = write_columnar_artifacts(plans_document, tmp_path)
+
+        columnar = json.loads(gzip.decompress((tmp_path / f"{COLUMNAR_FILENAME}.gz").read_bytes()))
+        text = json.loads((tmp_path / TEXT_FILENAME).read_text(encoding="utf-8"))
+
+        assert decode_columnar(columnar, text) == plans_document
+        assert sizes[COLUMNAR_FILENAME]["raw"] == (tmp_path / COLUMNAR_FILENAME).stat().st_size
@@ -0,0 +1,104 @@
+"""
+Test suite for the vectorized cost engine (scripts/cost_engine.py).
+
+Tests cover:
+- Rate interpolation matching cost-calculator.ts
+- Bill credits and local tax
+- Bit-identical agreement between the vectorized and scalar paths
+"""
+
+from typing import Any
+
+import numpy as np
+import pytest
+from cost_engine import (
+    PlanArrays,
+    annual_cost,
+    annual_costs,
+    annual_tdu_costs,
+    interpolate_rates,
+    parse_bill_credit,
+)
+
+PLANS: list[dict[str, Any]] = [
+    {
+        "plan_id": "fixed",
+        "tdu_area": "ONCOR",
+        "price_kwh_500": 16.0,
+        "price_kwh_1000": 14.0,
+        "price_kwh_2000": 13.0,
+        "base_charge_monthly": 9.95,
+    },
+    {
+        "plan_id": "credit",
+        "tdu_area": "LPL",
+        "price_kwh_500": 20.1,
+        "price_kwh_1000": 11.3,
+        "price_kwh_2000": 15.7,
+        "base_charge_monthly": None,
+        "special_terms": "$100 bill credit applied when usage is between 1000-2000 kWh",
+    },
+]
+TDU_RATES = {"ONCOR": {"monthly_base_charge": 4.23, "per_kwh_rate": 5.5833}}
+
+
+class TestInterpolateRates:
+    """Tests for the piecewise-linear rate interpolation."""
+
+    def test_matches_front_end(self) -> None:
+        """Test the piecewise-linear rate at and between the EFL usage points."""
+        plans = PlanArrays.from_plans(PLANS[:1])
+        usage = np.array([[250.0], [500.0], [750.0], [1000.0], [1500.0], [2000.0], [3000.0]])
+
+        rates = interpolate_rates(usage, plans)[:, 0]
+
+        assert rates.tolist() == [16.0, 16.0, 15.0, 14.0, 13.5, 13.0, 13.0]
+
+
+class TestParseBillCredit:
+    """Tests for bill credit parsing from special terms."""
+
+    def test_range_exact_and_missing(self) -> None:
+        """Test range, exact-usage and missing credit terms."""
+        assert parse_bill_credit(PLANS[1]["special_terms"]) == (100.0, 1000.0, 2000.0)
+        assert parse_bill_credit("$50 bill credit at exactly 1000 kWh") == (50.0, 1000.0, 1000.0)
+        assert parse_bill_credit("No credits") is None
+        assert parse_bill_credit(None) is None
+
+
+class TestAnnualCosts:
+    """Tests for the vectorized annual cost calculation."""
+
+    @pytest.mark.parametrize("local_tax_rate", [0.0, 0.02])
+    def test_vectorized_matches_scalar_exactly(self, local_tax_rate: float) -> None:
+        """Test that the batch engine reproduces the scalar calculation bit for bit."""
+        rng = np.random.default_rng(7)
+        profiles = rng.uniform(0, 3500, size=(50, 12)).round()
+
+        totals = annual_costs(profiles, PlanArrays.from_plans(PLANS), local_tax_rate)
+
+        expected = [
+            [annual_cost(p, plan, local_tax_rate) for plan in PLANS] for p in profiles.tolist()
+        ]
+        assert totals.shape == (50, 2)
+        assert np.array_equal(totals, np.array(expected))
+
+    def test_bill_credit_applies_inside_window(self) -> None:
+        """Test that the credit only lowers months whose usage is in the window."""
+        plans = PlanArrays.from_plans(PLANS[1:])
+        in_window = annual_costs([1000.0] * 12, plans)[0, 0]
+        outside = annual_costs([999.0] * 12, plans)[0, 0]
+
+        assert in_window == pytest.approx(12 * (1000 * 11.3 / 100 - 100))
+        assert outside > in_window
+
+    def test_tdu_costs_and_profile_validation(self) -> None:
+        """Test TDU delivery charges (NaN for unknown TDUs) and the 12-month check."""
+        plans = PlanArrays.from_plans(PLANS, TDU_RATES)
+
+        tdu = annual_tdu_costs([1000.0] * 12, plans)[0]
+
+        assert tdu[0] == pytest.approx(12 * (4.23 + 55.833))
+        assert np.isnan(tdu[1])
+        with pytest.raises(ValueError, match="12 monthly values"):
+            annual_costs([1000.0] * 11, plans)
@@ -0,0 +1,385 @@
+"""
+Tests for EFL-based early termination fee enrichment.
+
+Tests cover:
+- ETF extraction from EFL text
+- The concurrent enrichment stage (URL deduplication, plan selection)
+- The persistent EFL cache (conditional GETs, content hashing, eviction)
+- Bounded PDF text extraction (early exit, extractor fallback, limits, pool restarts)
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Callable, Generator
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import efl_etf
+import pytest
+import run_metrics
+from efl_cache import EflCache
+
+
+class TestExtractEtfFromText:
+    """Tests for extract_etf_from_text pattern matching."""
+
+    def test_no_fee(self) -> None:
+        """Test that explicit no-fee language is detected."""
+        assert efl_etf.extract_etf_from_text("There is NO early termination fee.") == {
+            "structure": "none",
+            "source": "efl",
+        }
+
+    def test_per_month_fee(self) -> None:
+        """Test per-month-remaining fee extraction."""
+        result = efl_etf.extract_etf_from_text(
+            "Early Termination Fee: $15.00 per month remaining on the contract"
+        )
+        assert result == {"structure": "per-month", "per_month_rate": 15.0, "source": "efl"}
+
+    def test_flat_fee(self) -> None:
+        """Test flat fee extraction."""
+        result = efl_etf.extract_etf_from_text("Early Termination Fee:\n  $150")
+        assert result == {"structure": "flat", "flat_fee": 150.0, "source": "efl"}
+
+    def test_unknown_and_empty(self) -> None:
+        """Test fee mention without an amount, and empty input."""
+        assert efl_etf.extract_etf_from_text("see cancellation fee schedule") == {
+            "structure": "unknown",
+            "source": "efl",
+        }
+        assert efl_etf.extract_etf_from_text("") is None
+
+    def test_phrase_priority_beats_position(self) -> None:
+        """Test that a higher-priority phrase wins even when it occurs later."""
+        text = "Early Termination Fee: $150. Or $10 per month remaining."
+        assert efl_etf.extract_etf_from_text(text) == {
+            "structure": "per-month",
+            "per_month_rate": 10.0,
+            "source": "efl",
+        }
+        assert efl_etf.extract_etf_from_text(text + " No cancellation fee.") == {
+            "structure": "none",
+            "source": "efl",
+        }
+
+
+class TestEnrichPlansWithEflEtf:
+    """Tests for the EFL enrichment stage."""
+
+    @pytest.fixture(autouse=True)
+    def _isolate(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(efl_etf, "EFL_ETF_LOOKUP", True)
+        monkeypatch.setattr(efl_etf, "EFL_ETF_ALLOWED_DOMAINS", set())
+        monkeypatch.setattr(efl_etf, "EFL_ETF_AUTO_DOMAINS", set())
+        monkeypatch.setattr(efl_etf, "_create_pdf_pool", lambda: None)
+
+    def test_fetches_each_url_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that shared EFL URLs are fetched once and applied to every plan."""
+        calls: list[str] = []
+
+        def fake_fetch(url: str, *_: Any) -> dict[str, Any]:
+            calls.append(url)
+            return {"structure": "flat", "flat_fee": 99.0, "source": "efl"}
+
+        monkeypatch.setattr(efl_etf, "fetch_etf_from_efl", fake_fetch)
+        plans = [
+            {"efl_url": "https://a.example/efl.pdf", "early_termination_fee": 0.0},
+            {"efl_url": "https://a.example/efl.pdf", "early_termination_fee": None},
+            {"efl_url": "https://b.example/efl.pdf", "early_termination_fee": 150.0},
+            {"efl_url": "", "early_termination_fee": 0.0},
+        ]
+
+        result = efl_etf.enrich_plans_with_efl_etf(iter(plans))
+
+        assert calls == ["https://a.example/efl.pdf"]
+        assert result[0]["etf_details"]["flat_fee"] == 99.0
+        assert result[1]["etf_details"] == result[0]["etf_details"]
+        assert result[0]["etf_details"] is not result[1]["etf_details"]
+        assert "etf_details" not in result[2]
+        assert "etf_details" not in result[3]
+
+    def test_respects_max_fetches(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the number of distinct EFL fetches is capped."""
+        calls: list[str] = []
+        monkeypatch.setattr(efl_etf, "EFL_ETF_MAX_FETCHES", 2)
+        monkeypatch.setattr(
+            efl_etf, "fetch_etf_from_efl", lambda url, *_: calls.append(url) or None
+        )
+        plans = [{"efl_url": f"https://x.example/{i}.pdf"} for i in range(5)]
+
+        efl_etf.enrich_plans_with_efl_etf(plans)
+
+        assert sorted(calls) == ["https://x.example/0.pdf", "https://x.example/1.pdf"]
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, status_code: int, content: bytes = b"", headers: Any = None) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode("utf-8")
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        assert self.status_code < 400
+
+
+class FakeSession:
+    """Session that replays queued responses and records request headers."""
+
+    def __init__(self, *responses: FakeResponse) -> None:
+        self.responses = list(responses)
+        self.sent_headers: list[dict[str, str]] = []
+
+    def get(self, url: str, timeout: int, headers: dict[str, str]) -> FakeResponse:
+        self.sent_headers.append(headers)
+        return self.responses.pop(0)
+
+
+class TestEflCache:
+    """Tests for the persistent EFL cache."""
+
+    URL = "https://rep.example/efl.html"
+    BODY = b"Early Termination Fee: $150"
+
+    @pytest.fixture(autouse=True)
+    def _isolate(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(efl_etf, "EFL_ETF_LOOKUP", True)
+        monkeypatch.setattr(efl_etf, "EFL_ETF_ALLOWED_DOMAINS", set())
+        monkeypatch.setattr(efl_etf, "EFL_ETF_AUTO_DOMAINS", set())
+        monkeypatch.setattr(efl_etf, "_efl_etf_cache", {})
+
+    def _fetch(self, cache: EflCache, session: FakeSession) -> Any:
+        efl_etf._efl_etf_cache.clear()
+        return efl_etf.fetch_etf_from_efl(self.URL, session, cache=cache)  # type: ignore[arg-type]
+
+    def test_revisit_uses_conditional_get(self, tmp_path: Path) -> None:
+        """Test that validators are persisted and a 304 reuses the cached result."""
+        cache = EflCache(tmp_path)
+        first = self._fetch(cache, FakeSession(FakeResponse(200, self.BODY, {"ETag": '"v1"'})))
+        cache.save()
+
+        reloaded = EflCache(tmp_path)
+        session = FakeSession(FakeResponse(304))
+        assert (
+            self._fetch(reloaded, session)
+            == first
+            == {
+                "structure": "flat",
+                "flat_fee": 150.0,
+                "source": "efl",
+            }
+        )
+        assert session.sent_headers == [{"If-None-Match": '"v1"'}]
+
+    def test_unchanged_body_skips_parse(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a body with a known SHA-256 is not parsed again."""
+        cache = EflCache(tmp_path)
+        cache.put(self.URL, hashlib.sha256(self.BODY).hexdigest(), {"structure": "none"})
+
+        def fail(text: str) -> None:
+            raise AssertionError("EFL should not be re-parsed")
+
+        monkeypatch.setattr(efl_etf, "extract_etf_from_text", fail)
+        assert self._fetch(cache, FakeSession(FakeResponse(200, self.BODY))) == {
+            "structure": "none"
+        }
+
+    @pytest.mark.parametrize(
+        "extraction",
+        [
+            efl_etf.PdfExtraction(),
+            efl_etf.PdfExtraction(text="Early Termination Fee: $150", limit="cpu"),
+        ],
+        ids=["empty", "limit"],
+    )
+    def test_incomplete_pdf_read_is_not_cached(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        extraction: efl_etf.PdfExtraction,
+    ) -> None:
+        """Test that a failed or cut-short PDF read is retried instead of cached."""
+        monkeypatch.setattr(efl_etf, "extract_pdf_text", lambda content: extraction)
+        cache = EflCache(tmp_path)
+        pdf = FakeResponse(200, b"%PDF-1.4", {"Content-Type": "application/pdf"})
+
+        self._fetch(cache, FakeSession(pdf))
+
+        assert cache.get(self.URL) is None
+
+    def test_eviction_by_ttl_and_size(self, tmp_path: Path) -> None:
+        """Test TTL expiry and the max-entries bound."""
+        cache = EflCache(tmp_path, ttl_days=30, max_entries=2)
+        for i in range(4):
+            cache.put(f"https://rep.example/{i}.pdf", str(i), None)
+
+        assert cache.evict() == 2
+        assert len(cache) == 2
+        assert cache.evict(now=datetime.now(UTC) + timedelta(days=31)) == 2
+        assert len(cache) == 0
+
+    def test_revalidation_leaves_shards_untouched(self, tmp_path: Path) -> None:
+        """Test that only a content change rewrites a shard; check times go to revalidated.json."""
+        cache = EflCache(tmp_path)
+        cache.put(self.URL, "abc", None, etag='"v1"')
+        cache.save()
+        (shard,) = tmp_path.glob("??.json")
+        os.utime(shard, ns=(1_000_000_000, 1_000_000_000))
+
+        reloaded = EflCache(tmp_path)
+        reloaded.touch(self.URL)
+        reloaded.put(self.URL, "abc", None, etag='"v1"')
+        reloaded.save()
+
+        assert shard.stat().st_mtime_ns == 1_000_000_000
+        assert "checked_at" not in json.loads(shard.read_text(encoding="utf-8"))[self.URL]
+        revalidated = json.loads((tmp_path / "revalidated.json").read_text(encoding="utf-8"))
+        assert list(revalidated) == [self.URL]
+        assert EflCache(tmp_path).evict(now=datetime.now(UTC) + timedelta(days=29)) == 0
+
+        reloaded.put(self.URL, "abc", {"structure": "none"}, etag='"v1"')
+        reloaded.save()
+
+        assert shard.stat().st_mtime_ns != 1_000_000_000
+
+    def test_unreadable_shard_is_reported(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that a corrupt shard is skipped with a warning on stderr."""
+        cache = EflCache(tmp_path)
+        cache.put(self.URL, "abc", None)
+        cache.save()
+        (tmp_path / "zz.json").write_text('{"https://', encoding="utf-8")
+
+        reloaded = EflCache(tmp_path)
+
+        assert reloaded.get(self.URL) is not None
+        assert "Ignoring unreadable EFL cache shard" in capsys.readouterr().err
+
+
+FILLER = [f"Average price per kWh 15.2 cents line {i}" for i in range(10)]
+
+
+def _spin_under_cpu_limit() -> None:
+    with efl_etf._document_limits(0.2, 0):
+        while True:
+            pass
+
+
+def _allocate_under_memory_limit() -> str:
+    try:
+        with efl_etf._document_limits(0, 64):
+            bytearray(512 * 1024 * 1024)
+    except MemoryError:
+        return "memory"
+    return "unlimited"
+
+
+def _exit_worker() -> None:
+    os._exit(1)
+
+
+class TestExtractPdfText:
+    """Tests for the bounded PDF text stage."""
+
+    def test_stops_at_the_page_with_the_etf(self, efl_pdf: Callable[..., bytes]) -> None:
+        """Test that the cheap extractor stops reading once the ETF is found."""
+        pytest.importorskip("pypdfium2")
+        pdf = efl_pdf([FILLER, [*FILLER, "Early Termination Fee: $150"], FILLER])
+        extraction = efl_etf.extract_pdf_text(pdf, max_pages=3)
+
+        assert extraction.extractor == "pdfium"
+        assert extraction.pages == 2
+        assert efl_etf.extract_etf_from_text(extraction.text) == {
+            "structure": "flat",
+            "flat_fee": 150.0,
+            "source": "efl",
+        }
+
+    def test_falls_back_to_layout_extraction(self, efl_pdf: Callable[..., bytes]) -> None:
+        """Test that pdfplumber only runs when the cheap text has no ETF section."""
+        pytest.importorskip("pypdfium2")
+        pytest.importorskip("pdfplumber")
+        extraction = efl_etf.extract_pdf_text(efl_pdf([FILLER, FILLER, FILLER]))
+
+        assert extraction.extractor == "pdfplumber"
+        assert extraction.pages == 4  # two pages per extractor
+        assert "line 9" in extraction.text
+        assert extraction.limit is None
+
+    def test_unreadable_pdf(self) -> None:
+        """Test that a corrupt document yields empty text instead of raising."""
+        extraction = efl_etf.extract_pdf_text(b"%PDF-1.4 truncated")
+        assert (extraction.text, extraction.extractor, extraction.pages) == ("", None, 0)
+
+    def test_cpu_budget_between_pages(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a document over its CPU budget stops after the current page."""
+
+        def slow_pages(content: bytes, max_pages: int) -> Generator[str, None, None]:
+            for _ in range(max_pages):
+                deadline = efl_etf.time.thread_time() + 0.05
+                while efl_etf.time.thread_time() < deadline:
+                    pass
+                yield "filler"
+
+        monkeypatch.setattr(efl_etf, "PDF_EXTRACTORS", (("slow", slow_pages),))
+        monkeypatch.setattr(efl_etf, "EFL_ETF_PDF_CPU_SECONDS", 0.01)
+        extraction = efl_etf.extract_pdf_text(b"%PDF", max_pages=50)
+
+        assert extraction.limit == "cpu"
+        assert extraction.pages == 1
+
+    def test_worker_limits(self) -> None:
+        """Test that pool workers enforce the CPU-time and memory limits."""
+        with ProcessPoolExecutor(max_workers=1, initializer=efl_etf._init_pdf_worker) as pool:
+            with pytest.raises(efl_etf.PdfLimitError):
+                pool.submit(_spin_under_cpu_limit).result(timeout=30)
+            assert pool.submit(_allocate_under_memory_limit).result(timeout=30) == "memory"
+
+    def test_pool_is_replaced_when_a_worker_dies(self, efl_pdf: Callable[..., bytes]) -> None:
+        """Test that documents after a dead worker are extracted by a fresh pool."""
+        pytest.importorskip("pypdfium2")
+        executor = ProcessPoolExecutor(max_workers=1, initializer=efl_etf._init_pdf_worker)
+        pool = efl_etf.PdfPool(executor)
+        with pytest.raises(BrokenExecutor):
+            executor.submit(_exit_worker).result(timeout=30)
+
+        try:
+            extraction = pool.extract(efl_pdf([["Early Termination Fee: $150"]]))
+        finally:
+            pool.shutdown()
+
+        assert extraction.extractor == "pdfium"
+        assert "Early Termination Fee" in extraction.text
+
+    def test_fetch_records_extraction_cost(
+        self, monkeypatch: pytest.MonkeyPatch, efl_pdf: Callable[..., bytes]
+    ) -> None:
+        """Test that each PDF's extraction cost is added to the run metrics."""
+        pytest.importorskip("pypdfium2")
+        url = "https://rep.example/efl.pdf"
+        monkeypatch.setattr(efl_etf, "EFL_ETF_LOOKUP", True)
+        monkeypatch.setattr(efl_etf, "EFL_ETF_ALLOWED_DOMAINS", set())
+        monkeypatch.setattr(efl_etf, "EFL_ETF_AUTO_DOMAINS", set())
+        monkeypatch.setattr(efl_etf, "_efl_etf_cache", {})
+        metrics = run_metrics.RunMetrics()
+        monkeypatch.setattr(run_metrics, "METRICS", metrics)
+
+        pdf = efl_pdf([["No early termination fee"]])
+        session = FakeSession(FakeResponse(200, pdf, {"Content-Type": "application/pdf"}))
+        result = efl_etf.fetch_etf_from_efl(url, session)  # type: ignore[arg-type]
+
+        assert result == {"structure": "none", "source": "efl"}
+        (record,) = metrics.records["efl.pdf_extraction"]
+        assert record["url"] == url
+        assert record["bytes"] == len(pdf)
+        assert (record["extractor"], record["pages"]) == ("pdfium", 1)
+        assert metrics.counters["efl.pdf_extractor.pdfium"] == 1
@@ -0,0 +1,226 @@
+"""
+Test suite for the Power to Choose fetch pipeline (scripts/fetch_plans.py).
+
+Tests cover:
+- Hedged endpoint racing against a local stub HTTP server
+- Streaming CSV ingestion
+- CSV schema adapter column resolution
+- Fingerprint deduplication
+- TDU name normalization
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import fetch_plans
+import pytest
+import run_metrics
+from csv_schema import CsvSchemaAdapter
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SAMPLE_CSV = (FIXTURES_DIR / "power_to_choose_sample.csv").read_bytes()
+
+
+class StubPowerToChooseHandler(BaseHTTPRequestHandler):
+    """Serves the fixture CSV on /csv (after 0.2s) and /slow (after 1s); fails on /down."""
+
+    def do_GET(self) -> None:
+        if self.path == "/down":
+            self.send_error(503)
+            return
+        time.sleep(1.0 if self.path == "/slow" else 0.2)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Content-Length", str(len(SAMPLE_CSV)))
+        self.end_headers()
+        self.wfile.write(SAMPLE_CSV)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def stub_server() -> Iterator[str]:
+    """Run the stub Power to Choose server on a free local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubPowerToChooseHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestRaceEndpoints:
+    """Tests for hedged endpoint racing."""
+
+    @pytest.fixture(autouse=True)
+    def _fast_retries(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(fetch_plans, "MAX_RETRIES", 1)
+        monkeypatch.setattr(fetch_plans, "FETCH_HEDGE_DELAY", 0.0)
+
+    def test_first_valid_response_wins(self, stub_server: str) -> None:
+        """Test that a failing and a slow endpoint don't block the fast one."""
+        endpoints = [
+            {"name": "Down", "url": f"{stub_server}/down", "type": "csv"},
+            {"name": "Slow", "url": f"{stub_server}/slow", "type": "json"},
+            {"name": "Fast", "url": f"{stub_server}/csv", "type": "csv"},
+        ]
+        content, data_type, report = asyncio.run(fetch_plans.race_endpoints(endpoints))
+
+        assert data_type == "csv"
+        assert "".join(content).startswith("[idKey]")
+        assert report["Down"]["status"] == "failed"
+        assert report["Slow"]["status"] == "cancelled"
+        assert report["Fast"]["status"] == "won"
+        assert report["Fast"]["seconds"] < 1.0
+
+    def test_losing_responses_are_closed(
+        self, stub_server: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a request still running when the race is decided has its response closed."""
+        closed: list[fetch_plans.StreamedBody] = []
+        close = fetch_plans.StreamedBody.close
+
+        def record_close(body: fetch_plans.StreamedBody) -> None:
+            closed.append(body)
+            close(body)
+
+        monkeypatch.setattr(fetch_plans.StreamedBody, "close", record_close)
+        endpoints = [
+            {"name": "Slow", "url": f"{stub_server}/slow", "type": "csv"},
+            {"name": "Fast", "url": f"{stub_server}/csv", "type": "csv"},
+        ]
+
+        content, _, report = asyncio.run(fetch_plans.race_endpoints(endpoints))
+
+        assert report["Slow"]["status"] == "cancelled"
+        deadline = time.monotonic() + 5
+        while not closed and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(closed) == 1
+        assert closed[0] is not content
+
+    def test_all_endpoints_failing_raises(self, stub_server: str) -> None:
+        """Test that a RuntimeError summarizes every endpoint failure."""
+        endpoints = [
+            {"name": "Down A", "url": f"{stub_server}/down", "type": "csv"},
+            {"name": "Down B", "url": f"{stub_server}/down", "type": "csv"},
+        ]
+        with pytest.raises(RuntimeError, match=r"Down A.*Down B"):
+            asyncio.run(fetch_plans.race_endpoints(endpoints))
+
+
+class TestStreamingCsv:
+    """Tests for chunked decoding and streamed CSV parsing."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 64, 65536])
+    def test_streamed_parse_matches_full_text(self, chunk_size: int) -> None:
+        """Test that any chunking yields the same plans as parsing the whole text."""
+        raw = b"\xef\xbb\xbf" + SAMPLE_CSV.replace(b"\n", b"\r\n")
+        chunks = [raw[i : i + chunk_size] for i in range(0, len(raw), chunk_size)]
+
+        streamed = fetch_plans.iter_csv_plans(
+            fetch_plans.iter_text_lines(fetch_plans.iter_decoded_chunks(chunks))
+        )
+
+        assert list(streamed) == fetch_plans.parse_csv_to_plans(raw.decode("utf-8"))
+
+    def test_line_splitting_matches_splitlines(self) -> None:
+        """Test CR, LF and CRLF boundaries split across chunks."""
+        text = 'a,b\r\n1,"x\r\ny"\r\n\r2,z\n3,w'
+        for size in range(1, 6):
+            chunks = [text[i : i + size] for i in range(0, len(text), size)]
+            assert list(fetch_plans.iter_text_lines(chunks)) == text.splitlines()
+
+
+class TestCsvSchemaAdapter:
+    """Tests for header resolution into column indices."""
+
+    def test_alias_priority_and_fallback(self) -> None:
+        """Test that the first non-empty alias wins and empty cells fall through."""
+        schema = CsvSchemaAdapter(["[kwh1000]", "Price/kWh 1000", "[RepCompany]"])
+
+        assert schema.has_brackets
+        assert schema.extract(["0.12", "0.99", "REP"]).price_1000 == "0.12"
+        assert schema.extract(["", "0.99", "REP"]).price_1000 == "0.99"
+
+    def test_short_rows_and_duplicate_headers(self) -> None:
+        """Test missing trailing cells and DictReader-style duplicate handling."""
+        schema = CsvSchemaAdapter(["plan_id", "rep_name", "plan_id"])
+
+        assert schema.extract(["1", "REP", "2"]).plan_id == "2"
+        assert schema.extract(["1"]).rep_name == ""
+        assert schema.extract(["1"]).plan_id == ""
+
+
+class TestDeduplication:
+    """Tests for tuple fingerprints and preference-based deduplication."""
+
+    def test_key_matches_json_fingerprint(self) -> None:
+        """Test that plans share a key exactly when they share a JSON fingerprint."""
+        base = {"rep_name": "rep ", "tdu_area": "oncor", "price_kwh_1000": 12.3456}
+        variants = [
+            base,
+            {**base, "rep_name": "REP", "price_kwh_1000": 12.3459},
+            {**base, "price_kwh_1000": 12.3449},
+            {**base, "rate_type": "fixed", "is_prepaid": 0},
+            {**base, "early_termination_fee": 150.004},
+            {**base, "early_termination_fee": 150.0},
+        ]
+
+        for a in variants:
+            for b in variants:
+                assert (
+                    fetch_plans.plan_fingerprint_key(a) == fetch_plans.plan_fingerprint_key(b)
+                ) == (
+                    fetch_plans.create_plan_fingerprint(a) == fetch_plans.create_plan_fingerprint(b)
+                )
+
+    def test_preferred_plan_wins_in_first_seen_position(self) -> None:
+        """Test that the English duplicate replaces the Spanish one without reordering."""
+        shared = {"rep_name": "REP", "tdu_area": "ONCOR", "price_kwh_1000": 12.0}
+        plans = [
+            {**shared, "plan_id": "es", "plan_name": "Plan Energía", "language": "Spanish"},
+            {**shared, "plan_id": "other", "plan_name": "Other", "price_kwh_1000": 13.0},
+            {**shared, "plan_id": "en", "plan_name": "Energy Plan", "language": "English"},
+            {**shared, "plan_id": "en-long", "plan_name": "Energy Plan " * 5},
+        ]
+
+        unique = fetch_plans.deduplicate_plans(plans)
+
+        assert [plan["plan_id"] for plan in unique] == ["en", "other"]
+
+
+class TestNormalizeTduName:
+    """Tests for TDU name normalization."""
+
+    @pytest.mark.parametrize(
+        ("raw", "code"),
+        [
+            ("Oncor Electric Delivery Company ", "ONCOR"),
+            ("CENTERPOINT ENERGY HOUSTON ELECTRIC LLC - RESIDENTIAL", "CENTERPOINT"),
+            ("TEXAS-NEW MEXICO", "TNMP"),
+            ("AEP Texas North Co", "AEP_NORTH"),
+            ("", "UNKNOWN"),
+            ("Entergy Texas", "ENTERGY TEXAS"),
+        ],
+    )
+    def test_exact_partial_and_unmatched(self, raw: str, code: str) -> None:
+        """Test exact, partial (both directions) and pass-through names."""
+        assert fetch_plans.normalize_tdu_name(raw) == code
+
+    def test_unmatched_names_are_recorded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that rows with unrecognized TDU names are counted per name."""
+        metrics = run_metrics.RunMetrics()
+        monkeypatch.setattr(run_metrics, "METRICS", metrics)
+        text = SAMPLE_CSV.decode("utf-8-sig").replace("AEP TEXAS CENTRAL COMPANY", "Entergy Texas")
+
+        plans = fetch_plans.parse_csv_to_plans(text)
+
+        assert [plan["tdu_area"] for plan in plans].count("ENTERGY TEXAS") == 2
+        assert metrics.counters["parse.tdu_unmatched"] == 2
+        assert metrics.counters["parse.tdu_unmatched.ENTERGY TEXAS"] == 2
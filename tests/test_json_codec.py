@@ -0,0 +1,76 @@
+"""
+Tests for JSON serialization (scripts/json_codec.py).
+
+Tests cover:
+- Same bytes as the standard library with either backend
+- Fallback for values orjson refuses, and non-finite floats
+- Decode errors
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import json_codec
+import pytest
+
+DOCUMENT = {
+    "last_updated": "2026-01-10T06:00:00+00:00",
+    "plans": [
+        {"plan_id": "1", "rep_name": "ÉNERGIE", "price_kwh_1000": 14.2, "term_months": 12},
+        {"plan_id": "2", "etf_details": None, "is_prepaid": False, "fees": [], "extra": {}},
+    ],
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def codec_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run a test with each backend."""
+    if request.param == "json":
+        monkeypatch.setattr(json_codec, "_load_orjson", lambda: None)
+    elif json_codec.backend() != "orjson":
+        pytest.skip("orjson is not installed")
+    return json_codec.backend()
+
+
+class TestEncode:
+    """Tests for encoding with either backend."""
+
+    def test_matches_standard_library(self, codec_backend: str) -> None:
+        """Test that compact and indented output is byte-identical to json.dumps."""
+        assert json_codec.dumps(DOCUMENT) == json.dumps(
+            DOCUMENT, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        assert json_codec.dumps(DOCUMENT, pretty=True) == json.dumps(
+            DOCUMENT, indent=2, ensure_ascii=False
+        ).encode("utf-8")
+        assert json_codec.dumps(DOCUMENT, pretty=True, sort_keys=True) == json.dumps(
+            DOCUMENT, indent=2, ensure_ascii=False, sort_keys=True
+        ).encode("utf-8")
+        assert json_codec.loads(json_codec.dumps(DOCUMENT)) == DOCUMENT
+
+    @pytest.mark.parametrize("value", [{1: "a"}, [2**70]], ids=str)
+    def test_values_outside_orjson_fall_back(self, codec_backend: str, value: Any) -> None:
+        """Test that non-string keys and big integers encode like the standard library."""
+        assert json_codec.dumps(value) == json.dumps(value, separators=(",", ":")).encode("utf-8")
+        assert json_codec.loads(json.dumps(value)) == json.loads(json.dumps(value))
+
+    def test_non_finite_floats(self, codec_backend: str) -> None:
+        """Test that NaN literals still decode, and encode as null with orjson."""
+        assert json_codec.loads("[NaN]")[0] != json_codec.loads("[NaN]")[0]
+        expected = b"[null]" if codec_backend == "orjson" else b"[NaN]"
+        assert json_codec.dumps([float("nan")]) == expected
+
+
+class TestErrors:
+    """Tests for encode and decode errors."""
+
+    def test_unserializable_and_invalid(self, codec_backend: str, tmp_path: Path) -> None:
+        """Test that errors are the standard library's exception types."""
+        path = tmp_path / "broken.json"
+        path.write_text('{"plans": [', encoding="utf-8")
+
+        with pytest.raises(TypeError):
+            json_codec.dumps({"when": object()})
+        with pytest.raises(json_codec.JSONDecodeError):
+            json_codec.load(path)
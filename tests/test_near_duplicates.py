@@ -0,0 +1,59 @@
+"""
+Test suite for near-duplicate clustering (scripts/near_duplicates.py).
+
+Tests cover:
+- Tolerance matching, blocking and similarity scores
+- Transitive clusters and comparison counts
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from near_duplicates import cluster_near_duplicates, similarity
+
+
+class TestSimilarity:
+    """Tests for the tolerance-relative similarity score."""
+
+    def test_scores_and_tolerance(self) -> None:
+        """Test scores relative to tolerance and rejection beyond it."""
+        assert similarity([1.0, 10.0], [1.0, 10.0], [0.5, 2.0]) == 1.0
+        assert similarity([1.0, 10.0], [1.5, 11.0], [0.5, 2.0]) == pytest.approx(0.25)
+        assert similarity([1.0, 10.0], [1.0, 12.5], [0.5, 2.0]) is None
+
+
+class TestClusterNearDuplicates:
+    """Tests for cluster_near_duplicates."""
+
+    def test_clusters_noise_and_fee_changes_within_blocks(
+        self, make_plan: Callable[..., dict[str, Any]]
+    ) -> None:
+        """Test that float noise and small ETF changes cluster, other blocks do not."""
+        plans = [
+            make_plan("b", 14.9),
+            make_plan("a", 14.899999999999999, early_termination_fee=175.0),
+            make_plan("other-term", 14.9, term_months=24),
+            make_plan("other-rep", 14.9, rep_name="OTHER"),
+            make_plan("far-etf", 14.9, early_termination_fee=295.0),
+            make_plan("cheaper", 13.9),
+        ]
+
+        result = cluster_near_duplicates(plans)
+
+        assert len(result["clusters"]) == 1
+        cluster = result["clusters"][0]
+        assert cluster["id"] == "a"
+        assert cluster["plan_ids"] == ["b", "a"]
+        assert 0.0 < cluster["similarity"] < 1.0
+        assert set(cluster["scores"]) == {"a", "b"}
+        # "cheaper" shares the block but not a price bucket, so it is never compared
+        assert result["comparisons"] == 3
+
+    def test_matches_merge_transitively(self, make_plan: Callable[..., dict[str, Any]]) -> None:
+        """Test that chained matches form one cluster across bucket boundaries."""
+        plans = [make_plan(str(i), 14.0 + 0.04 * i) for i in range(4)]
+
+        clusters = cluster_near_duplicates(plans)["clusters"]
+
+        assert [cluster["plan_ids"] for cluster in clusters] == [["0", "1", "2", "3"]]
@@ -0,0 +1,61 @@
+"""
+Tests for numeric field parsing (scripts/numeric_fields.py).
+
+Tests cover:
+- Bit-identical results to the original cleanup-first parsers
+- The batch column API
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from numeric_fields import parse_column, parse_float, parse_int, parse_price
+from numeric_reference import (
+    NUMERIC_EDGE_CASES,
+    exact_bits,
+    parse_float_cleanup_first,
+    parse_int_cleanup_first,
+    parse_price_cleanup_first,
+)
+
+PARSERS = [
+    (parse_price, parse_price_cleanup_first),
+    (parse_float, parse_float_cleanup_first),
+    (parse_int, parse_int_cleanup_first),
+]
+
+
+class TestParsers:
+    """Tests for the per-value parsers."""
+
+    @pytest.mark.parametrize(("parser", "original"), PARSERS)
+    def test_matches_original_parsers(
+        self, parser: Callable[[Any], Any], original: Callable[[Any], Any]
+    ) -> None:
+        """Test that every edge case parses to the same type and bits, memoized or not."""
+        expected = exact_bits([original(value) for value in NUMERIC_EDGE_CASES])
+
+        assert exact_bits([parser(value) for value in NUMERIC_EDGE_CASES]) == expected
+        assert exact_bits([parser(value) for value in NUMERIC_EDGE_CASES]) == expected  # memo hits
+
+    def test_examples(self) -> None:
+        """Test the conversions the pipeline relies on."""
+        assert parse_price("0.1560") == pytest.approx(15.6)
+        assert parse_price("$12.5") == 12.5
+        assert parse_float("15¢") == 15.0
+        assert parse_float("") is None
+        assert parse_int("12 months") == 12
+        assert parse_int("9" * 17) == int(float("9" * 17))  # long digit strings go through float
+
+
+class TestParseColumn:
+    """Tests for the batch column API."""
+
+    def test_matches_per_value_calls(self) -> None:
+        """Test that a column matches per-value calls without mixing equal keys of other types."""
+        values = ["0.5", "0.5", "12", None, 1, True, "1", "abc", 0.25]
+
+        assert parse_column(values, parse_int) == [parse_int(value) for value in values]
+        assert parse_column(values, parse_int)[5] is True
+        assert parse_column(values, parse_price) == [parse_price(value) for value in values]
@@ -0,0 +1,105 @@
+"""
+Test suite for snapshot diffs (scripts/plan_diff.py).
+
+Tests cover:
+- Added, removed, relisted, repriced and changed classification
+- Consecutive-day series over an archive directory or the archive store
+"""
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from archive_store import ArchiveStore
+from plan_diff import diff_snapshots, iter_series_diffs
+
+
+def snapshot(*plans: dict[str, Any]) -> dict[str, Any]:
+    """Wrap plans in a plans.json document."""
+    return {"last_updated": "2026-01-10", "total_plans": len(plans), "plans": list(plans)}
+
+
+class TestDiffSnapshots:
+    """Tests for diff_snapshots."""
+
+    def test_classifies_changes(self, make_plan: Callable[..., dict[str, Any]]) -> None:
+        """Test every change category on a small pair of snapshots."""
+        old = snapshot(
+            make_plan("same"),
+            make_plan("price", 14.2),
+            make_plan("url"),
+            make_plan("gone", 9.9),
+            make_plan("old-id", 11.1),
+        )
+        new = snapshot(
+            make_plan("same"),
+            make_plan("price", 13.5),
+            make_plan("url", efl_url="https://example.com/new.pdf"),
+            make_plan("new-id", 11.1),
+            make_plan("fresh", 16.0),
+        )
+
+        changes = diff_snapshots(old, new)
+
+        assert changes["summary"] == {
+            "added": 1,
+            "removed": 1,
+            "relisted": 1,
+            "repriced": 1,
+            "changed": 1,
+            "unchanged": 1,
+        }
+        assert changes["added"][0]["plan_id"] == "fresh"
+        assert changes["removed"][0]["plan_id"] == "gone"
+        assert changes["relisted"][0]["previous_plan_id"] == "old-id"
+        assert changes["repriced"][0]["price_kwh_1000"] == [14.2, 13.5]
+        assert changes["changed"][0] == {
+            "plan_id": "url",
+            "fields": {"efl_url": ["https://example.com/url.pdf", "https://example.com/new.pdf"]},
+        }
+
+
+class TestIterSeriesDiffs:
+    """Tests for iter_series_diffs over an archive directory or the archive store."""
+
+    def test_consecutive_days(
+        self, make_plan: Callable[..., dict[str, Any]], tmp_path: Path
+    ) -> None:
+        """Test that a series yields one diff per consecutive pair of days."""
+        days = {
+            "2026-01-10": snapshot(make_plan("a")),
+            "2026-01-11": snapshot(make_plan("a"), make_plan("b", 12.0)),
+            "2026-01-12": snapshot(make_plan("b", 12.0)),
+        }
+        for day, data in days.items():
+            (tmp_path / f"plans_{day}.json").write_text(json.dumps(data))
+
+        series = [
+            (old, new, changes["summary"]) for old, new, changes in iter_series_diffs(tmp_path)
+        ]
+
+        assert [(old, new) for old, new, _ in series] == [
+            ("plans_2026-01-10.json", "plans_2026-01-11.json"),
+            ("plans_2026-01-11.json", "plans_2026-01-12.json"),
+        ]
+        assert series[0][2]["added"] == 1
+        assert series[1][2]["removed"] == 1
+
+    def test_archive_store(self, make_plan: Callable[..., dict[str, Any]], tmp_path: Path) -> None:
+        """Test that the store, or its days/ directory, yields the same diffs as dated files."""
+        archive = tmp_path / "json-archive"
+        archive.mkdir()
+        store = ArchiveStore(tmp_path / "archive-store")
+        for day, data in (
+            ("2026-01-10", snapshot(make_plan("a"))),
+            ("2026-01-11", snapshot(make_plan("a", 13.0), make_plan("b", 12.0))),
+        ):
+            (archive / f"plans_{day}.json").write_text(json.dumps(data))
+            store.add_snapshot(day, data)
+
+        expected = list(iter_series_diffs(archive))
+
+        assert list(iter_series_diffs(store.root)) == expected
+        assert list(iter_series_diffs(store.days_dir)) == expected
+        assert expected[0][2]["summary"]["repriced"] == 1
@@ -0,0 +1,96 @@
+"""
+Tests for the compact plan record (scripts/plan_record.py).
+
+Tests cover:
+- Same keys, order and values as the parser's dicts
+- Mapping behaviour used by the pipeline stages
+- Interning of shared strings
+- Conversion to ElectricityPlan
+"""
+
+from pathlib import Path
+
+import pytest
+from fetch_plans import parse_csv_to_plans
+from models import ElectricityPlan
+from plan_record import PlanRecord, plans_as_dicts
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(scope="module")
+def records() -> list[PlanRecord]:
+    """Parse the sample CSV into records."""
+    sample = (FIXTURES_DIR / "power_to_choose_sample.csv").read_text(encoding="utf-8")
+    return parse_csv_to_plans(sample)
+
+
+class TestConversion:
+    """Tests for converting between records, dicts and models."""
+
+    def test_to_dict_round_trip(self, records: list[PlanRecord]) -> None:
+        """Test that to_dict() has the plans.json key order and from_dict() restores the record."""
+        plan = records[0].to_dict()
+
+        assert list(plan) == list(PlanRecord.FIELDS[:-1])  # etf_details omitted while unset
+        assert PlanRecord.from_dict(plan) == records[0]
+        assert plans_as_dicts([records[0], plan]) == [plan, plan]
+
+    def test_to_model(self, records: list[PlanRecord]) -> None:
+        """Test conversion to the validated model at the edges."""
+        model = records[0].to_model()
+
+        assert isinstance(model, ElectricityPlan)
+        assert model.plan_id == records[0].plan_id
+
+
+class TestMapping:
+    """Tests for the Mapping interface used by the pipeline stages."""
+
+    def test_mapping_behaviour(self, records: list[PlanRecord]) -> None:
+        """Test get, membership, length, iteration and item assignment."""
+        record = PlanRecord.from_dict(records[0].to_dict())
+
+        assert record["plan_id"] == record.plan_id
+        assert record.get("etf_details", {}) == {}
+        assert record.get("not_a_field", "x") == "x"
+        assert record.get("from_dict", "x") == "x"
+        assert "etf_details" not in record
+        assert len(record) == len(list(record)) == len(PlanRecord.FIELDS) - 1
+        for key in ("not_a_field", "to_dict", "FIELDS", "__class__"):
+            with pytest.raises(KeyError):
+                record[key]
+        with pytest.raises(KeyError):
+            record["not_a_field"] = 1
+
+        record["etf_details"] = {"structure": "flat"}
+
+        assert "etf_details" in record
+        assert len(record) == len(PlanRecord.FIELDS)
+        assert record.to_dict()["etf_details"] == {"structure": "flat"}
+        assert not hasattr(record, "__dict__")
+
+    def test_equals_mappings_with_the_same_items(self, records: list[PlanRecord]) -> None:
+        """Test that a record compares like a dict, against dicts and other records."""
+        record, plan = records[0], records[0].to_dict()
+
+        assert record == plan
+        assert plan == record
+        assert record == PlanRecord.from_dict(plan)
+        assert record != {**plan, "plan_id": "other"}
+        assert record != list(plan.items())
+
+
+class TestInterning:
+    """Tests for interning of shared strings."""
+
+    def test_shared_strings_are_interned(self, records: list[PlanRecord]) -> None:
+        """Test that records from separately built strings share one copy of each shared value."""
+        first = records[0].to_dict()
+        copy = {k: v.encode().decode() if isinstance(v, str) else v for k, v in first.items()}
+
+        a, b = PlanRecord.from_dict(first), PlanRecord.from_dict(copy)
+
+        assert a.rep_name is b.rep_name
+        assert a.tdu_area is b.tdu_area
+        assert a.rate_type is b.rate_type
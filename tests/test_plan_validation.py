@@ -0,0 +1,71 @@
+"""
+Test suite for bulk plan validation (scripts/plan_validation.py).
+
+Tests cover:
+- Per-row error reports from one list validation
+- Validation straight from plans.json bytes
+- EFL etf_details structures accepted by the schema
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from plan_validation import validate_plans, validate_plans_json
+
+
+@pytest.fixture
+def plans(make_plan: Callable[..., dict[str, Any]]) -> list[dict[str, Any]]:
+    """Four plans, the second and fourth invalid."""
+    return [
+        make_plan("ok"),
+        make_plan("bad-price", price_kwh_500="n/a", rate_type="WEIRD"),
+        make_plan("ok-2"),
+        make_plan("no-term", term_months=None),
+    ]
+
+
+class TestValidatePlans:
+    """Tests for validate_plans and validate_plans_json."""
+
+    def test_reports_every_invalid_row(self, plans: list[dict[str, Any]]) -> None:
+        """Test that all bad rows are reported, grouped per plan, in row order."""
+        result = validate_plans(plans)
+
+        assert result.total == 4
+        assert result.valid == 2
+        assert result.invalid_indices == {1, 3}
+        assert [report["plan_id"] for report in result.reports] == ["bad-price", "no-term"]
+        assert {error["field"] for error in result.reports[0]["errors"]} == {
+            "price_kwh_500",
+            "rate_type",
+        }
+        assert result.reports[1]["errors"][0]["type"] == "int_type"
+
+    def test_validate_json_matches_python(self, plans: list[dict[str, Any]]) -> None:
+        """Test that validating plans.json bytes yields the same reports."""
+        payload = json.dumps({"last_updated": "2026-01-08", "plans": plans}).encode()
+
+        assert validate_plans_json(payload).reports == validate_plans(plans).reports
+        with pytest.raises(ValueError, match="Not a plans document"):
+            validate_plans_json(b"[]")
+
+
+class TestEtfDetails:
+    """Tests for the etf_details structures written by EFL enrichment."""
+
+    @pytest.mark.parametrize(
+        "etf_details",
+        [
+            {"structure": "none", "source": "efl"},
+            {"structure": "per-month", "per_month_rate": 20.0, "source": "efl"},
+            {"structure": "flat", "flat_fee": 150.0, "source": "efl"},
+            {"structure": "unknown", "source": "efl"},
+        ],
+    )
+    def test_efl_etf_details_are_valid(
+        self, etf_details: dict[str, Any], make_plan: Callable[..., dict[str, Any]]
+    ) -> None:
+        """Test that every structure written by efl_etf.py passes validation."""
+        assert not validate_plans([make_plan("efl", etf_details=etf_details)]).reports
@@ -0,0 +1,98 @@
+"""
+Test suite for the price history index (scripts/price_history.py).
+
+Tests cover:
+- Incremental updates from dated files and from the archive store
+- Per-plan history and per-TDU daily medians
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from archive_store import ArchiveStore, migrate_archive, serialize_snapshot
+from price_history import (
+    median_by_tdu,
+    open_history,
+    plan_history,
+    update_from_archive,
+    update_from_store,
+)
+
+
+def write_day(archive: Path, day: str, *plans: dict[str, Any]) -> None:
+    """Write one day's plans.json snapshot to the archive."""
+    data = {"last_updated": f"{day}T07:00:00+00:00", "plans": list(plans)}
+    (archive / f"plans_{day}.json").write_bytes(serialize_snapshot(data))
+
+
+@pytest.fixture
+def archive(tmp_path: Path, make_plan: Callable[..., dict[str, Any]]) -> Path:
+    """An archive of two days, with three plans in two TDUs."""
+    archive = tmp_path / "json-archive"
+    archive.mkdir()
+    write_day(
+        archive,
+        "2026-01-10",
+        make_plan("1", 14.0),
+        make_plan("2", 16.0),
+        make_plan("3", 15.0, tdu_area="TNMP"),
+    )
+    write_day(archive, "2026-01-11", make_plan("1", 13.0), make_plan("3", 15.0, tdu_area="TNMP"))
+    return archive
+
+
+class TestUpdateFromArchive:
+    """Tests for incremental indexing and plan_history."""
+
+    def test_only_indexes_new_days(
+        self, archive: Path, tmp_path: Path, make_plan: Callable[..., dict[str, Any]]
+    ) -> None:
+        """Test that a second update skips days already indexed."""
+        conn = open_history(tmp_path / "history.sqlite3")
+
+        assert update_from_archive(conn, archive) == ["2026-01-10", "2026-01-11"]
+        write_day(archive, "2026-01-12", make_plan("1", 12.5))
+        assert update_from_archive(conn, archive) == ["2026-01-12"]
+
+        history = plan_history(conn, "1")
+        assert [(row["day"], row["price_kwh_1000"]) for row in history] == [
+            ("2026-01-10", 14.0),
+            ("2026-01-11", 13.0),
+            ("2026-01-12", 12.5),
+        ]
+
+
+class TestUpdateFromStore:
+    """Tests for indexing the archive store."""
+
+    def test_matches_dated_files(self, archive: Path, tmp_path: Path) -> None:
+        """Test that the store and the dated files it came from index the same rows."""
+        store = ArchiveStore(tmp_path / "store")
+        migrate_archive(archive, store)
+        from_files = open_history(tmp_path / "files.sqlite3")
+        from_store = open_history(tmp_path / "store.sqlite3")
+
+        update_from_archive(from_files, archive)
+
+        assert update_from_store(from_store, store) == ["2026-01-10", "2026-01-11"]
+        assert update_from_store(from_store, store) == []
+        assert median_by_tdu(from_store) == median_by_tdu(from_files)
+
+
+class TestMedianByTdu:
+    """Tests for median_by_tdu."""
+
+    def test_daily_medians(self, archive: Path, tmp_path: Path) -> None:
+        """Test per-TDU daily medians and the TDU filter."""
+        conn = open_history(tmp_path / "history.sqlite3")
+        update_from_archive(conn, archive)
+
+        assert median_by_tdu(conn, tdu_area="ONCOR") == [
+            {"tdu_area": "ONCOR", "day": "2026-01-10", "median": 15.0, "plans": 2},
+            {"tdu_area": "ONCOR", "day": "2026-01-11", "median": 13.0, "plans": 1},
+        ]
+        assert len(median_by_tdu(conn)) == 4
+        with pytest.raises(ValueError, match="Unknown price field"):
+            median_by_tdu(conn, field="plan_name")
@@ -0,0 +1,117 @@
+"""
+Test suite for precomputed rankings (scripts/rankings.py).
+
+Tests cover:
+- Seasonal usage estimation matching usage-estimator.ts
+- Early termination fees and quality scores matching the page's ranker
+- Term buckets and ordering by the page's combined score
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from cost_engine import annual_cost
+from rankings import build_rankings, early_termination_fee, estimate_usage_pattern, quality_score
+
+
+class TestEstimateUsagePattern:
+    """Tests for the port of usage-estimator.ts."""
+
+    @pytest.mark.parametrize(
+        ("average", "expected"),
+        [
+            (1000, [973, 892, 811, 770, 811, 1135, 1378, 1460, 1216, 811, 770, 973]),
+            (400, [389, 357, 324, 308, 324, 454, 551, 586, 486, 324, 308, 389]),
+        ],
+    )
+    def test_matches_front_end(self, average: int, expected: list[int]) -> None:
+        """Test the seasonal expansion (values produced by usage-estimator.ts)."""
+        pattern = estimate_usage_pattern(average)
+
+        assert pattern == expected
+        assert sum(pattern) == average * 12
+
+
+class TestEarlyTerminationFee:
+    """Tests for the port of ETFCalculator.calculateEarlyTerminationFee."""
+
+    @pytest.mark.parametrize(
+        ("fields", "expected"),
+        [
+            ({"etf_details": {"structure": "flat", "base_amount": 150}}, 150.0),
+            ({"etf_details": {"structure": "per-month-remaining", "base_amount": 20}}, 120.0),
+            ({"special_terms": "Cancellation fee: $15 per month remaining"}, 90.0),
+            ({"special_terms": "No early termination fee"}, 0.0),
+            ({"early_termination_fee": 50.0}, 0.0),
+            ({"early_termination_fee": 50.0, "term_months": 6}, 50.0),
+        ],
+    )
+    def test_fee(
+        self, make_plan: Callable[..., dict[str, Any]], fields: dict, expected: float
+    ) -> None:
+        """Test structured, text and legacy fees with six months remaining."""
+        assert early_termination_fee(make_plan("1", **fields), 6) == expected
+
+
+class TestQualityScore:
+    """Tests for the port of PlanRanker.calculateQualityScore."""
+
+    usage = estimate_usage_pattern(1000)
+
+    @pytest.mark.parametrize(
+        ("fields", "annual_cost", "expected"),
+        [
+            ({}, 1000.0, 100),
+            ({}, 1100.0, 90),
+            ({}, 2000.0, 60),
+            ({"base_charge_monthly": 24.0}, 1000.0, 97),
+            ({"early_termination_fee": 300.0}, 1000.0, 95),
+            ({"price_kwh_500": 28.0}, 1000.0, 82),
+            ({"rate_type": "VARIABLE"}, 1000.0, 0),
+            ({"is_prepaid": True}, 1000.0, 0),
+        ],
+    )
+    def test_penalties(
+        self,
+        make_plan: Callable[..., dict[str, Any]],
+        fields: dict,
+        annual_cost: float,
+        expected: int,
+    ) -> None:
+        """Test each penalty and automatic F grades (values produced by plan-ranker.ts)."""
+        plan = make_plan("1", **fields)
+
+        assert quality_score(plan, annual_cost, 1000.0, self.usage) == expected
+
+
+class TestBuildRankings:
+    """Tests for build_rankings."""
+
+    def test_bucket_and_order(self, make_plan: Callable[..., dict[str, Any]]) -> None:
+        """Test that auto-F plans rank last and buckets follow the combined score."""
+        plans = [
+            make_plan("mid", 14.0),
+            make_plan("cheap", 12.0),
+            make_plan("long", 11.0, term_months=36),
+            make_plan("variable", 5.0, rate_type="VARIABLE"),
+            make_plan("prepaid", 5.0, is_prepaid=True),
+        ]
+
+        document = build_rankings(plans, top_n=4, average_usage=(1000,))
+        oncor = document["rankings"]["ONCOR"]["1000"]
+
+        assert [plan_id for plan_id, _ in oncor["all"]] == ["long", "cheap", "mid", "variable"]
+        assert [plan_id for plan_id, _ in oncor["medium"]] == [
+            "cheap",
+            "mid",
+            "variable",
+            "prepaid",
+        ]
+        assert [plan_id for plan_id, _ in oncor["long"]] == ["long"]
+        assert "short" not in oncor
+        usage = document["profiles"]["1000"]
+        assert oncor["medium"][0][1] == round(annual_cost(usage, plans[1]), 2)
+        assert document["best_annual_cost"]["ONCOR"]["1000"] == pytest.approx(
+            annual_cost(usage, plans[3])
+        )
@@ -0,0 +1,67 @@
+"""
+Test suite for batch snapshot reprocessing (scripts/reprocess_archive.py).
+
+Tests cover:
+- Parallel reprocessing with reports in snapshot order
+- Output content and no leftover temporary files
+- Stored days reprocess to the same plans as their archive CSV
+"""
+
+import json
+from pathlib import Path
+
+import fetch_plans
+from archive_store import ArchiveStore
+from plan_record import plans_as_dicts
+from reprocess_archive import reprocess_archive, reprocess_store, stored_plans_csv
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+class TestReprocessArchive:
+    """Tests for reprocessing a batch of archived snapshots."""
+
+    def test_writes_ordered_results(self, tmp_path: Path) -> None:
+        """Test that every snapshot is reprocessed and reported in input order."""
+        source = tmp_path / "csv-archive"
+        source.mkdir()
+        sample = (FIXTURES_DIR / "power_to_choose_sample.csv").read_text(encoding="utf-8")
+        paths = []
+        for day in ("2026-01-12", "2026-01-10", "2026-01-11"):
+            path = source / f"plans_{day}.csv"
+            path.write_text(sample, encoding="utf-8")
+            paths.append(path)
+        output = tmp_path / "out"
+
+        reports = reprocess_archive(paths, output, workers=2)
+
+        assert [report["name"] for report in reports] == [path.name for path in paths]
+        assert sorted(p.name for p in output.iterdir()) == [
+            "plans_2026-01-10.json",
+            "plans_2026-01-11.json",
+            "plans_2026-01-12.json",
+        ]
+        document = json.loads((output / "plans_2026-01-10.json").read_text(encoding="utf-8"))
+        expected = fetch_plans.parse_csv_to_plans(sample)
+        assert document["plans"] == plans_as_dicts(expected)
+        assert document["unique_plans"] == len(fetch_plans.deduplicate_plans(expected))
+        assert document["unique_plans"] < document["total_plans"]
+
+    def test_store_matches_archive_csv(self, tmp_path: Path) -> None:
+        """Test that a stored day reprocesses to the plans of the CSV archived the same day."""
+        sample = (FIXTURES_DIR / "power_to_choose_sample.csv").read_text(encoding="utf-8")
+        plans = plans_as_dicts(fetch_plans.parse_csv_to_plans(sample))
+        store = ArchiveStore(tmp_path / "archive-store")
+        store.add_snapshot("2026-01-10", {"total_plans": len(plans), "plans": plans})
+        source = tmp_path / "csv-archive"
+        source.mkdir()
+        (source / "plans_2026-01-10.csv").write_text(stored_plans_csv(plans), encoding="utf-8")
+
+        reports = reprocess_store(store.root, ["2026-01-10"], tmp_path / "from-store", workers=1)
+        reprocess_archive([source / "plans_2026-01-10.csv"], tmp_path / "from-csv", workers=1)
+
+        assert [report["name"] for report in reports] == ["plans_2026-01-10.json"]
+        from_store = json.loads((tmp_path / "from-store" / "plans_2026-01-10.json").read_bytes())
+        from_csv = json.loads((tmp_path / "from-csv" / "plans_2026-01-10.json").read_bytes())
+        assert from_store["plans"] == from_csv["plans"] == plans
+        assert from_store["unique_plan_ids"] == from_csv["unique_plan_ids"]
@@ -0,0 +1,168 @@
+"""
+Test suite for run instrumentation (scripts/run_metrics.py).
+
+Tests cover:
+- Stage spans, nesting (per thread) and the decorator form
+- Thread-safe counters
+- Aggregated records, with the entries themselves only when profiling
+- run-metrics.json output and optional profilers
+"""
+
+import json
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+import run_metrics
+from run_metrics import RUN_METRICS_FILENAME, RunMetrics
+
+
+class TestSpans:
+    """Tests for stage spans."""
+
+    def test_spans_nest_and_record_times(self) -> None:
+        """Test that spans record depth and durations in start order."""
+        metrics = RunMetrics()
+
+        @metrics.timed("inner")
+        def work() -> int:
+            return sum(range(1000))
+
+        with metrics.span("outer"):
+            assert work() == 499500
+
+        stages = metrics.to_dict()["stages"]
+        assert [(stage["name"], stage["depth"]) for stage in stages] == [("outer", 0), ("inner", 1)]
+        assert stages[0]["seconds"] >= stages[1]["seconds"] >= 0
+
+    def test_depth_is_tracked_per_thread(self) -> None:
+        """Test that a span open in another thread does not nest this thread's spans."""
+        metrics = RunMetrics()
+        entered, release = threading.Event(), threading.Event()
+
+        def worker() -> None:
+            with metrics.span("worker"):
+                entered.set()
+                release.wait(timeout=5)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        entered.wait(timeout=5)
+        with metrics.span("main"), metrics.span("main.inner"):
+            pass
+        release.set()
+        thread.join()
+
+        depths = {stage["name"]: stage["depth"] for stage in metrics.to_dict()["stages"]}
+        assert depths == {"worker": 0, "main": 0, "main.inner": 1}
+
+
+class TestCounters:
+    """Tests for counters."""
+
+    def test_counters_are_thread_safe(self) -> None:
+        """Test concurrent increments from a thread pool."""
+        metrics = RunMetrics()
+
+        def bump(_: int) -> None:
+            for _ in range(1000):
+                metrics.count("efl.requests")
+            metrics.count("bytes_read", 10)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(bump, range(8)))
+
+        assert metrics.to_dict()["counters"] == {"bytes_read": 80, "efl.requests": 8000}
+
+
+class TestRecords:
+    """Tests for per-item records."""
+
+    @staticmethod
+    def _record_pages(metrics: RunMetrics) -> None:
+        for pages in range(1, 101):
+            metrics.record(
+                "efl.pdf_extraction", {"url": f"https://rep.example/{pages}.pdf", "pages": pages}
+            )
+
+    def test_only_aggregates_by_default(self) -> None:
+        """Test that entries are summarized as a count, total and percentiles."""
+        metrics = RunMetrics()
+        self._record_pages(metrics)
+
+        document = metrics.to_dict()
+
+        assert "records" not in document
+        assert document["record_stats"] == {
+            "efl.pdf_extraction": {
+                "count": 100,
+                "pages": {"total": 5050, "p50": 50, "p90": 90, "p99": 99, "max": 100},
+            }
+        }
+
+    def test_entries_are_kept_when_profiling(self) -> None:
+        """Test that PIPELINE_PROFILE=records adds every entry."""
+        metrics = RunMetrics("records")
+        self._record_pages(metrics)
+
+        document = metrics.to_dict()
+
+        assert len(document["records"]["efl.pdf_extraction"]) == 100
+        assert document["record_stats"]["efl.pdf_extraction"]["count"] == 100
+
+
+class TestWrite:
+    """Tests for run-metrics.json output and the profile modes."""
+
+    def test_write_with_profilers(self, tmp_path: Path) -> None:
+        """Test the metrics file with cProfile and tracemalloc sections."""
+        was_tracing = tracemalloc.is_tracing()
+        metrics = RunMetrics("cprofile, tracemalloc")
+        try:
+            with metrics.span("allocate"):
+                blob = [bytes(1024) for _ in range(100)]
+            metrics.write(tmp_path)
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+
+        document = json.loads((tmp_path / RUN_METRICS_FILENAME).read_text(encoding="utf-8"))
+        assert len(blob) == 100
+        assert document["stages"][0]["peak_bytes"] >= 100 * 1024
+        assert document["tracemalloc"]["peak_bytes"] >= document["stages"][0]["peak_bytes"]
+        assert document["cprofile"] and (tmp_path / "run-profile.prof").exists()
+
+    def test_enclosing_span_keeps_its_peak(self) -> None:
+        """Test that a nested span does not hide the enclosing span's earlier peak."""
+        was_tracing = tracemalloc.is_tracing()
+        metrics = RunMetrics("tracemalloc")
+        try:
+            with metrics.span("outer"):
+                blob = bytes(1024 * 1024)
+                del blob
+                with metrics.span("inner"):
+                    pass
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+
+        outer, inner = metrics.stages
+        assert outer["peak_bytes"] >= 1024 * 1024 > inner["peak_bytes"]
+
+    def test_unknown_profile_mode(self) -> None:
+        """Test that a misspelled PIPELINE_PROFILE mode is rejected."""
+        with pytest.raises(ValueError, match="cprofiler"):
+            RunMetrics("cprofiler")
+
+    def test_unknown_profile_mode_in_environment(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that an invalid PIPELINE_PROFILE falls back to the default with a warning."""
+        monkeypatch.setenv("PIPELINE_PROFILE", "cprofiler")
+
+        metrics = run_metrics._from_environment()
+
+        assert not metrics.keep_records and metrics.profiler is None
+        assert "Warning: Unknown PIPELINE_PROFILE mode(s): cprofiler" in capsys.readouterr().err
@@ -0,0 +1,38 @@
+"""
+Test suite for pipeline startup cost (python -X importtime).
+
+Tests cover:
+- The number of modules each pipeline entry point imports
+- Heavy dependencies staying out of parse-only imports
+
+Wall-clock import budgets depend on the machine, so they are checked by
+`python scripts/benchmark.py startup`; the module counts enforced here are
+deterministic.
+"""
+
+import pytest
+from benchmark import IMPORT_MODULE_BUDGETS, LAZY_DEPENDENCIES, import_times
+
+
+class TestImportBudget:
+    """Tests for the import footprint of the pipeline entry points."""
+
+    @pytest.mark.parametrize(("module", "budget"), IMPORT_MODULE_BUDGETS.items())
+    def test_imported_modules_within_budget(self, module: str, budget: int) -> None:
+        """Test that importing an entry point loads no more modules than its budget."""
+        imported = import_times(module)
+
+        assert len(imported) <= budget, (
+            f"import {module} loaded {len(imported)} modules (budget {budget}): "
+            + ", ".join(sorted(imported))
+        )
+
+
+class TestLazyImports:
+    """Tests for the lazy loading of optional and heavy dependencies."""
+
+    def test_heavy_dependencies_are_lazy(self) -> None:
+        """Test that network, PDF, NumPy and pydantic modules load only when used."""
+        loaded = [name for name in LAZY_DEPENDENCIES if name in import_times("fetch_plans")]
+
+        assert loaded == []
@@ -0,0 +1,64 @@
+"""
+Test suite for per-TDU plan shards (scripts/tdu_shards.py).
+
+Tests cover:
+- Manifest counts, sizes and hashes
+- Stable file names for unchanged shards
+- Stale shard cleanup one run after a shard leaves the manifest
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from tdu_shards import MANIFEST_FILENAME, SHARD_DIRNAME, tdu_slug, write_tdu_shards
+
+
+def make_document(*tdu_areas: str, last_updated: str = "2026-01-08") -> dict[str, Any]:
+    plans = [{"plan_id": str(i), "tdu_area": tdu} for i, tdu in enumerate(tdu_areas)]
+    return {"last_updated": last_updated, "total_plans": len(plans), "plans": plans}
+
+
+class TestWriteTduShards:
+    """Tests for writing per-TDU shards and their manifest."""
+
+    def test_manifest_describes_shards(self, tmp_path: Path) -> None:
+        """Test that each shard's count, size and hash match the file on disk."""
+        manifest = write_tdu_shards(make_document("ONCOR", "AEP_CENTRAL", "ONCOR"), tmp_path)
+        shard_dir = tmp_path / SHARD_DIRNAME
+
+        assert json.loads((shard_dir / MANIFEST_FILENAME).read_text()) == manifest
+        assert {tdu: shard["plans"] for tdu, shard in manifest["shards"].items()} == {
+            "ONCOR": 2,
+            "AEP_CENTRAL": 1,
+        }
+        for tdu, shard in manifest["shards"].items():
+            payload = (shard_dir / shard["file"]).read_bytes()
+            assert shard["file"].startswith(f"plans-{tdu_slug(tdu)}.")
+            assert shard["bytes"] == len(payload)
+            assert shard["sha256"] == hashlib.sha256(payload).hexdigest()
+            assert json.loads(payload)["tdu_area"] == tdu
+
+    def test_unchanged_shards_keep_their_name(self, tmp_path: Path) -> None:
+        """Test cache-busting names only change with content."""
+        first = write_tdu_shards(make_document("ONCOR", "TNMP"), tmp_path)
+        second = write_tdu_shards(
+            make_document("ONCOR", "TNMP", last_updated="2026-01-09"), tmp_path
+        )
+
+        assert second["shards"] == first["shards"]
+
+    def test_stale_shards_are_kept_for_one_run(self, tmp_path: Path) -> None:
+        """Test that a shard dropped from the manifest survives one run, then is removed."""
+        shard_dir = tmp_path / SHARD_DIRNAME
+        first = write_tdu_shards(make_document("ONCOR", "TNMP"), tmp_path)
+        second = write_tdu_shards(make_document("ONCOR", last_updated="2026-01-09"), tmp_path)
+
+        assert second["shards"]["ONCOR"]["file"] == first["shards"]["ONCOR"]["file"]
+        assert (shard_dir / first["shards"]["TNMP"]["file"]).exists()
+
+        third = write_tdu_shards(make_document("ONCOR", last_updated="2026-01-10"), tmp_path)
+
+        files = sorted(p.name for p in shard_dir.iterdir())
+        assert files == sorted([MANIFEST_FILENAME, third["shards"]["ONCOR"]["file"]])